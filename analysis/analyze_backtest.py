@@ -8,20 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pandas as pd
 from coins import coin_list
-
-# CSV 파일 경로
-CSV_PATHS = {
-    'daily_average_5': 'results/backtest/daily_average_5_backtest_200.csv',
-    'daily_average_120': 'results/backtest/daily_average_120_backtest_200.csv',
-    'golden_cross': 'results/backtest/golden_dead_cross_backtest_200.csv',
-    'volatility': 'results/backtest/volatility_backtest_200.csv',
-    'volatility_ma': 'results/backtest/volatility_checkMA_backtest_200.csv',
-    'volatility_volume': 'results/backtest/volatility_checkMA_checkVolume_backtest_200.csv',
-    'afternoon': 'results/backtest/afternoon_backtest_200.csv'
-}
-
-# CSV 파일 불러오기
-dataframes = {name: pd.read_csv(path) for name, path in CSV_PATHS.items()}
+from analysis.backtest_results import load_dataframes
 
 # 결과 저장 디렉토리 생성
 output_dir = 'results/analysis'
@@ -87,6 +74,9 @@ def analyze_backtest():
     # 기존 파일이 있을 경우 백업 (이 경우는 거의 없겠지만, 안전을 위해 유지)
     backup_file(output_file)
 
+    # 최신 백테스트 결과 불러오기
+    dataframes = load_dataframes()
+
     # 각 코인별로 결과 분석 및 텍스트 파일 저장
     results = {}
     for ticker in coin_list:
@@ -0,0 +1,40 @@
+"""
+analysis/backtest_results.py
+
+분석 스크립트가 함께 쓰는 전략별 최신 백테스트 결과 로더.
+
+결과 DB(utils.results_db)에서 읽고, DB에 실행이 없으면 save_backtest_results가 쓴 CSV를 읽습니다.
+"""
+
+import pandas as pd
+
+from utils.results_db import load_latest_many
+
+# 분석 키 → 결과 DB의 전략 결과 이름
+RESULT_NAMES = {
+    'daily_average_5': 'daily_average_5',
+    'daily_average_120': 'daily_average_120',
+    'golden_cross': 'golden_dead_cross',
+    'volatility': 'volatility',
+    'volatility_ma': 'volatility_checkMA',
+    'volatility_volume': 'volatility_checkMA_checkVolume',
+    'afternoon': 'afternoon'
+}
+
+
+def get_csv_path(key, count=200):
+    """ save_backtest_results가 쓴 최신 결과 CSV 경로 """
+    return f'results/backtest/{RESULT_NAMES[key]}_backtest_{count}.csv'
+
+
+# CSV 파일 경로
+CSV_PATHS = {key: get_csv_path(key) for key in RESULT_NAMES}
+
+
+def load_dataframes(count=200):
+    """ 전략별 최신 백테스트 결과를 결과 DB에서 가져옵니다 (DB에 없으면 CSV) """
+    dataframes = load_latest_many(RESULT_NAMES, count)
+    return {
+        key: df if df is not None else pd.read_csv(get_csv_path(key, count))
+        for key, df in dataframes.items()
+    }
@@ -9,20 +9,31 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import pandas as pd
 import json
 from coins import coin_list
-
-# CSV file paths
-CSV_PATHS = {
-    'daily_average_5': 'results/backtest/daily_average_5_backtest_200.csv',
-    'daily_average_120': 'results/backtest/daily_average_120_backtest_200.csv',
-    'golden_cross': 'results/backtest/golden_dead_cross_backtest_200.csv',
-    'volatility': 'results/backtest/volatility_backtest_200.csv',
-    'volatility_ma': 'results/backtest/volatility_checkMA_backtest_200.csv',
-    'volatility_volume': 'results/backtest/volatility_checkMA_checkVolume_backtest_200.csv',
-    'afternoon': 'results/backtest/afternoon_backtest_200.csv'
+from analysis.backtest_results import CSV_PATHS, load_dataframes
+
+# 워크 포워드 모드에서 평가하는 일봉 전략 (CSV_PATHS의 키 → (backtest.sweep.STRATEGY_CLASSES 키, 파라미터 그리드))
+# 키마다 기본 파라미터 주변의 작은 그리드를 두어 폴드마다 학습 구간에서 파라미터를 고릅니다.
+# afternoon은 시간봉 전략이라 워크 포워드 대상에서 제외합니다.
+WALK_FORWARD_GRIDS = {
+    'daily_average_5': ('daily_average', {'window': [3, 5, 7, 10]}),
+    'daily_average_120': ('daily_average', {'window': [60, 90, 120, 150]}),
+    'golden_cross': ('golden_dead_cross', {'short_window': [3, 5, 10], 'long_window': [20, 30, 60]}),
+    'volatility': ('volatility', {'k': [0.3, 0.4, 0.5, 0.6, 0.7]}),
+    'volatility_ma': ('volatility', {'k': [0.3, 0.5, 0.7], 'check_ma': [True], 'ma_window': [5, 10, 20]}),
+    'volatility_volume': ('volatility', {'k': [0.3, 0.5, 0.7], 'check_ma': [True], 'check_volume': [True],
+                                         'vol_window': [3, 5, 10]}),
 }
 
-# Load CSV files into dataframes
-dataframes_dict = {name: pd.read_csv(path) for name, path in CSV_PATHS.items()}
+
+def get_walk_forward_candidates(grids=None):
+    """ {CSV_PATHS 키: [(전략 이름, 파라미터), ...]} 워크 포워드 후보 목록 """
+    from backtest.sweep import expand_grid
+
+    grids = grids or WALK_FORWARD_GRIDS
+    return {key: [(name, params) for params in expand_grid(name, grid)] for key, (name, grid) in grids.items()}
+
+# Load backtest results into dataframes (analyze_coins에서 처음 쓸 때 읽음)
+dataframes_dict = None
 
 # Create results directory if it doesn't exist
 OUTPUT_DIR = 'results/analysis'
@@ -77,6 +88,10 @@ def analyze_coins(coin_list):
     Returns:
     dict: A dictionary mapping each strategy to the list of coins for which it is the best strategy.
     """
+    global dataframes_dict
+    if dataframes_dict is None:
+        dataframes_dict = load_dataframes()
+
     strategy_to_coins = {key: [] for key in CSV_PATHS.keys()}
 
     for single_coin in coin_list:
@@ -85,6 +100,33 @@ def analyze_coins(coin_list):
 
     return strategy_to_coins
 
+def analyze_coins_walk_forward(coin_list, max_workers=None):
+    """
+    전략을 같은 구간의 표본 내 수익률이 아니라 워크 포워드 표본 외 수익률로 고르는 함수.
+
+    Parameters:
+    coin_list (list): List of coin symbols to analyze.
+    max_workers (int): 워커 프로세스 수 (None이면 CPU 수).
+
+    Returns:
+    dict: A dictionary mapping each strategy to the list of coins for which it is the best strategy.
+    """
+    from backtest.walk_forward import run_walk_forward
+
+    summary, _ = run_walk_forward(coin_list, get_walk_forward_candidates(), max_workers=max_workers)
+    print(summary)
+
+    strategy_to_coins = {key: [] for key in CSV_PATHS.keys()}
+    for single_coin, group in summary.groupby('Market'):
+        best = group.loc[group['Out-of-Sample Return (%)'].idxmax()]
+        strategy_to_coins[best['Strategy']].append(single_coin)
+
+    # 워크 포워드 폴드를 만들 만큼 일봉이 없는 코인은 건너뜀
+    skipped = [coin for coin in coin_list if coin not in set(summary['Market'])]
+    if skipped:
+        print(f"Not enough daily candles for walk-forward: {skipped}")
+    return strategy_to_coins
+
 def backup_existing_file(file_path):
     """
     백업할 파일이 이미 존재하는 경우 파일을 날짜를 포함한 이름으로 백업합니다.
@@ -99,13 +141,20 @@ def backup_existing_file(file_path):
         print(f"Existing file backed up as '{backup_file_path}'.")
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        markets = sys.argv[1].split(',')
+    # --walk-forward: 워크 포워드 표본 외 수익률로 전략을 고릅니다
+    args = [arg for arg in sys.argv[1:] if arg != '--walk-forward']
+    walk_forward = len(args) != len(sys.argv) - 1
+
+    if len(args) > 0:
+        markets = args[0].split(',')
     else:
         # 기본 코인 리스트를 설정합니다
         markets = coin_list
 
-    result = analyze_coins(markets)
+    if walk_forward:
+        result = analyze_coins_walk_forward(markets)
+    else:
+        result = analyze_coins(markets)
 
     # Save the results to a text file
     output_file_path = os.path.join(OUTPUT_DIR, 'best_strategy.txt')
@@ -1,5 +1,12 @@
-import requests
-import pandas as pd
+import os
+import sys
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from api import http_client
+from api.binance.binance_klines import decode_klines, klines_to_frame
 
 def fetch_daily_candles(symbol):
     """주어진 심볼의 일간 캔들 데이터를 가져옵니다."""
@@ -9,20 +16,9 @@ def fetch_daily_candles(symbol):
         'interval': '1d'
     }
 
-    response = requests.get(url, params=params)
+    response = http_client.get(url, params=params)
     if response.status_code == 200:
-        data = response.json()
-        df = pd.DataFrame(data, columns=[
-            'Open Time', 'Open', 'High', 'Low', 'Close', 'Volume', 'Close Time',
-            'Quote Asset Volume', 'Number of Trades', 'Taker Buy Base Asset Volume',
-            'Taker Buy Quote Asset Volume', 'Ignore'
-        ])
-        df['Open Time'] = pd.to_datetime(df['Open Time'], unit='ms')
-        df['Close Time'] = pd.to_datetime(df['Close Time'], unit='ms')
-
-        # 인덱스 번호 추가
-        df.reset_index(inplace=True)
-        df.rename(columns={'index': 'Index Number'}, inplace=True)
+        df = klines_to_frame([decode_klines(response.json())])
 
         # 캔들의 수 출력
         print(f"Candle size for {symbol}: {len(df)}")
@@ -0,0 +1,62 @@
+"""
+api/binance/binance_klines.py
+
+바이낸스 kline 응답을 페이지마다 데이터프레임을 만들지 않고 numpy 컬럼으로 변환하는 헬퍼.
+"""
+
+import numpy as np
+import pandas as pd
+
+KLINE_COLUMNS = [
+    'Open Time', 'Open', 'High', 'Low', 'Close', 'Volume', 'Close Time',
+    'Quote Asset Volume', 'Number of Trades', 'Taker Buy Base Asset Volume',
+    'Taker Buy Quote Asset Volume', 'Ignore'
+]
+
+# 밀리초 epoch 정수 컬럼
+TIME_COLUMNS = ['Open Time', 'Close Time']
+
+# 정수 컬럼
+INT_COLUMNS = ['Number of Trades']
+
+
+def decode_klines(data):
+    """
+    kline 응답(JSON 리스트의 리스트)을 컬럼별 numpy 배열로 변환하는 함수.
+
+    :param data: response.json() 결과
+    :return: {컬럼: 배열} (시간은 밀리초 epoch int64, 가격/수량은 float64)
+    """
+    count = len(data)
+    columns = {}
+    for position, name in enumerate(KLINE_COLUMNS[:-1]):
+        if name in TIME_COLUMNS or name in INT_COLUMNS:
+            columns[name] = np.fromiter((row[position] for row in data), dtype=np.int64, count=count)
+        else:
+            # 가격/수량은 문자열로 오므로 한 번에 float64로 변환
+            columns[name] = np.array([row[position] for row in data], dtype=np.float64)
+    columns['Ignore'] = np.array([row[11] for row in data], dtype=object)
+    return columns
+
+
+def klines_to_frame(pages):
+    """
+    여러 페이지의 컬럼을 한 번에 이어 붙여 기존 CSV 형식의 데이터프레임으로 만드는 함수.
+
+    :param pages: decode_klines 결과 목록
+    :return: 'Index Number' 컬럼과 datetime 시간 컬럼을 가진 데이터프레임
+    """
+    if pages:
+        columns = {name: np.concatenate([page[name] for page in pages]) for name in KLINE_COLUMNS}
+    else:
+        columns = decode_klines([])
+
+    for name in TIME_COLUMNS:
+        columns[name] = pd.to_datetime(columns[name], unit='ms')
+
+    df = pd.DataFrame(columns, columns=KLINE_COLUMNS)
+
+    # 인덱스 번호 추가
+    df.reset_index(inplace=True)
+    df.rename(columns={'index': 'Index Number'}, inplace=True)
+    return df
@@ -1,6 +1,14 @@
-import requests
 import pandas as pd
 from datetime import datetime, timedelta
+import os
+import sys
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from api import http_client
+from api.binance.binance_klines import decode_klines, klines_to_frame
 
 def fetch_candles(symbol, interval, start_date, end_date=None):
     """주어진 심볼의 지정된 간격의 캔들 데이터를 시작 날짜부터 종료 날짜까지 가져옵니다."""
@@ -12,7 +20,7 @@ def fetch_candles(symbol, interval, start_date, end_date=None):
     start_timestamp = int(pd.to_datetime(start_date).timestamp() * 1000)
     end_timestamp = int(pd.to_datetime(end_date).timestamp() * 1000)
 
-    all_data = []
+    pages = []
 
     while start_timestamp < end_timestamp:
         params = {
@@ -23,27 +31,19 @@ def fetch_candles(symbol, interval, start_date, end_date=None):
             'limit': 1000
         }
 
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         if response.status_code == 200:
             data = response.json()
             if not data:
                 break
-            all_data.extend(data)
-            start_timestamp = data[-1][6]  # 마지막 데이터의 Close Time을 다음 요청의 시작 시간으로 설정
+            # 페이지는 numpy 컬럼으로만 보관하고 데이터프레임은 마지막에 한 번 만든다
+            page = decode_klines(data)
+            pages.append(page)
+            start_timestamp = int(page['Close Time'][-1])  # 마지막 데이터의 Close Time을 다음 요청의 시작 시간으로 설정
         else:
             raise Exception("Failed to fetch data from API")
 
-    df = pd.DataFrame(all_data, columns=[
-        'Open Time', 'Open', 'High', 'Low', 'Close', 'Volume', 'Close Time',
-        'Quote Asset Volume', 'Number of Trades', 'Taker Buy Base Asset Volume',
-        'Taker Buy Quote Asset Volume', 'Ignore'
-    ])
-    df['Open Time'] = pd.to_datetime(df['Open Time'], unit='ms')
-    df['Close Time'] = pd.to_datetime(df['Close Time'], unit='ms')
-
-    # 인덱스 번호 추가
-    df.reset_index(inplace=True)
-    df.rename(columns={'index': 'Index Number'}, inplace=True)
+    df = klines_to_frame(pages)
 
     # 캔들의 수 출력
     print(f"Candle size for {symbol} ({interval}): {len(df)}")
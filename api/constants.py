@@ -1,5 +1,9 @@
 UPBIT_SERVER_URL = 'https://api.upbit.com'
 
+# 업비트 요청 수 제한 (한도, 초) - https://docs.upbit.com/reference/요청-수-제한
+# 시세 조회(캔들 등) API: 초당 10회, 분당 600회
+UPBIT_QUOTATION_LIMITS = [(10, 1), (600, 60)]
+
 
 def main():
     print("UPBIT_SERVER_URL: ", UPBIT_SERVER_URL)
@@ -7,4 +11,4 @@ def main():
 
 # 테스트 코드
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
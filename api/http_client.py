@@ -0,0 +1,85 @@
+"""
+api/http_client.py
+
+업비트/바이낸스/텔레그램 요청이 함께 쓰는 HTTP 클라이언트.
+
+모듈 전역 requests.Session 하나에 keep-alive 연결 풀을 두어
+요청마다 TCP/TLS 연결을 새로 맺지 않고, 모든 요청에 기본 타임아웃을 적용합니다.
+asyncio 코드에서는 async_request/async_get 등으로 같은 연결 풀을
+스레드에서 사용합니다.
+"""
+
+import asyncio
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# (연결, 읽기) 타임아웃 - 초 단위
+REQUEST_TIMEOUT = (3.05, 10)
+
+# 호스트별로 유지할 연결 수 (asyncio.to_thread 기본 스레드 수와 맞춤)
+POOL_MAXSIZE = 32
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """ 연결 풀을 가진 공유 세션을 반환합니다 """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def request(method, url, **kwargs):
+    """
+    공유 세션으로 HTTP 요청을 보내는 함수.
+
+    :param method: HTTP 메서드 ('GET', 'POST', 'DELETE' 등)
+    :param url: 요청 URL
+    :param kwargs: requests에 그대로 전달할 인자 (timeout 기본값 REQUEST_TIMEOUT)
+    :return: requests.Response
+    """
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
+
+
+async def async_request(method, url, **kwargs):
+    """ request()를 스레드에서 실행하여 이벤트 루프를 막지 않고 같은 연결 풀을 사용합니다 """
+    return await asyncio.to_thread(request, method, url, **kwargs)
+
+
+async def async_get(url, **kwargs):
+    return await async_request("GET", url, **kwargs)
+
+
+async def async_post(url, **kwargs):
+    return await async_request("POST", url, **kwargs)
+
+
+def close():
+    """ 공유 세션의 연결을 모두 닫습니다 """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
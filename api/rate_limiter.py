@@ -0,0 +1,95 @@
+"""
+api/rate_limiter.py
+
+업비트 요청 수 제한을 지키기 위한 asyncio 토큰 버킷.
+
+여러 시장을 동시에 요청하더라도 하나의 RateLimiter를 공유하면
+초당/분당 한도를 동시에 만족하는 범위에서 최대한 빠르게 요청합니다.
+"""
+
+import asyncio
+import time
+from requests.exceptions import HTTPError
+
+from api.constants import UPBIT_QUOTATION_LIMITS
+
+
+class RateLimiter:
+    """ 여러 기간의 한도(예: 초당 10회, 분당 600회)를 함께 지키는 토큰 버킷 """
+
+    def __init__(self, limits):
+        """
+        :param limits: (한도, 기간(초)) 목록
+        """
+        self.limits = limits
+        now = time.monotonic()
+        self._tokens = [float(capacity) for capacity, _ in limits]
+        self._updated = now
+        self._blocked_until = now
+        self._lock = None
+        self._loop = None
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        for i, (capacity, period) in enumerate(self.limits):
+            self._tokens[i] = min(capacity, self._tokens[i] + elapsed * capacity / period)
+
+    def _get_lock(self):
+        # asyncio.run()마다 이벤트 루프가 바뀌므로 루프별로 잠금을 만든다
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def acquire(self):
+        """ 모든 버킷에 토큰이 있을 때까지 기다린 뒤 하나씩 사용합니다 """
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                wait = self._blocked_until - now
+                for i, (capacity, period) in enumerate(self.limits):
+                    if self._tokens[i] < 1:
+                        wait = max(wait, (1 - self._tokens[i]) * period / capacity)
+
+                if wait <= 0:
+                    for i in range(len(self._tokens)):
+                        self._tokens[i] -= 1
+                    return
+                await asyncio.sleep(wait)
+
+    def penalize(self, seconds):
+        """ 429 응답을 받으면 모든 요청을 일정 시간 멈추고 버킷을 비웁니다 """
+        now = time.monotonic()
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        self._tokens = [0.0 for _ in self._tokens]
+        self._updated = now
+
+
+# 시세 조회 API가 공유하는 제한기
+quotation_limiter = RateLimiter(UPBIT_QUOTATION_LIMITS)
+
+
+async def call_with_rate_limit(func, *args, limiter=quotation_limiter, retries=5, backoff=1, **kwargs):
+    """
+    제한기 토큰을 받은 뒤 동기 API 함수를 스레드에서 실행하는 함수.
+
+    :param func: 호출할 API 함수 (예: get_daily_candles)
+    :param limiter: 사용할 RateLimiter
+    :param retries: 429 응답 시 최대 재시도 횟수
+    :param backoff: 첫 재시도 전 대기 시간(초), 재시도마다 두 배
+    :return: func의 반환값
+    """
+    for attempt in range(retries + 1):
+        await limiter.acquire()
+        try:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        except HTTPError as http_err:
+            if http_err.response is None or http_err.response.status_code != 429 or attempt == retries:
+                raise
+            print(f"HTTPError: {http_err}. Too many requests, backing off for {backoff} seconds.")
+            limiter.penalize(backoff)
+            backoff *= 2
@@ -5,8 +5,8 @@ import sys
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
-import requests
 import json
+from api import http_client
 from api.constants import UPBIT_SERVER_URL
 from api.upbit_token import generate_jwt_token
 
@@ -16,7 +16,7 @@ def fetch_upbit_accounts():
     authorize_token = generate_jwt_token()
     headers = {"Authorization": authorize_token}
 
-    res = requests.get(f"{UPBIT_SERVER_URL}/v1/accounts", headers=headers)
+    res = http_client.get(f"{UPBIT_SERVER_URL}/v1/accounts", headers=headers)
 
     # 응답이 성공적인지 확인
     if res.status_code != 200:
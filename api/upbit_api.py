@@ -1,69 +1,118 @@
-import requests
+import numpy as np
 import pandas as pd
+from api import http_client
 from api.constants import UPBIT_SERVER_URL
 
+CANDLE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
 
-def get_daily_candles(market: str, count: int = 200):
+# 응답 필드 -> 컬럼 이름
+CANDLE_FIELDS = {
+    'opening_price': 'open',
+    'high_price': 'high',
+    'low_price': 'low',
+    'trade_price': 'close',
+    'candle_acc_trade_volume': 'volume',
+}
+
+
+def _empty_candles():
+    """ 더 이상 과거 캔들이 없을 때 반환하는 빈 데이터프레임 """
+    return pd.DataFrame(columns=CANDLE_COLUMNS, index=pd.DatetimeIndex([], name='date'), dtype=float)
+
+
+def decode_candles(data, ascending=True):
     """
-    업비트 API를 사용하여 일봉 데이터를 가져오는 함수.
+    캔들 응답(JSON 리스트)을 데이터프레임을 거치지 않고 numpy 컬럼으로 변환하는 함수.
 
-    :param market: 코인 시장 코드 (예: 'KRW-BTC')
-    :param count: 가져올 일봉 데이터의 수
-    :return: Pandas DataFrame으로 변환된 일봉 데이터
+    :param data: response.json() 결과 (최신 캔들이 앞에 옴)
+    :param ascending: True면 오래된 순으로 뒤집어서 채움
+    :return: {'date': int64 나노초 (KST tz-naive), 'open': float64, ...}
     """
-    url = f"{UPBIT_SERVER_URL}/v1/candles/days"
+    rows = data[::-1] if ascending else data
+    count = len(rows)
+    columns = {
+        'date': np.array([row['candle_date_time_kst'] for row in rows], dtype='datetime64[ns]').view('int64')
+    }
+    for field, name in CANDLE_FIELDS.items():
+        columns[name] = np.fromiter((row[field] for row in rows), dtype=np.float64, count=count)
+    return columns
+
+
+def candles_to_frame(columns):
+    """ decode_candles 결과를 date 인덱스의 데이터프레임으로 변환합니다 """
+    index = pd.DatetimeIndex(np.asarray(columns['date']).view('datetime64[ns]'), name='date')
+    return pd.DataFrame({name: columns[name] for name in CANDLE_COLUMNS}, index=index)
+
+
+def _request_candles(url, market, count, to=None, headers=None):
     params = {
         "market": market,
         "count": count
     }
-    response = requests.get(url, params=params)
+    if to is not None:
+        params["to"] = to
+    response = http_client.get(url, headers=headers, params=params)
     response.raise_for_status()  # 요청이 실패하면 예외를 발생시킴
-    data = response.json()
-
-    # JSON 데이터를 DataFrame으로 변환
-    df = pd.DataFrame(data)
-    # 날짜 형식을 datetime 객체로 변환
-    df['candle_date_time_kst'] = pd.to_datetime(df['candle_date_time_kst'])
-    # 필요한 열만 선택
-    df = df[['candle_date_time_kst', 'opening_price', 'high_price', 'low_price', 'trade_price', 'candle_acc_trade_volume']]
-    # 열 이름을 더 간단하게 변경
-    df.columns = ['date', 'open', 'high', 'low', 'close', 'volume']
-    # 'date' 열을 인덱스로 설정
-    df.set_index('date', inplace=True)
-
-    return df
-
-def get_minute_candles(market, interval, count, to):
+    return response.json()
+
+
+def get_daily_candle_arrays(market, count=200, to=None):
+    """
+    일봉 한 페이지를 오래된 순의 numpy 컬럼으로 가져오는 함수.
+
+    여러 페이지를 이어 붙이는 경우 페이지마다 데이터프레임을 만들지 않도록 사용합니다.
+
+    :param market: 코인 시장 코드 (예: 'KRW-BTC')
+    :param count: 가져올 일봉 데이터의 수 (최대 200)
+    :param to: 이 시각 이전의 캔들을 가져옴 (ISO 8601, None이면 최신)
+    :return: decode_candles 형식의 컬럼 딕셔너리
+    """
+    data = _request_candles(f"{UPBIT_SERVER_URL}/v1/candles/days", market, count, to)
+    return decode_candles(data)
+
+
+def get_minute_candle_arrays(market, interval, count, to=None):
+    """
+    분봉 한 페이지를 오래된 순의 numpy 컬럼으로 가져오는 함수.
+
+    :param market: 코인 시장 코드 (예: 'KRW-BTC')
+    :param interval: 분 단위 (1, 3, 5, 10, 15, 30, 60, 240)
+    :param count: 가져올 캔들 수 (최대 200)
+    :param to: 이 시각 이전의 캔들을 가져옴 (ISO 8601, None이면 최신)
+    :return: decode_candles 형식의 컬럼 딕셔너리
+    """
     url = f"{UPBIT_SERVER_URL}/v1/candles/minutes/{interval}"
-    params = {
-        "market": market,
-        "count": count,
-        "to": to
-    }
-    headers = {"accept": "application/json"}
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()  # 요청이 실패하면 예외를 발생시킴
-    data = response.json()
+    data = _request_candles(url, market, count, to, headers={"accept": "application/json"})
+    return decode_candles(data)
 
 
-    # JSON 데이터를 DataFrame으로 변환
-    df = pd.DataFrame(data)
-    df['candle_date_time_kst'] = pd.to_datetime(df['candle_date_time_kst'])
-     # 필요한 열만 선택
-    df = df[['candle_date_time_kst', 'opening_price', 'high_price', 'low_price', 'trade_price', 'candle_acc_trade_volume']]
-    # 열 이름을 더 간단하게 변경
-    df.columns = ['date', 'open', 'high', 'low', 'close', 'volume']
-    # 'date' 열을 인덱스로 설정
-    df.set_index('date', inplace=True)
+def get_daily_candles(market: str, count: int = 200, to: str = None):
+    """
+    업비트 API를 사용하여 일봉 데이터를 가져오는 함수.
+
+    :param market: 코인 시장 코드 (예: 'KRW-BTC')
+    :param count: 가져올 일봉 데이터의 수 (최대 200)
+    :param to: 이 시각 이전의 캔들을 가져옴 (ISO 8601, None이면 최신)
+    :return: Pandas DataFrame으로 변환된 일봉 데이터 (응답 순서, 최신 캔들이 위)
+    """
+    data = _request_candles(f"{UPBIT_SERVER_URL}/v1/candles/days", market, count, to)
+    if not data:
+        return _empty_candles()
+    return candles_to_frame(decode_candles(data, ascending=False))
 
-    return df
+def get_minute_candles(market, interval, count, to=None):
+    url = f"{UPBIT_SERVER_URL}/v1/candles/minutes/{interval}"
+    data = _request_candles(url, market, count, to, headers={"accept": "application/json"})
+    if not data:
+        return _empty_candles()
+    return candles_to_frame(decode_candles(data, ascending=False))
 
 
 
 def get_markets():
     url = f"{UPBIT_SERVER_URL}/v1/market/all"
     headers = {"Accept": "application/json"}
-    response = requests.get(url, headers=headers)
+    response = http_client.get(url, headers=headers)
     response.raise_for_status()  # 요청 실패 시 예외 발생
 
     markets = response.json()
@@ -1,7 +1,6 @@
 import json
 import os
 import sys
-import requests
 from urllib.parse import urlencode, unquote
 import hashlib
 
@@ -9,6 +8,7 @@ import hashlib
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
+from api import http_client
 from api.constants import UPBIT_SERVER_URL
 from upbit_token import generate_jwt_token
 
@@ -43,7 +43,7 @@ def cancel_order(params):
 
     url = f"{UPBIT_SERVER_URL}/v1/order"
 
-    response = requests.delete(url, headers=headers, params=query_params)
+    response = http_client.delete(url, headers=headers, params=query_params)
 
     if response.status_code == 200:
         return response.json()
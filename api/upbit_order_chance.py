@@ -1,17 +1,16 @@
 import json
 import os
 import sys
-import requests
 
 import hashlib
 import os
-import requests
 from urllib.parse import urlencode, unquote
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
+from api import http_client
 from api.constants import UPBIT_SERVER_URL
 from upbit_token import generate_jwt_token
 
@@ -37,7 +36,7 @@ def fetch_order_chance(market):
     url = f"{UPBIT_SERVER_URL}/v1/orders/chance"
     params = {"market": market}
 
-    response = requests.get(url, headers=headers, params=params)
+    response = http_client.get(url, headers=headers, params=params)
 
     if response.status_code == 200:
         return response.json()
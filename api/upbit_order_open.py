@@ -2,13 +2,13 @@ import json
 import hashlib
 import os
 import sys
-import requests
 from urllib.parse import urlencode, unquote
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
+from api import http_client
 from api.constants import UPBIT_SERVER_URL
 from upbit_token import generate_jwt_token
 
@@ -58,7 +58,7 @@ def fetch_order_open(params=None):
 
     url = UPBIT_SERVER_URL + '/v1/orders/open'
 
-    response = requests.get(url, params=query_params, headers=headers)
+    response = http_client.get(url, params=query_params, headers=headers)
 
     if response.status_code == 200:
         return response.json()
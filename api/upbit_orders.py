@@ -9,6 +9,7 @@ from urllib.parse import urlencode, unquote
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
+from api import http_client
 from api.constants import UPBIT_SERVER_URL
 from upbit_token import generate_jwt_token
 
@@ -51,7 +52,7 @@ def fetch_orders(params=None):
     url = UPBIT_SERVER_URL + '/v1/orders'
 
     try:
-        response = requests.post(url, json=query_params, headers=headers)
+        response = http_client.post(url, json=query_params, headers=headers)
 
         if response.status_code == 200 or response.status_code == 201:
             return response.json()
@@ -1,27 +1,34 @@
 """
 backtest.py
+
+실행: python3 backtest.py [워커 수 또는 auto] [시장별 결과 저장 방식: csv, npz, equity, none]
 """
 
+import sys
 import asyncio
-from backtest.golden_dead_cross_backtest import run_golden_cross_backtests
-from backtest.daily_average_backtest import run_daily_average_backtest
-from backtest.volatility_backtest import run_volatility_backtest
-from backtest.afternoon_backtest import run_afternoon_backtest
+from backtest.orchestrator import run_all_backtests
+from utils.backtest_engine import UPBIT_COSTS
 from coins import coin_list
 
-async def backtest():
+async def backtest(max_workers=None, storage="csv"):
     COUNT = 200
     INITIAL_CAPITAL = 10000
 
     # coin_list = ["KRW-SOL"]
 
-    run_daily_average_backtest(coin_list, COUNT, INITIAL_CAPITAL)
-    run_daily_average_backtest(coin_list, COUNT, INITIAL_CAPITAL, 120)
-    run_golden_cross_backtests(coin_list, COUNT, INITIAL_CAPITAL)
-    run_volatility_backtest(coin_list, COUNT, INITIAL_CAPITAL)
-    run_volatility_backtest(coin_list, COUNT, INITIAL_CAPITAL, check_ma=True)
-    run_volatility_backtest(coin_list, COUNT, INITIAL_CAPITAL, check_ma=True, check_volume=True)
-    await run_afternoon_backtest(coin_list, COUNT, INITIAL_CAPITAL)
+    # 매수/매도마다 업비트 수수료(0.05%)를 반영한 순수익률로 비교한다
+    COSTS = UPBIT_COSTS
+
+    # (전략 묶음 × 시장) 작업을 프로세스 풀에서 함께 실행한다
+    # 일봉: 이동평균 5/120, 골든/데드 크로스, 변동성 돌파 3종 (시장마다 데이터를 한 번만 읽음)
+    # 60분봉: 오후 전략
+    # 캔들과 전략이 그대로인 (시장, 전략)은 결과 캐시(results/cache)에서 가져온다
+    # 시장별 결과 파일은 storage 방식으로 저장한다 (utils.save_results.STORAGE_MODES)
+    run_all_backtests(
+        coin_list, COUNT, INITIAL_CAPITAL, costs=COSTS, max_workers=max_workers, use_cache=True, storage=storage
+    )
 
 if __name__ == "__main__":
-    asyncio.run(backtest())
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1] != "auto" else None
+    storage = sys.argv[2] if len(sys.argv) > 2 else "csv"
+    asyncio.run(backtest(workers, storage))
@@ -18,6 +18,8 @@ from requests.exceptions import HTTPError
 from strategies.afternoon_strategy import check_signal
 from utils import save_market_backtest_result, save_backtest_results, calculate_cumulative_return, calculate_mdd, calculate_win_rate
 from utils.data_utils import get_minute_candles_from_file
+from utils import backtest_engine
+from utils.results_db import run_params
 
 # 현재 파일의 위치를 기준으로 상위 디렉토리를 sys.path에 추가
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -41,10 +43,11 @@ async def fetch_candles_from_file(ticker, count):
 
 def generate_signal(df):
     daily_results = []
-    for i in range(0, len(df), 24):  # 하루 단위로 데이터 처리
-        if i + 24 > len(df):
-            break
-        daily_data = df.iloc[i:i+24]
+    # 고정 24행이 아니라 날짜별로 묶어 빠진 시간봉이 다음 날들로 밀리지 않게 한다
+    for day, daily_data in df.groupby(df.index.normalize()):  # 하루 단위로 데이터 처리
+        if len(daily_data) != 24:
+            print(f"Skipping {day.date()}: {len(daily_data)} hourly candles")
+            continue
         morning_data = daily_data.iloc[:12]
         afternoon_data = daily_data.iloc[12:]
 
@@ -74,30 +77,12 @@ def generate_signal(df):
 
     return df
 
-def backtest_strategy(df, initial_capital, investment_fraction):
-    cash = initial_capital
-    shares = 0
-    df['holdings'] = 0.0
-    df['cash'] = float(initial_capital)
-    df['total'] = float(initial_capital)
-
-    for i in range(1, len(df)):
-        if df['positions'].iloc[i] == 1:  # 매수 신호
-            investment = cash * investment_fraction
-            shares += investment / df['close'].iloc[i]
-            cash -= investment
-        elif df['positions'].iloc[i] == -1 and i < len(df) - 1:  # 매도 신호
-            noon_close = df['noon_close'].iloc[i + 1]
-            cash += shares * noon_close
-            shares = 0
-        elif df['positions'].iloc[i] == -1 and i == len(df) - 1:  # 마지막 매도
-            cash += shares * df['close'].iloc[i]
-            shares = 0
-        df.loc[df.index[i], 'holdings'] = shares * df['close'].iloc[i]
-        df.loc[df.index[i], 'cash'] = cash
-        df.loc[df.index[i], 'total'] = df.loc[df.index[i], 'holdings'] + df.loc[df.index[i], 'cash']
-
-    df['returns'] = df['total'].pct_change()
+def backtest_strategy(df, initial_capital, investment_fraction, costs=None):
+    # 매도는 다음 날 정오 가격, 마지막 날은 종가
+    sell_price = df['noon_close'].shift(-1).to_numpy()
+    if len(df):
+        sell_price[-1] = df['close'].iloc[-1]
+    df = backtest_engine.backtest_strategy(df, initial_capital, investment_fraction, sell_price, costs)
 
     # 소수점 없이 표현
     df['holdings'] = df['holdings'].astype(int)
@@ -106,19 +91,20 @@ def backtest_strategy(df, initial_capital, investment_fraction):
 
     return df
 
-async def run_backtest(market, count, initial_capital, investment_fraction):
+async def run_backtest(market, count, initial_capital, investment_fraction, costs=None):
     """
     백테스트를 실행하는 메인 함수
 
     :param market: 가상화폐 시장 코드
     :param count: 가져올 일봉 데이터의 수
     :param initial_capital: 초기 자본
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
     :return: 백테스트 결과 딕셔너리
     """
     print(f"Afternoon backtest for {market}...")
     candle_df = await fetch_candles_from_file(market, count)
     df = generate_signal(candle_df)
-    df = backtest_strategy(df, initial_capital, investment_fraction)
+    df = backtest_strategy(df, initial_capital, investment_fraction, costs)
 
     # 결과를 파일로 저장
     if count == 200:
@@ -139,16 +125,17 @@ async def run_backtest(market, count, initial_capital, investment_fraction):
 
     return result
 
-async def run_afternoon_backtest(markets=None, count=200, initial_capital=10000, investment_fraction=1):
+async def run_afternoon_backtest(markets=None, count=200, initial_capital=10000, investment_fraction=1, costs=None):
     """ 백테스트 실행 """
     if markets is None:
         markets = ["KRW-BTC", "KRW-ETH", "KRW-SOL"]
 
     print("\n{ Afternoon Backtest }")
 
-    tasks = [run_backtest(market, count, initial_capital, investment_fraction) for market in markets]
+    tasks = [run_backtest(market, count, initial_capital, investment_fraction, costs) for market in markets]
     results = await asyncio.gather(*tasks)
-    result_df = save_backtest_results(results, count, "afternoon")
+    params = run_params({"investment_fraction": investment_fraction}, initial_capital, costs)
+    result_df = save_backtest_results(results, count, "afternoon", params)
     print(result_df)
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+"""
+backtest/backtester.py
+
+등록된 전략을 시장마다 한 번의 데이터 로드로 평가하는 단일 패스 러너.
+
+시장별로 일봉을 한 번 읽어 컬럼 배열로 만들고, 모든 전략이 선언한 지표를
+지표 캐시(utils.indicator_cache)로 한 번씩만 계산한 뒤 전략마다 신호 → 자금 계산 → 지표 계산만 수행합니다.
+use_cache이면 입력이 바뀌지 않은 (시장, 전략)은 결과 캐시(utils.result_cache)에서 가져옵니다.
+결과 파일 이름과 형식은 기존 전략별 run_*_backtest와 같습니다.
+"""
+
+from backtest.strategy import compute_indicators, signal_to_positions
+from backtest.daily_average_backtest import DailyAverageStrategy
+from backtest.golden_dead_cross_backtest import GoldenDeadCrossStrategy
+from backtest.volatility_backtest import VolatilityStrategy
+from utils import result_cache, save_market_backtest_result, save_backtest_results
+from utils.backtest_engine import simulate_positions
+from utils.backtest_metrics import cumulative_return_array, mdd_array, win_rate_array
+from utils.candle_store import DAYS, PRICE_COLUMNS
+from utils.indicator_cache import make_cache_key
+from utils.results_db import run_params
+from utils.save_results import check_storage_mode
+from utils.data_utils import get_recent_candles
+
+
+def get_default_strategies():
+    """ backtest.py에서 실행하는 일봉 전략 목록 """
+    return [
+        DailyAverageStrategy(5),
+        DailyAverageStrategy(120),
+        GoldenDeadCrossStrategy(short_window=5, long_window=20),
+        VolatilityStrategy(k=0.5),
+        VolatilityStrategy(k=0.5, check_ma=True),
+        VolatilityStrategy(k=0.5, check_ma=True, check_volume=True),
+    ]
+
+
+def _result_frame(candles, strategy, arrays, indicators, signal, positions, holdings, cash, total):
+    """ 기존 시장별 결과 파일과 같은 컬럼의 데이터프레임을 만듭니다 """
+    df = candles.copy()
+    for name, values in strategy.result_columns(arrays, indicators).items():
+        df[name] = values
+    df['signal'] = signal
+    df['positions'] = positions
+    df['holdings'] = holdings
+    df['cash'] = cash
+    df['total'] = total
+    df['returns'] = df['total'].pct_change()
+    return df
+
+
+def simulate_market(market, count, initial_capital, strategies, costs=None):
+    """
+    한 시장의 데이터를 한 번 읽어 전략별 신호와 자금 흐름을 계산하는 함수.
+
+    :param market: 시장 코드
+    :param count: 사용할 일봉 개수
+    :param initial_capital: 초기 자본
+    :param strategies: Strategy 목록
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
+    :return: (candles, arrays, indicators, 전략 순서대로 (signal, positions, holdings, cash, total) 목록)
+    """
+    candles = get_recent_candles(market, count).sort_index()
+    arrays = {column: candles[column].to_numpy() for column in PRICE_COLUMNS}
+    specs = [spec for strategy in strategies for spec in strategy.indicators]
+    indicators = compute_indicators(arrays, specs, make_cache_key(market, DAYS, candles))
+
+    simulations = []
+    for strategy in strategies:
+        signal = strategy.signals(arrays, indicators)
+        positions = signal_to_positions(signal)
+        holdings, cash, total = simulate_positions(
+            arrays['close'], positions, initial_capital, strategy.investment_fraction,
+            costs=costs, volume=arrays['volume']
+        )
+        simulations.append((signal, positions, holdings, cash, total))
+    return candles, arrays, indicators, simulations
+
+
+def _result_keys(market, count, initial_capital, strategies, save, costs, storage="csv"):
+    """ 전략별 결과 캐시 키 (utils.result_cache) """
+    if costs is not None and costs.is_zero:
+        costs = None
+    fingerprint = result_cache.data_fingerprint(get_recent_candles(market, count).sort_index())
+    return [
+        result_cache.make_result_key(
+            fingerprint, market, strategy, count=count, initial_capital=initial_capital, costs=costs,
+            storage=storage if save and strategy.should_save(count) else None
+        )
+        for strategy in strategies
+    ]
+
+
+def run_market(market, count, initial_capital, strategies, save=True, costs=None, use_cache=False, storage="csv"):
+    """
+    한 시장의 데이터를 한 번 읽어 모든 전략을 평가하는 함수.
+
+    use_cache이면 입력(캔들 데이터, 전략과 파라미터, 설정, 엔진 버전)이 같은 전략은 결과 캐시에서 가져오고
+    나머지 전략만 계산합니다. 캐시에는 결과와 함께 그때 쓴 시장별 결과 파일의 지문을 저장하므로,
+    다른 실행(비용 없는 run_backtests, 전략별 run_backtest 등)이 같은 파일을 덮어쓰거나 파일이 지워졌으면
+    적중으로 보지 않고 다시 계산해 파일을 씁니다.
+
+    :param market: 시장 코드
+    :param count: 사용할 일봉 개수
+    :param initial_capital: 초기 자본
+    :param strategies: Strategy 목록
+    :param save: 시장별 결과 파일 저장 여부 (파라미터 스윕에서는 False)
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
+    :param use_cache: 결과 캐시(utils.result_cache) 사용 여부
+    :param storage: 시장별 결과 저장 방식 (utils.save_results.STORAGE_MODES)
+    :return: 전략 순서대로 결과 딕셔너리 목록
+    """
+    check_storage_mode(storage)
+    keys = _result_keys(market, count, initial_capital, strategies, save, costs, storage) if use_cache else None
+    results = [None] * len(strategies)
+    if use_cache:
+        for i, key in enumerate(keys):
+            entry = result_cache.get_result(key)
+            if entry is not None and "result" in entry and result_cache.files_unchanged(entry["files"]):
+                results[i] = entry["result"]
+
+    pending = [i for i, result in enumerate(results) if result is None]
+    if pending:
+        pending_strategies = [strategies[i] for i in pending]
+        candles, arrays, indicators, simulations = simulate_market(
+            market, count, initial_capital, pending_strategies, costs
+        )
+
+        for i, strategy, (signal, positions, holdings, cash, total) in zip(pending, pending_strategies, simulations):
+            paths = []
+            if save and storage != "none" and strategy.should_save(count):
+                df = _result_frame(candles, strategy, arrays, indicators, signal, positions, holdings, cash, total)
+                paths = save_market_backtest_result(
+                    market, df, count, strategy.name, storage=storage, **strategy.save_options
+                )
+
+            results[i] = {
+                "Market": market,
+                "Count": count,
+                "Investment Fraction": strategy.investment_fraction,
+                "Cumulative Return (%)": cumulative_return_array(total, initial_capital),
+                "Win Rate (%)": win_rate_array(positions, total),
+                "Max Drawdown (%)": mdd_array(total),
+            }
+            if use_cache:
+                files = {path: result_cache.file_fingerprint(path) for path in paths}
+                result_cache.put_result(keys[i], {"result": results[i], "files": files})
+    return [dict(result) for result in results]
+
+
+def run_backtests(markets, count=200, initial_capital=10000, strategies=None, costs=None, use_cache=False,
+                  storage="csv"):
+    """
+    여러 시장에 등록된 전략을 모두 실행하고 전략별 결과를 저장하는 함수.
+
+    :param markets: 시장 코드 목록
+    :param count: 사용할 일봉 개수
+    :param initial_capital: 초기 자본
+    :param strategies: Strategy 목록 (None이면 get_default_strategies())
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
+    :param use_cache: 결과 캐시(utils.result_cache) 사용 여부
+    :param storage: 시장별 결과 저장 방식 (utils.save_results.STORAGE_MODES)
+    :return: {전략 결과 이름: 결과 데이터프레임}
+    """
+    check_storage_mode(storage)
+    strategies = strategies or get_default_strategies()
+    results = {strategy.results_name: [] for strategy in strategies}
+    params = {strategy.results_name: run_params(strategy.params, initial_capital, costs) for strategy in strategies}
+
+    for market in markets:
+        print(f"Backtest for {market}...")
+        market_results = run_market(
+            market, count, initial_capital, strategies, costs=costs, use_cache=use_cache, storage=storage
+        )
+        for strategy, result in zip(strategies, market_results):
+            results[strategy.results_name].append(result)
+    if use_cache:
+        result_cache.evict()
+
+    result_dfs = {}
+    for name, market_results in results.items():
+        print(f"\n[ {name} ]")
+        result_dfs[name] = save_backtest_results(market_results, count, name, params[name])
+        print(result_dfs[name])
+    return result_dfs
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from coins import coin_list
+
+    run_backtests(coin_list)
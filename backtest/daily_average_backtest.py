@@ -1,9 +1,11 @@
-import time
 import numpy as np
 from api.upbit_api import get_daily_candles
 from dotenv import load_dotenv
 from utils import save_market_backtest_result, save_backtest_results, calculate_cumulative_return, calculate_mdd, calculate_win_rate
+from utils.backtest_engine import backtest_strategy
 from utils.data_utils import get_recent_candles
+from utils.results_db import run_params
+from backtest.strategy import Strategy
 
 # .env 파일 로드
 load_dotenv()
@@ -35,36 +37,23 @@ def generate_signals(df):
     return df
 
 
-def backtest_strategy(df, initial_capital, investment_fraction=0.2):
-    """
-    생성된 신호를 기반으로 간단한 백테스트를 수행하는 함수
+class DailyAverageStrategy(Strategy):
+    """ 종가가 이동평균보다 높으면 보유하는 전략 (generate_signals와 같은 신호) """
 
-    :param df: 신호가 추가된 데이터프레임
-    :param initial_capital: 초기 자본
-    :param investment_fraction: 매수 시 투자 비율
-    :return: 백테스트 결과가 추가된 데이터프레임
-    """
-    cash = initial_capital
-    shares = 0
-    df['holdings'] = 0.0
-    df['cash'] = float(initial_capital)
-    df['total'] = float(initial_capital)
-
-    for i in range(1, len(df)):
-        if df['positions'].iloc[i] == 1:  # 매수 신호
-            investment = cash * investment_fraction
-            shares += investment / df['close'].iloc[i]
-            cash -= investment
-        elif df['positions'].iloc[i] == -1:  # 매도 신호
-            cash += shares * df['close'].iloc[i]
-            shares = 0
-        df.loc[df.index[i], 'holdings'] = shares * df['close'].iloc[i]
-        df.loc[df.index[i], 'cash'] = cash
-        df.loc[df.index[i], 'total'] = df.loc[df.index[i], 'holdings'] + df.loc[df.index[i], 'cash']
-
-    df['returns'] = df['total'].pct_change()
+    def __init__(self, window=5, investment_fraction=1):
+        self.window = window
+        self.investment_fraction = investment_fraction
+        self.name = f"daily_average_{window}"
 
-    return df
+    @property
+    def indicators(self):
+        return [("sma", "close", self.window)]
+
+    def signals(self, arrays, indicators):
+        return np.where(arrays["close"] > indicators[("sma", "close", self.window)], 1, 0)
+
+    def result_columns(self, arrays, indicators):
+        return {"moving_avg": indicators[("sma", "close", self.window)]}
 
 
 def run_backtest(market, count, initial_capital, window=5, investment_fraction=0.5):
@@ -113,9 +102,9 @@ def run_daily_average_backtest(markets, count=200, initial_capital=10000, window
         print(f"Daily average backtest for {market}...")
         result = run_backtest(market, count, initial_capital, window, investment_fraction)
         results.append(result)
-        time.sleep(2)  # 각 API 호출 사이에 2초 지연
 
-    result_df = save_backtest_results(results, count, f"daily_average_{window}")
+    params = run_params({"window": window, "investment_fraction": investment_fraction}, initial_capital)
+    result_df = save_backtest_results(results, count, f"daily_average_{window}", params)
 
     print(result_df)
 
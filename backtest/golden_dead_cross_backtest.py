@@ -1,8 +1,10 @@
-import time
 import numpy as np
 from api.upbit_api import get_daily_candles
 from utils import save_market_backtest_result, save_backtest_results, calculate_cumulative_return, calculate_mdd, calculate_win_rate
+from utils.backtest_engine import backtest_strategy
 from utils.data_utils import get_recent_candles
+from utils.results_db import run_params
+from backtest.strategy import Strategy
 
 
 def calculate_moving_averages(df, short_window=5, long_window=20):
@@ -20,28 +22,35 @@ def generate_signals(df, short_window):
     return df
 
 
-def backtest_strategy(df, initial_capital, investment_fraction=0.2):
-    cash = initial_capital
-    shares = 0
-    df['holdings'] = 0.0
-    df['cash'] = float(initial_capital)
-    df['total'] = float(initial_capital)
+class GoldenDeadCrossStrategy(Strategy):
+    """ 단기 이동평균이 장기 이동평균보다 높으면 보유하는 전략 (generate_signals와 같은 신호) """
 
-    for i in range(1, len(df)):
-        if df['positions'].iloc[i] == 1:  # 매수 신호
-            investment = cash * investment_fraction
-            shares += investment / df['close'].iloc[i]
-            cash -= investment
-        elif df['positions'].iloc[i] == -1:  # 매도 신호
-            cash += shares * df['close'].iloc[i]
-            shares = 0
-        df.loc[df.index[i], 'holdings'] = shares * df['close'].iloc[i]
-        df.loc[df.index[i], 'cash'] = cash
-        df.loc[df.index[i], 'total'] = df.loc[df.index[i], 'holdings'] + df.loc[df.index[i], 'cash']
+    name = "golden_dead_cross"
 
-    df['returns'] = df['total'].pct_change()
+    def __init__(self, short_window=5, long_window=20, investment_fraction=1):
+        self.short_window = short_window
+        self.long_window = long_window
+        self.investment_fraction = investment_fraction
 
-    return df
+    @property
+    def indicators(self):
+        return [("sma", "close", self.short_window), ("sma", "close", self.long_window)]
+
+    def should_save(self, count):
+        return count == 200
+
+    def signals(self, arrays, indicators):
+        short_mavg = indicators[("sma", "close", self.short_window)]
+        long_mavg = indicators[("sma", "close", self.long_window)]
+        signal = np.where(short_mavg > long_mavg, 1, 0)
+        signal[:self.short_window] = 0
+        return signal
+
+    def result_columns(self, arrays, indicators):
+        return {
+            "short_mavg": indicators[("sma", "close", self.short_window)],
+            "long_mavg": indicators[("sma", "close", self.long_window)],
+        }
 
 
 def run_backtest(market, count, initial_capital, short_window=5, long_window=20, investment_fraction=0.5):
@@ -81,9 +90,9 @@ def run_golden_cross_backtests(markets, count=200, initial_capital=10000):
         print(f"Golden dead cross backtest for {market}...")
         result = run_backtest(market, count, initial_capital, short_window=5, long_window=20, investment_fraction=1)
         results.append(result)
-        time.sleep(2)  # 각 API 호출 사이에 2초 지연
 
-    result_df = save_backtest_results(results, count, "golden_dead_cross")
+    params = run_params({"short_window": 5, "long_window": 20, "investment_fraction": 1}, initial_capital)
+    result_df = save_backtest_results(results, count, "golden_dead_cross", params)
 
     print(result_df)
 
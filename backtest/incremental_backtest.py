@@ -0,0 +1,288 @@
+"""
+backtest/incremental_backtest.py
+
+이전 실행의 마지막 상태에서 새 캔들만 이어서 계산하는 증분 일봉 백테스트.
+
+시작일(anchor)을 고정하고 끝이 늘어나는 구간을 평가합니다.
+(최근 count개처럼 시작이 함께 밀리는 구간은 첫 캔들이 빠질 때마다 전체 경로가 바뀌므로 이어서 계산할 수 없습니다.)
+첫 실행에서는 최근 count개의 첫 캔들을 시작일로 정하고, 이후 실행은 그 날부터의 누적 결과를 냅니다.
+
+전략·시장마다 results/state/{결과 이름}/{시장}.json에 다음 상태를 남깁니다.
+- 현금, 보유 수량 (utils.backtest_engine.simulate_events를 그 상태에서 이어서 실행)
+- 지표 창 길이만큼의 마지막 캔들 (새 캔들과 이어 붙여 지표와 신호를 다시 계산)
+- 최고 평가금액, 최저 낙폭, 직전 거래 행의 평가금액, 매도·이익 매도 횟수 (MDD, 승률 누적)
+
+아직 형성 중일 수 있는 마지막 캔들은 상태에 넣지 않고 실행마다 다시 계산합니다.
+다음 경우에는 시작일부터 전체를 다시 계산합니다.
+- 저장소 epoch가 바뀐 경우 (utils.candle_store, 빠진 구간 채우기나 전체 교체로 과거 이력이 바뀜)
+- 저장해 둔 마지막 캔들이 저장소의 같은 행과 다른 경우
+- 전략 파라미터, 초기 자본, 거래 비용이 바뀐 경우
+- 창 길이로 이어 붙일 수 없는 지표(ema)를 쓰는 전략
+
+실행: python3 -m backtest.incremental_backtest [첫 실행의 캔들 수]
+"""
+
+import os
+import json
+import numpy as np
+
+from backtest.backtester import get_default_strategies
+from backtest.strategy import compute_indicators, signal_to_positions
+from utils import save_backtest_results
+from utils.backtest_engine import simulate_events
+from utils.candle_store import DAYS, PRICE_COLUMNS, has_candles, read_columns, read_epoch, read_meta, search_row
+from utils.results_db import run_params
+
+STATE_DIR = "results/state"
+
+STATE_VERSION = 1
+
+# 상태에 넣지 않고 실행마다 다시 계산하는 마지막 캔들 수 (형성 중인 캔들)
+HOLD_BACK = 1
+
+# 전략의 signals가 직전 캔들을 참조하는 경우(예: 전일 거래량)를 위한 여유 행
+SIGNAL_LOOKBACK = 1
+
+
+def get_lookback(strategy):
+    """
+    전략의 신호를 다시 계산하는 데 필요한 이전 캔들 수.
+
+    :return: 행 수 (창 길이로 이어 붙일 수 없는 지표를 쓰면 None)
+    """
+    lookback = 0
+    for spec in strategy.indicators:
+        if spec[0] in ("sma", "std"):
+            lookback = max(lookback, spec[2] - 1)
+        elif spec[0] == "range":
+            lookback = max(lookback, 1)
+        else:
+            return None
+    return lookback + SIGNAL_LOOKBACK
+
+
+def get_state_path(strategy, market):
+    return os.path.join(STATE_DIR, strategy.results_name, f"{market}.json")
+
+
+def load_state(strategy, market):
+    """ 저장된 상태 (없으면 None) """
+    path = get_state_path(strategy, market)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(strategy, market, state):
+    """ 상태를 임시 파일에 쓴 뒤 교체하여 원자적으로 저장합니다 """
+    path = get_state_path(strategy, market)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def make_state_key(strategy, initial_capital, costs=None):
+    """ 상태를 이어 쓸 수 있는 실행 설정 (하나라도 바뀌면 전체 재계산) """
+    if costs is not None and costs.is_zero:
+        costs = None
+    return {
+        "version": STATE_VERSION,
+        "strategy": strategy.results_name,
+        "params": json.loads(json.dumps(strategy.params, default=str)),
+        "initial_capital": initial_capital,
+        "costs": repr(costs) if costs is not None else None,
+    }
+
+
+def _initial_accumulators():
+    """ 첫 행 이전의 지표 누적값 (metrics 배열 함수의 NaN 시작과 같음) """
+    return {"peak": np.nan, "min_drawdown": np.nan, "last_trade_total": np.nan, "sells": 0, "wins": 0}
+
+
+def accumulate_metrics(accumulators, positions, total):
+    """
+    MDD와 승률 누적값에 새 행들을 더하는 함수.
+
+    utils.backtest_metrics의 mdd_array, win_rate_array를 앞 구간의 누적값에서 이어서 계산한 것과 같습니다.
+
+    :param accumulators: 앞 구간까지의 누적값
+    :param positions: 새 행들의 positions
+    :param total: 새 행들의 평가금액
+    :return: 새 누적값
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    total = np.asarray(total, dtype=np.float64)
+    if len(total) == 0:
+        return dict(accumulators)
+
+    peak = np.fmax.accumulate(np.concatenate(([accumulators["peak"]], total)))[1:]
+    drawdown = np.concatenate(([accumulators["min_drawdown"]], total / peak - 1))
+
+    trades = positions != 0
+    trade_totals = np.concatenate(([accumulators["last_trade_total"]], total[trades]))
+    sells = positions[trades] == -1
+    wins = sells & (np.diff(trade_totals) > 0)
+
+    return {
+        "peak": float(peak[-1]),
+        "min_drawdown": np.nan if np.isnan(drawdown).all() else float(np.nanmin(drawdown)),
+        "last_trade_total": float(trade_totals[-1]),
+        "sells": accumulators["sells"] + int(sells.sum()),
+        "wins": accumulators["wins"] + int(wins.sum()),
+    }
+
+
+def _read_arrays(market, start, stop=None):
+    return {column: np.array(values) for column, values in read_columns(market, DAYS, PRICE_COLUMNS, start, stop).items()}
+
+
+def _tail_matches(market, state):
+    """ 저장해 둔 마지막 캔들이 저장소의 같은 행과 같은지 확인합니다 """
+    tail = state["tail"]
+    rows = state["rows"]
+    arrays = _read_arrays(market, rows - len(tail["date"]), rows)
+    return all(np.array_equal(arrays[column], np.asarray(values, dtype=arrays[column].dtype), equal_nan=True)
+               for column, values in tail.items())
+
+
+def _resume_state(strategy, market, key, lookback, total_rows):
+    """ 이어서 계산할 수 있는 저장 상태 (없거나 무효하면 None) """
+    state = load_state(strategy, market)
+    if state is None or lookback is None or state["key"] != key:
+        return None
+    if state["epoch"] != read_epoch(market, DAYS) or state["rows"] > total_rows - HOLD_BACK:
+        return None
+    if state["rows"] <= state["anchor_row"] or not _tail_matches(market, state):
+        return None
+    return state
+
+
+def run_incremental(market, strategy, count=200, initial_capital=10000, costs=None, save=True):
+    """
+    한 시장·전략의 시작일 고정 백테스트를 저장된 상태에서 이어서 계산하는 함수.
+
+    :param market: 시장 코드
+    :param strategy: Strategy
+    :param count: 첫 실행(또는 상태가 없을 때)의 시작일을 정하는 최근 캔들 수
+    :param initial_capital: 초기 자본
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
+    :param save: 상태 저장 여부
+    :return: 결과 딕셔너리 (Start: 시작일, Count: 시작일부터의 캔들 수, Mode: 'incremental' 또는 'full')
+    """
+    total_rows = read_meta(market, DAYS)["rows"]
+    key = make_state_key(strategy, initial_capital, costs)
+    lookback = get_lookback(strategy)
+    state = _resume_state(strategy, market, key, lookback, total_rows)
+
+    if state is not None:
+        # 마지막으로 확정한 행부터 (그 행의 신호는 positions 차분에만 쓰임)
+        anchor, anchor_row = state["anchor"], state["anchor_row"]
+        first_row = state["rows"] - 1
+        read_start = max(anchor_row, first_row - lookback)
+        cash, shares = state["cash"], state["shares"]
+        accumulators = state["accumulators"]
+    else:
+        previous = load_state(strategy, market)
+        if previous is not None and previous["key"] == key:
+            anchor = previous["anchor"]
+            anchor_row = search_row(market, DAYS, np.datetime64(anchor, "ns"))
+        else:
+            anchor_row = max(0, total_rows - count)
+            anchor = int(read_columns(market, DAYS, ["date"], anchor_row, anchor_row + 1)["date"][0])
+        first_row = read_start = anchor_row
+        cash, shares = initial_capital, 0
+        accumulators = _initial_accumulators()
+
+    arrays = _read_arrays(market, read_start)
+    indicators = compute_indicators(arrays, strategy.indicators)
+    offset = first_row - read_start
+
+    signal = np.asarray(strategy.signals(arrays, indicators))[offset:]
+    positions = signal_to_positions(signal)
+    close = arrays["close"][offset:]
+    state_index, event_shares, event_cash = simulate_events(
+        close, positions, cash, strategy.investment_fraction, costs=costs, volume=arrays["volume"][offset:],
+        initial_shares=shares
+    )
+    shares_values = event_shares[state_index]
+    cash_values = event_cash[state_index]
+    total = shares_values * close + cash_values
+
+    # 처음부터 계산할 때는 첫 행도 새 행 (simulate_positions와 같이 평가금액은 초기 자본)
+    new_from = 1
+    if state is None:
+        total[0] = float(initial_capital)
+        new_from = 0
+
+    # 형성 중일 수 있는 마지막 캔들 앞까지를 상태로 확정
+    commit = len(close) - HOLD_BACK
+    if save and lookback is not None and commit >= 1:
+        committed = accumulate_metrics(accumulators, positions[new_from:commit], total[new_from:commit])
+        rows = first_row + commit
+        tail_start = max(anchor_row, rows - lookback - 1) - read_start
+        save_state(strategy, market, {
+            "key": key,
+            "anchor": anchor,
+            "anchor_row": anchor_row,
+            "epoch": read_epoch(market, DAYS),
+            "rows": rows,
+            "cash": float(cash_values[commit - 1]),
+            "shares": float(shares_values[commit - 1]),
+            "accumulators": committed,
+            "tail": {column: values[tail_start:rows - read_start].tolist() for column, values in arrays.items()},
+        })
+
+    result = accumulate_metrics(accumulators, positions[new_from:], total[new_from:])
+    return {
+        "Market": market,
+        "Start": str(np.datetime64(anchor, "ns").astype("datetime64[D]")),
+        "Count": total_rows - anchor_row,
+        "Investment Fraction": strategy.investment_fraction,
+        "Cumulative Return (%)": (total[-1] / initial_capital - 1) * 100,
+        "Win Rate (%)": result["wins"] / result["sells"] * 100 if result["sells"] else 0,
+        "Max Drawdown (%)": result["min_drawdown"] * 100,
+        "Mode": "incremental" if state is not None else "full",
+    }
+
+
+def run_incremental_backtests(markets, count=200, initial_capital=10000, strategies=None, costs=None, save=True):
+    """
+    여러 시장에 일봉 전략을 증분 실행하고 전략별 결과를 저장하는 함수.
+
+    결과 이름은 '{전략 결과 이름}_anchored'입니다 (최근 count개 구간 결과와 구분).
+
+    :param markets: 시장 코드 목록 (저장소에 일봉이 있는 시장만 실행)
+    :param count: 첫 실행의 시작일을 정하는 최근 캔들 수
+    :param initial_capital: 초기 자본
+    :param strategies: Strategy 목록 (None이면 get_default_strategies())
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
+    :param save: 상태와 결과 저장 여부
+    :return: {결과 이름: 결과 데이터프레임 또는 결과 목록(save=False)}
+    """
+    strategies = strategies or get_default_strategies()
+    markets = [market for market in markets if has_candles(market, DAYS)]
+
+    results = {}
+    for strategy in strategies:
+        name = f"{strategy.results_name}_anchored"
+        results[name] = [run_incremental(market, strategy, count, initial_capital, costs, save) for market in markets]
+        if save:
+            print(f"\n[ {name} ]")
+            results[name] = save_backtest_results(
+                results[name], count, name, run_params(strategy.params, initial_capital, costs)
+            )
+            print(results[name])
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from coins import coin_list
+    from utils.backtest_engine import UPBIT_COSTS
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    run_incremental_backtests(coin_list, count, costs=UPBIT_COSTS)
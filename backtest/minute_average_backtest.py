@@ -1,11 +1,12 @@
 import datetime
-import time
 import numpy as np
 import pytz
 from api.upbit_api import get_daily_candles
 from dotenv import load_dotenv
 from utils import save_market_backtest_result, save_backtest_results, calculate_cumulative_return, calculate_mdd, calculate_win_rate
+from utils.backtest_engine import backtest_strategy
 from utils.data_utils import get_minute_candles_from_file, get_recent_candles
+from utils.results_db import run_params
 
 # .env 파일 로드
 load_dotenv()
@@ -37,38 +38,6 @@ def generate_signals(df):
     return df
 
 
-def backtest_strategy(df, initial_capital, investment_fraction=0.2):
-    """
-    생성된 신호를 기반으로 간단한 백테스트를 수행하는 함수
-
-    :param df: 신호가 추가된 데이터프레임
-    :param initial_capital: 초기 자본
-    :param investment_fraction: 매수 시 투자 비율
-    :return: 백테스트 결과가 추가된 데이터프레임
-    """
-    cash = initial_capital
-    shares = 0
-    df['holdings'] = 0.0
-    df['cash'] = float(initial_capital)
-    df['total'] = float(initial_capital)
-
-    for i in range(1, len(df)):
-        if df['positions'].iloc[i] == 1:  # 매수 신호
-            investment = cash * investment_fraction
-            shares += investment / df['close'].iloc[i]
-            cash -= investment
-        elif df['positions'].iloc[i] == -1:  # 매도 신호
-            cash += shares * df['close'].iloc[i]
-            shares = 0
-        df.loc[df.index[i], 'holdings'] = shares * df['close'].iloc[i]
-        df.loc[df.index[i], 'cash'] = cash
-        df.loc[df.index[i], 'total'] = df.loc[df.index[i], 'holdings'] + df.loc[df.index[i], 'cash']
-
-    df['returns'] = df['total'].pct_change()
-
-    return df
-
-
 def run_backtest(market, count, initial_capital, window=5, investment_fraction=0.5):
     """
     백테스트를 실행하는 메인 함수
@@ -120,9 +89,9 @@ def run_minute_average_backtest(markets, count=200, initial_capital=10000, windo
         print(f"Minete average backtest for {market}...")
         result = run_backtest(market, count, initial_capital, window, investment_fraction)
         results.append(result)
-        time.sleep(2)  # 각 API 호출 사이에 2초 지연
 
-    result_df = save_backtest_results(results, count, f"minute_average_{window}")
+    params = run_params({"window": window, "investment_fraction": investment_fraction}, initial_capital)
+    result_df = save_backtest_results(results, count, f"minute_average_{window}", params)
 
     print(result_df)
 
@@ -0,0 +1,107 @@
+"""
+backtest/orchestrator.py
+
+backtest.py의 모든 백테스트 작업을 프로세스 풀에서 실행하는 오케스트레이터.
+
+작업은 (전략 묶음 × 시장) 단위입니다.
+- daily: 일봉 전략 전체 (backtester.run_market, 시장 데이터를 한 번 읽어 모든 변형을 평가)
+- afternoon: 오후 전략 (60분봉)
+
+캔들은 utils.shared_candles로 워커에 복사 없이 공유하고, 인위적인 지연 없이 실행합니다.
+use_cache이면 일봉 작업은 입력이 바뀐 (시장, 전략)만 계산합니다 (utils.result_cache).
+완료 순서와 관계없이 결과는 (작업 종류, 입력 시장 순서)로 모아 저장하므로 실행마다 같습니다.
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+from backtest.backtester import get_default_strategies, run_market
+from backtest import afternoon_backtest
+from utils import result_cache, save_backtest_results
+from utils.candle_store import DAYS
+from utils.results_db import run_params
+from utils.save_results import check_storage_mode
+from utils.shared_candles import init_worker, publish_candles
+
+JOB_KINDS = ["daily", "afternoon"]
+
+AFTERNOON_INVESTMENT_FRACTION = 1
+
+
+def run_job(kind, market, count, initial_capital, strategies, costs=None, use_cache=False, storage="csv"):
+    """
+    워커에서 실행되는 작업 하나 (use_cache, storage는 daily 작업에만 적용).
+
+    :return: [(결과 이름, 결과 딕셔너리), ...]
+    """
+    if kind == "daily":
+        results = run_market(
+            market, count, initial_capital, strategies, costs=costs, use_cache=use_cache, storage=storage
+        )
+        return [(strategy.results_name, result) for strategy, result in zip(strategies, results)]
+
+    if kind == "afternoon":
+        result = asyncio.run(afternoon_backtest.run_backtest(
+            market, count, initial_capital, AFTERNOON_INVESTMENT_FRACTION, costs
+        ))
+        return [("afternoon", result)]
+
+    raise ValueError(f"Unknown job kind: {kind}")
+
+
+def merge_results(jobs, job_results):
+    """
+    작업 결과를 결과 이름별 목록으로 모으는 함수 (작업 목록 순서를 따르므로 완료 순서와 무관).
+
+    :param jobs: (작업 종류, 시장) 목록
+    :param job_results: {(작업 종류, 시장): run_job 결과}
+    :return: {결과 이름: [결과 딕셔너리, ...]}
+    """
+    merged = {}
+    for job in jobs:
+        for name, result in job_results[job]:
+            merged.setdefault(name, []).append(result)
+    return merged
+
+
+def run_all_backtests(markets, count=200, initial_capital=10000, kinds=None, strategies=None, costs=None,
+                      max_workers=None, use_cache=False, storage="csv"):
+    """
+    모든 (전략 묶음 × 시장) 백테스트를 병렬로 실행하고 결과 이름별로 저장하는 함수.
+
+    :param markets: 시장 코드 목록
+    :param count: 사용할 캔들 개수
+    :param initial_capital: 초기 자본
+    :param kinds: 실행할 작업 종류 (None이면 JOB_KINDS 전체)
+    :param strategies: 일봉 Strategy 목록 (None이면 get_default_strategies())
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
+    :param max_workers: 워커 프로세스 수 (None이면 CPU 수)
+    :param use_cache: 일봉 결과 캐시(utils.result_cache) 사용 여부 (입력이 바뀐 시장·전략만 다시 계산)
+    :param storage: 일봉 시장별 결과 저장 방식 (utils.save_results.STORAGE_MODES)
+    :return: {결과 이름: 결과 데이터프레임}
+    """
+    check_storage_mode(storage)
+    kinds = kinds or JOB_KINDS
+    strategies = strategies or get_default_strategies()
+    jobs = [(kind, market) for kind in kinds for market in markets]
+
+    timeframes = [DAYS] + (["minutes_60"] if "afternoon" in kinds else [])
+    with publish_candles(markets, timeframes) as shared:
+        with ProcessPoolExecutor(max_workers, initializer=init_worker, initargs=(shared.catalog,)) as executor:
+            futures = {
+                job: executor.submit(run_job, *job, count, initial_capital, strategies, costs, use_cache, storage)
+                for job in jobs
+            }
+            job_results = {job: future.result() for job, future in futures.items()}
+    if use_cache:
+        result_cache.evict()
+
+    params = {strategy.results_name: run_params(strategy.params, initial_capital, costs) for strategy in strategies}
+    params["afternoon"] = run_params({"investment_fraction": AFTERNOON_INVESTMENT_FRACTION}, initial_capital, costs)
+
+    result_dfs = {}
+    for name, market_results in merge_results(jobs, job_results).items():
+        print(f"\n[ {name} ]")
+        result_dfs[name] = save_backtest_results(market_results, count, name, params.get(name))
+        print(result_dfs[name])
+    return result_dfs
@@ -0,0 +1,225 @@
+"""
+backtest/portfolio_backtest.py
+
+여러 시장이 하나의 계좌(자본)를 나눠 쓰는 포트폴리오 백테스트.
+
+시장별로 따로 initial_capital을 두는 기존 백테스트와 달리, (시각 × 시장) 신호 행렬과
+자본 배분 규칙으로 목표 비중 행렬을 만들고 하나의 계좌를 행렬 연산으로 시뮬레이션합니다.
+
+배분 규칙 (신호가 1인 시장에만 배분):
+- equal: 시장마다 자본의 1/시장 수 (신호가 없는 몫은 현금)
+- active_equal: 신호가 있는 시장끼리 자본을 똑같이 나눔
+- inverse_volatility: 신호가 있는 시장끼리 최근 수익률 표준편차의 역수에 비례해 나눔
+
+리밸런싱:
+- signal: 목표 비중이 바뀌는 행에서만 목표 비중으로 맞춤 (나머지 행은 보유 수량 유지, utils.backtest_engine과 같은 방식)
+- daily: 매 행 목표 비중으로 맞춤
+
+거래 비용(CostModel)은 리밸런싱 거래에 수수료와 고정 슬리피지만 반영합니다 (거래량 비례 슬리피지 제외).
+
+실행: python3 -m backtest.portfolio_backtest [배분 규칙] [일봉 개수]
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from backtest.daily_average_backtest import DailyAverageStrategy
+from backtest.strategy import compute_indicators
+from utils.backtest_metrics import cumulative_return_array, mdd_array
+from utils.candle_store import DAYS, PRICE_COLUMNS
+from utils.data_utils import get_recent_candles
+from utils.indicator_cache import make_cache_key
+
+ALLOCATION_RULES = ["equal", "active_equal", "inverse_volatility"]
+
+REBALANCE_MODES = ["signal", "daily"]
+
+OUTPUT_DIR = "results/portfolio"
+
+
+def build_signal_matrix(markets, count, strategies):
+    """
+    시장별 전략 신호와 종가를 날짜 기준 (시각 × 시장) 행렬로 맞추는 함수.
+
+    상장 전처럼 데이터가 없는 칸의 신호는 0, 종가는 직전 값(없으면 NaN)입니다.
+
+    :param markets: 시장 코드 목록
+    :param count: 시장별 일봉 개수
+    :param strategies: Strategy 하나 또는 {시장: Strategy} (예: best_strategy 결과)
+    :return: (signals, close) 데이터프레임 (columns: 시장)
+    """
+    signals, closes = {}, {}
+    for market in markets:
+        strategy = strategies[market] if isinstance(strategies, dict) else strategies
+        candles = get_recent_candles(market, count).sort_index()
+        arrays = {column: candles[column].to_numpy() for column in PRICE_COLUMNS}
+        indicators = compute_indicators(arrays, strategy.indicators, make_cache_key(market, DAYS, candles))
+        signals[market] = pd.Series(strategy.signals(arrays, indicators), index=candles.index)
+        closes[market] = candles['close']
+
+    signal_df = pd.DataFrame(signals).sort_index().fillna(0)
+    close_df = pd.DataFrame(closes).sort_index().ffill()
+    return signal_df, close_df
+
+
+def allocation_weights(signals, close, rule="active_equal", vol_window=20):
+    """
+    신호 행렬과 배분 규칙으로 목표 비중 행렬을 만드는 함수.
+
+    :param signals: (시각 × 시장) 신호 배열 (1: 보유, 0: 미보유)
+    :param close: (시각 × 시장) 종가 배열
+    :param rule: ALLOCATION_RULES 중 하나
+    :param vol_window: inverse_volatility의 표준편차 윈도우
+    :return: (시각 × 시장) 목표 비중 배열 (행 합계 <= 1)
+    """
+    active = np.asarray(signals, dtype=np.float64) > 0
+    markets = active.shape[1]
+
+    if rule == "equal":
+        return active / max(markets, 1)
+
+    active_counts = active.sum(axis=1, keepdims=True)
+    equal_weights = np.divide(active, active_counts, out=np.zeros(active.shape), where=active_counts > 0)
+    if rule == "active_equal":
+        return equal_weights
+
+    if rule == "inverse_volatility":
+        returns = pd.DataFrame(np.asarray(close, dtype=np.float64)).pct_change(fill_method=None)
+        volatility = returns.rolling(vol_window, min_periods=2).std().to_numpy()
+        inverse = np.where(active & (volatility > 0), 1 / np.where(volatility > 0, volatility, 1), 0)
+        totals = inverse.sum(axis=1, keepdims=True)
+        weights = np.divide(inverse, totals, out=np.zeros(active.shape), where=totals > 0)
+        # 변동성을 아직 계산할 수 없는 행은 균등 배분
+        return np.where(totals > 0, weights, equal_weights)
+
+    raise ValueError(f"Unknown allocation rule: {rule}")
+
+
+def simulate_portfolio(close, weights, initial_capital, rebalance="signal", costs=None):
+    """
+    목표 비중 행렬로 하나의 계좌를 시뮬레이션하는 함수.
+
+    첫 행은 현금으로 시작하며 (utils.backtest_engine과 같이) 리밸런싱은 1번 행부터 합니다.
+    상태(현금, 시장별 수량)는 리밸런싱 행에서만 바뀌므로 그 행만 순서대로 계산하고,
+    나머지 행은 직전 상태를 행렬 연산으로 이어 붙입니다.
+
+    비용이 있으면 줄이는 시장을 먼저 종가 × (1 - 비용 비율)에 팔고, 늘리는 시장은 종가 × (1 + 비용 비율)에
+    남은 현금(목표 현금 비중 제외) 안에서 삽니다. 시장 하나에 전액 투자하면 utils.backtest_engine과 같습니다.
+
+    :param close: (시각 × 시장) 종가 배열
+    :param weights: (시각 × 시장) 목표 비중 배열
+    :param initial_capital: 초기 자본
+    :param rebalance: REBALANCE_MODES 중 하나
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
+    :return: (holdings (시각 × 시장), cash, total, turnover) 배열 (turnover: 행별 거래대금 / 평가금액)
+    """
+    close = np.nan_to_num(np.asarray(close, dtype=np.float64))
+    weights = np.asarray(weights, dtype=np.float64)
+    rows, markets = close.shape
+    rate = costs.rate(0, 0) if costs is not None and not costs.is_zero else None
+
+    if rebalance == "signal":
+        events = np.flatnonzero((weights[1:] != weights[:-1]).any(axis=1)) + 1
+    elif rebalance == "daily":
+        events = np.arange(1, rows)
+    else:
+        raise ValueError(f"Unknown rebalance mode: {rebalance}")
+
+    event_shares = np.zeros((len(events) + 1, markets))
+    event_cash = np.empty(len(events) + 1)
+    event_cash[0] = initial_capital
+    turnover = np.zeros(rows)
+
+    cash = initial_capital
+    shares = np.zeros(markets)
+    for k, t in enumerate(events, start=1):
+        prices = close[t]
+        equity = cash + prices @ shares
+        target = np.divide(weights[t] * equity, prices, out=np.zeros(markets), where=prices > 0)
+        if rate is None:
+            turnover[t] = np.abs(target - shares) @ prices / equity if equity > 0 else 0
+            cash = equity * (1 - weights[t].sum())
+            shares = target
+        else:
+            sell = target < shares
+            cash += (shares[sell] - target[sell]) @ prices[sell] * (1 - rate)
+            buy_value = np.where(target > shares, target - shares, 0) * prices
+            budget = max(cash - equity * (1 - weights[t].sum()), 0)
+            scale = min(1, budget / (buy_value.sum() * (1 + rate))) if buy_value.sum() > 0 else 0
+            new_shares = np.where(sell, target, shares + np.divide(
+                buy_value * scale, prices, out=np.zeros(markets), where=prices > 0))
+            cash -= buy_value.sum() * scale * (1 + rate)
+            turnover[t] = np.abs(new_shares - shares) @ prices / equity if equity > 0 else 0
+            shares = new_shares
+        event_shares[k] = shares
+        event_cash[k] = cash
+
+    marker = np.zeros(rows, dtype=np.int64)
+    marker[events] = np.arange(1, len(events) + 1)
+    state = np.maximum.accumulate(marker) if rows else marker
+
+    holdings = event_shares[state] * close
+    cash = event_cash[state]
+    total = cash + holdings.sum(axis=1)
+    return holdings, cash, total, turnover
+
+
+def run_portfolio_backtest(markets, strategies=None, rule="active_equal", count=200, initial_capital=10000,
+                           rebalance="signal", vol_window=20, save=True, costs=None):
+    """
+    전체 시장을 하나의 계좌로 백테스트하는 함수.
+
+    :param markets: 시장 코드 목록
+    :param strategies: Strategy 하나 또는 {시장: Strategy} (None이면 DailyAverageStrategy(5))
+    :param rule: 자본 배분 규칙
+    :param count: 시장별 일봉 개수
+    :param initial_capital: 계좌 전체의 초기 자본
+    :param rebalance: 리밸런싱 방식
+    :param vol_window: inverse_volatility의 표준편차 윈도우
+    :param save: results/portfolio 아래 평가금액 저장 여부
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
+    :return: (요약 딕셔너리, date 인덱스의 결과 데이터프레임)
+    """
+    strategies = strategies or DailyAverageStrategy(5)
+    signal_df, close_df = build_signal_matrix(markets, count, strategies)
+    weights = allocation_weights(signal_df.to_numpy(), close_df.to_numpy(), rule, vol_window)
+    holdings, cash, total, turnover = simulate_portfolio(
+        close_df.to_numpy(), weights, initial_capital, rebalance, costs
+    )
+
+    df = pd.DataFrame(holdings, index=close_df.index, columns=close_df.columns)
+    df['cash'] = cash
+    df['total'] = total
+    df['turnover'] = turnover
+    df['returns'] = df['total'].pct_change()
+
+    summary = {
+        "Rule": rule,
+        "Rebalance": rebalance,
+        "Markets": len(markets),
+        "Count": len(df),
+        "Cumulative Return (%)": cumulative_return_array(total, initial_capital),
+        "Max Drawdown (%)": mdd_array(total),
+        "Turnover (%)": turnover.sum() * 100,
+        "Average Exposure (%)": float(np.mean(1 - cash / total)) * 100,
+    }
+
+    if save:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        output_file = os.path.join(OUTPUT_DIR, f"portfolio_{rule}_{rebalance}_{count}.csv")
+        df.to_csv(output_file)
+        print(f"Portfolio backtest results saved to '{output_file}'.")
+    return summary, df
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from coins import coin_list
+    from utils.backtest_engine import UPBIT_COSTS
+
+    rules = [sys.argv[1]] if len(sys.argv) > 1 else ALLOCATION_RULES
+    portfolio_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    summaries = [run_portfolio_backtest(coin_list, rule=rule, count=portfolio_count, costs=UPBIT_COSTS)[0] for rule in rules]
+    print(pd.DataFrame(summaries))
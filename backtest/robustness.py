@@ -0,0 +1,77 @@
+"""
+backtest/robustness.py
+
+모든 코인과 일봉 전략에 대한 야간 부트스트랩 강건성 분석.
+
+backtest.py와 같은 전략과 구간으로 시장마다 한 번 백테스트한 뒤,
+행별/거래별 수익률을 utils.robustness로 재추출해 지표 분포의 신뢰구간을 저장합니다.
+결과: results/robustness/robustness_{count}.csv (전략 × 시장 × 모드별 한 행)
+
+실행: python3 -m backtest.robustness [일봉 개수] [경로 수]
+"""
+
+import os
+import sys
+from datetime import datetime
+import pandas as pd
+
+from backtest.backtester import get_default_strategies, simulate_market
+from utils.robustness import bootstrap_backtest
+
+OUTPUT_DIR = "results/robustness"
+
+MODES = ["bar", "trade"]
+
+
+def run_robustness(markets, count=200, initial_capital=10000, n_paths=2000, block_size=1, strategies=None,
+                   seed=None, save=True, costs=None):
+    """
+    시장과 전략마다 부트스트랩 신뢰구간을 계산하는 함수.
+
+    :param markets: 시장 코드 목록
+    :param count: 사용할 일봉 개수
+    :param initial_capital: 초기 자본
+    :param n_paths: 부트스트랩 경로 수
+    :param block_size: bar 모드의 연속 추출 구간 길이
+    :param strategies: Strategy 목록 (None이면 get_default_strategies())
+    :param seed: 난수 시드 (시장/전략마다 이어서 사용)
+    :param save: 결과 CSV 저장 여부
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
+    :return: 결과 데이터프레임
+    """
+    strategies = strategies or get_default_strategies()
+
+    rows = []
+    for market in markets:
+        _, _, _, simulations = simulate_market(market, count, initial_capital, strategies, costs)
+        for strategy, (_, positions, _, _, total) in zip(strategies, simulations):
+            for mode in MODES:
+                metrics = bootstrap_backtest(positions, total, mode, n_paths,
+                                             block_size if mode == "bar" else 1, seed)
+                row = {"Strategy": strategy.results_name, "Market": market, "Mode": mode}
+                for name, stats in metrics.items():
+                    row.update({f"{name} {key}": value for key, value in stats.items()})
+                rows.append(row)
+                seed = None if seed is None else seed + 1
+
+    df = pd.DataFrame(rows)
+    if save:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        output_file = os.path.join(OUTPUT_DIR, f"robustness_{count}.csv")
+        df.to_csv(output_file, index=False)
+        print(f"Robustness results saved to '{output_file}'.")
+    return df
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from coins import coin_list
+    from utils.backtest_engine import UPBIT_COSTS
+
+    robustness_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    paths = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    start_time = datetime.now()
+    result = run_robustness(coin_list, robustness_count, n_paths=paths, costs=UPBIT_COSTS)
+    print(result[result["Mode"] == "bar"][["Strategy", "Market", "Cumulative Return (%) p5",
+                                            "Cumulative Return (%) p50", "Max Drawdown (%) p5"]])
+    print(f"Elapsed: {datetime.now() - start_time}")
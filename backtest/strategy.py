@@ -0,0 +1,88 @@
+"""
+backtest/strategy.py
+
+백테스트 전략의 공통 인터페이스.
+
+전략은 필요한 지표(indicators)를 선언하고, 캔들 배열과 계산된 지표로
+신호 배열(1: 보유, 0: 미보유)을 만듭니다. 지표 계산, 자금 계산, 지표 산출과 저장은
+러너(backtest.backtester)가 시장마다 한 번씩 공통으로 처리합니다.
+지표는 utils.indicator_cache를 통해 전략과 실행 간에 공유됩니다.
+"""
+
+import numpy as np
+
+from utils.indicator_cache import get_indicator
+
+
+def compute_indicators(arrays, specs, cache_key=None):
+    """
+    여러 전략이 선언한 지표를 중복 없이 한 번씩 계산하는 함수.
+
+    :param arrays: {컬럼: 배열} 캔들 데이터
+    :param specs: (지표 이름, 파라미터...) 목록 (예: ('sma', 'close', 5))
+    :param cache_key: utils.indicator_cache.make_cache_key 결과 (None이면 캐시하지 않음)
+    :return: {spec: 지표 배열}
+    """
+    return {spec: get_indicator(arrays, *spec, cache_key=cache_key) for spec in set(specs)}
+
+
+def signal_to_positions(signal):
+    """ 신호 배열의 차분 (첫 행은 NaN, df['signal'].diff()와 같음) """
+    positions = np.empty(len(signal))
+    positions[:1] = np.nan
+    positions[1:] = np.diff(np.asarray(signal, dtype=np.float64))
+    return positions
+
+
+class Strategy:
+    """
+    백테스트 전략의 기본 클래스.
+
+    - name: 시장별 결과 파일 이름 (save_market_backtest_result의 name)
+    - results_name: 전체 결과 파일 이름 (save_backtest_results의 name)
+    - columns: 사용하는 캔들 컬럼
+    - indicators: 필요한 지표 (지표 이름, 파라미터...) 목록 (예: ('sma', 'close', 5))
+    """
+
+    name = None
+    columns = ["close"]
+    investment_fraction = 1
+
+    @property
+    def results_name(self):
+        return self.name
+
+    @property
+    def params(self):
+        """ 결과 DB에 함께 저장할 파라미터 """
+        return dict(vars(self))
+
+    @property
+    def indicators(self):
+        return []
+
+    @property
+    def save_options(self):
+        """ save_market_backtest_result에 넘길 추가 인자 """
+        return {}
+
+    def should_save(self, count):
+        """ 시장별 결과 파일을 저장할지 여부 """
+        return True
+
+    def signals(self, arrays, indicators):
+        """
+        신호 배열을 만드는 함수.
+
+        :param arrays: {컬럼: 배열} 오래된 순으로 정렬된 캔들 데이터
+        :param indicators: compute_indicators 결과
+        :return: 행별 신호 (1: 보유, 0: 미보유)
+        """
+        raise NotImplementedError
+
+    def result_columns(self, arrays, indicators):
+        """ 시장별 결과 파일에 함께 저장할 지표 컬럼 {이름: 배열} """
+        return {}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.results_name})"
@@ -0,0 +1,175 @@
+"""
+backtest/sweep.py
+
+일봉 전략의 파라미터 스윕 엔진.
+
+전략별 파라미터 그리드를 펼쳐 (시장 × 파라미터 묶음) 작업을 프로세스 풀에 나누고,
+각 작업은 시장 데이터를 한 번 읽어 묶음 안의 전략들이 선언한 이동 평균을
+한 번씩만 계산해 공유합니다. 캔들은 utils.shared_candles로 워커에 복사 없이 공유하고,
+결과는 작업이 끝나는 대로 results/sweep 아래 하나의 CSV에 이어 씁니다.
+
+실행: python3 -m backtest.sweep [일봉 개수] [워커 수]
+"""
+
+import os
+import sys
+import csv
+import itertools
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+
+from backtest.backtester import run_market
+from backtest.daily_average_backtest import DailyAverageStrategy
+from backtest.golden_dead_cross_backtest import GoldenDeadCrossStrategy
+from backtest.volatility_backtest import VolatilityStrategy
+from utils.candle_store import DAYS
+from utils.shared_candles import init_worker, publish_candles
+
+STRATEGY_CLASSES = {
+    "daily_average": DailyAverageStrategy,
+    "golden_dead_cross": GoldenDeadCrossStrategy,
+    "volatility": VolatilityStrategy,
+}
+
+# 기본 파라미터 그리드
+DEFAULT_GRIDS = {
+    "daily_average": {"window": list(range(3, 201))},
+    "golden_dead_cross": {"short_window": list(range(3, 31)), "long_window": list(range(10, 121, 2))},
+    "volatility": {
+        "k": [round(k, 2) for k in np.arange(0.1, 1.01, 0.05)],
+        "check_ma": [False, True],
+        "check_volume": [False, True],
+        "ma_window": [3, 5, 10, 20],
+        "vol_window": [3, 5, 10],
+    },
+}
+
+# 작업 하나에 담는 파라미터 조합 수
+CHUNK_SIZE = 500
+
+OUTPUT_DIR = "results/sweep"
+
+RESULT_COLUMNS = ["Strategy", "Market", "Count", "Investment Fraction",
+                  "Cumulative Return (%)", "Win Rate (%)", "Max Drawdown (%)"]
+
+
+def expand_grid(name, grid):
+    """
+    파라미터 그리드를 조합 목록으로 펼치는 함수.
+
+    의미 없는 조합(단기 >= 장기 이동평균, 사용하지 않는 윈도우 변형)은 제외합니다.
+
+    :param name: 전략 이름 (STRATEGY_CLASSES의 키)
+    :param grid: {파라미터: 값 목록}
+    :return: 파라미터 딕셔너리 목록
+    """
+    keys = list(grid)
+    combos = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        params = dict(zip(keys, values))
+        if name == "golden_dead_cross" and params["short_window"] >= params["long_window"]:
+            continue
+        if name == "volatility":
+            if not params.get("check_ma") and params.get("ma_window", 5) != grid.get("ma_window", [5])[0]:
+                continue
+            if not params.get("check_volume") and params.get("vol_window", 5) != grid.get("vol_window", [5])[0]:
+                continue
+        combos.append(params)
+    return combos
+
+
+def build_jobs(markets, grids, chunk_size=CHUNK_SIZE):
+    """ (시장, [(전략 이름, 파라미터), ...]) 작업 목록을 만듭니다 """
+    specs = [(name, params) for name, grid in grids.items() for params in expand_grid(name, grid)]
+    chunks = [specs[i:i + chunk_size] for i in range(0, len(specs), chunk_size)]
+    return [(market, chunk) for market in markets for chunk in chunks]
+
+
+def run_job(market, specs, count, initial_capital, costs=None):
+    """
+    워커에서 실행되는 작업: 한 시장에 파라미터 묶음을 평가합니다.
+
+    :return: 결과 행 목록 (파라미터 컬럼 포함)
+    """
+    strategies = [STRATEGY_CLASSES[name](**params) for name, params in specs]
+    results = run_market(market, count, initial_capital, strategies, save=False, costs=costs)
+
+    rows = []
+    for (name, params), result in zip(specs, results):
+        rows.append({"Strategy": name, **params, **result})
+    return rows
+
+
+def get_param_columns(grids):
+    """ 결과 테이블의 파라미터 컬럼 (전략 간 합집합) """
+    columns = []
+    for grid in grids.values():
+        columns += [key for key in grid if key not in columns]
+    return columns
+
+
+def run_sweep(markets, grids=None, count=200, initial_capital=10000, max_workers=None, output_file=None, costs=None):
+    """
+    파라미터 스윕을 병렬로 실행하고 결과를 하나의 CSV로 스트리밍하는 함수.
+
+    :param markets: 시장 코드 목록
+    :param grids: {전략 이름: 파라미터 그리드} (None이면 DEFAULT_GRIDS)
+    :param count: 사용할 일봉 개수
+    :param initial_capital: 초기 자본
+    :param max_workers: 워커 프로세스 수 (None이면 CPU 수)
+    :param output_file: 결과 CSV 경로 (None이면 results/sweep/sweep_{count}_{날짜}.csv)
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음, 순수익률로 순위를 매기려면 지정)
+    :return: 결과 CSV 경로
+    """
+    grids = grids or DEFAULT_GRIDS
+    jobs = build_jobs(markets, grids)
+
+    if output_file is None:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        date_str = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_file = os.path.join(OUTPUT_DIR, f"sweep_{count}_{date_str}.csv")
+
+    columns = RESULT_COLUMNS[:1] + get_param_columns(grids) + RESULT_COLUMNS[1:]
+    combinations = sum(len(specs) for _, specs in jobs)
+    print(f"Sweeping {combinations} combinations in {len(jobs)} jobs...")
+
+    with publish_candles(markets, [DAYS]) as shared, open(output_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+
+        with ProcessPoolExecutor(max_workers, initializer=init_worker, initargs=(shared.catalog,)) as executor:
+            futures = [executor.submit(run_job, market, specs, count, initial_capital, costs) for market, specs in jobs]
+            for done, future in enumerate(as_completed(futures), start=1):
+                writer.writerows(future.result())
+                f.flush()
+                print(f"{done}/{len(jobs)} jobs done")
+
+    print(f"Sweep results saved to '{output_file}'.")
+    return output_file
+
+
+def summarize_sweep(output_file, top=5):
+    """ 전략별로 시장 평균 누적 수익률이 높은 파라미터 조합을 보여줍니다 """
+    df = pd.read_csv(output_file)
+    param_columns = [column for column in df.columns if column not in RESULT_COLUMNS]
+    summaries = {}
+    for name, group in df.groupby("Strategy"):
+        keys = [column for column in param_columns if group[column].notna().any()]
+        summary = group.groupby(keys)["Cumulative Return (%)"].mean().sort_values(ascending=False)
+        summaries[name] = summary.head(top)
+    return summaries
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from coins import coin_list
+    from utils.backtest_engine import UPBIT_COSTS
+
+    sweep_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    path = run_sweep(coin_list, count=sweep_count, max_workers=workers, costs=UPBIT_COSTS)
+    for strategy_name, best in summarize_sweep(path).items():
+        print(f"\n[ {strategy_name} ]")
+        print(best)
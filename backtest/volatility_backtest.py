@@ -1,8 +1,10 @@
-import time
 import numpy as np
 from api.upbit_api import get_daily_candles
 from utils import save_market_backtest_result, save_backtest_results, calculate_cumulative_return, calculate_mdd, calculate_win_rate
+from utils.backtest_engine import backtest_strategy
 from utils.data_utils import get_recent_candles
+from utils.results_db import run_params
+from backtest.strategy import Strategy
 
 
 def calculate_range(df):
@@ -54,28 +56,63 @@ def generate_signals(df, k=0.5, check_ma=False, check_volume=False, ma_window=5,
     return df
 
 
-def backtest_strategy(df, initial_capital, investment_fraction=0.2):
-    cash = initial_capital
-    shares = 0
-    df['holdings'] = 0.0
-    df['cash'] = float(initial_capital)
-    df['total'] = float(initial_capital)
-
-    for i in range(1, len(df)):
-        if df['positions'].iloc[i] == 1:  # 매수 신호
-            investment = cash * investment_fraction
-            shares += investment / df['close'].iloc[i]
-            cash -= investment
-        elif df['positions'].iloc[i] == -1:  # 매도 신호
-            cash += shares * df['close'].iloc[i]
-            shares = 0
-        df.loc[df.index[i], 'holdings'] = shares * df['close'].iloc[i]
-        df.loc[df.index[i], 'cash'] = cash
-        df.loc[df.index[i], 'total'] = df.loc[df.index[i], 'holdings'] + df.loc[df.index[i], 'cash']
-
-    df['returns'] = df['total'].pct_change()
-
-    return df
+class VolatilityStrategy(Strategy):
+    """ 변동성 돌파 전략 (calculate_range + generate_signals와 같은 신호) """
+
+    name = "volatility"
+    columns = ["open", "high", "low", "close", "volume"]
+
+    def __init__(self, k=0.5, check_ma=False, check_volume=False, ma_window=5, vol_window=5, investment_fraction=1):
+        self.k = k
+        self.check_ma = check_ma
+        self.check_volume = check_volume
+        self.ma_window = ma_window
+        self.vol_window = vol_window
+        self.investment_fraction = investment_fraction
+
+    @property
+    def results_name(self):
+        return "volatility" + ("_checkMA" if self.check_ma else "") + ("_checkVolume" if self.check_volume else "")
+
+    @property
+    def indicators(self):
+        specs = [("range",)]
+        if self.check_ma:
+            specs.append(("sma", "close", self.ma_window))
+        if self.check_volume:
+            specs.append(("sma", "volume", self.vol_window))
+        return specs
+
+    @property
+    def save_options(self):
+        return {"check_ma": self.check_ma, "check_volume": self.check_volume}
+
+    def should_save(self, count):
+        return count == 200
+
+    def signals(self, arrays, indicators):
+        close = arrays["close"]
+        target = arrays["open"] + indicators[("range",)] * self.k
+        if self.check_ma:
+            signal = np.where((close >= target) & (close > indicators[("sma", "close", self.ma_window)]), 1, 0)
+        else:
+            signal = np.where(close >= target, 1, 0)
+
+        if self.check_volume:
+            previous_volume = np.full(len(close), np.nan)
+            previous_volume[1:] = arrays["volume"][:-1]
+            signal = np.where((signal == 1) & (previous_volume > indicators[("sma", "volume", self.vol_window)]), signal, 0)
+        return signal
+
+    def result_columns(self, arrays, indicators):
+        value_range = indicators[("range",)]
+        columns = {"range": value_range}
+        if self.check_ma:
+            columns[f"mavg_{self.ma_window}_close"] = indicators[("sma", "close", self.ma_window)]
+        columns["target"] = arrays["open"] + value_range * self.k
+        if self.check_volume:
+            columns[f"mavg_{self.vol_window}_volume"] = indicators[("sma", "volume", self.vol_window)]
+        return columns
 
 
 def run_backtest(market, count, initial_capital, k=0.5, investment_fraction=0.2, check_ma=False, check_volume=False, ma_window=5, vol_window=5):
@@ -124,9 +161,9 @@ def run_volatility_backtest(markets, count=200, initial_capital=10000, check_ma=
         print(f"Volatility backtest for {market}...")
         result = run_backtest(market, count, initial_capital, k=0.5, investment_fraction=1, check_ma=check_ma, check_volume=check_volume)
         results.append(result)
-        time.sleep(2)  # 각 API 호출 사이에 2초 지연
 
-    result_df = save_backtest_results(results, count, "volatility" + ("_checkMA" if check_ma else "") + ("_checkVolume" if check_volume else ""))
+    params = run_params({"k": 0.5, "check_ma": check_ma, "check_volume": check_volume, "investment_fraction": 1}, initial_capital)
+    result_df = save_backtest_results(results, count, "volatility" + ("_checkMA" if check_ma else "") + ("_checkVolume" if check_volume else ""), params)
 
     print(result_df)
 
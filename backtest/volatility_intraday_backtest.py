@@ -0,0 +1,192 @@
+"""
+backtest/volatility_intraday_backtest.py
+
+60분봉으로 체결 시점을 찾는 변동성 돌파 백테스트.
+
+일봉 백테스트(volatility_backtest)는 종가가 목표가 이상이면 종가에 산 것으로 계산하지만,
+실제 전략(strategies/volatility_strategy.py)은 장중 가격이 목표가(시가 + 전일 range × k)를
+넘는 순간 매수합니다. 이 모드는
+- 하루(09:00 시작)를 24개의 60분봉으로 나눈 (일 × 24) 고가/시가 행렬을 만들고
+- 고가가 목표가 이상인 첫 봉을 모든 시장/일에 대해 한 번의 배열 연산으로 찾아
+- 목표가(그 봉의 시가가 이미 더 높으면 시가)에 사고 다음 날 시가에 팝니다 (마지막 날은 종가로 평가).
+
+60분봉이 24개 모두 있는 날만 거래하며, 이동평균/거래량 조건은 미래 데이터를 쓰지 않도록 전일 값으로 판단합니다.
+
+실행: python3 -m backtest.volatility_intraday_backtest [일봉 개수]
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from utils import save_market_backtest_result, save_backtest_results
+from utils.backtest_metrics import cumulative_return_array, mdd_array
+from utils.data_utils import get_recent_candles, get_minute_candles_from_file
+from utils.indicator_cache import compute_indicator
+from utils.results_db import run_params
+
+HOURS_PER_DAY = 24
+HOUR_NS = 3600 * 10**9
+
+
+def build_hour_matrix(day_dates, hour_dates, values):
+    """
+    60분봉 값을 (일 × 24) 행렬로 배치하는 함수.
+
+    :param day_dates: 일봉 시작 시각 (int64 ns, 오름차순)
+    :param hour_dates: 60분봉 시작 시각 (int64 ns, 오름차순)
+    :param values: {컬럼: 60분봉 값 배열}
+    :return: {컬럼: (일 × 24) 행렬} (없는 칸은 NaN)
+    """
+    day_dates = np.asarray(day_dates, dtype=np.int64)
+    hour_dates = np.asarray(hour_dates, dtype=np.int64)
+    day_index = np.searchsorted(day_dates, hour_dates, side="right") - 1
+    offset = hour_dates - day_dates[np.clip(day_index, 0, None)] if len(day_dates) else hour_dates
+    hour = offset // HOUR_NS
+    valid = (day_index >= 0) & (hour < HOURS_PER_DAY) & (offset % HOUR_NS == 0)
+
+    matrices = {}
+    for column, column_values in values.items():
+        matrix = np.full((len(day_dates), HOURS_PER_DAY), np.nan)
+        matrix[day_index[valid], hour[valid]] = np.asarray(column_values, dtype=np.float64)[valid]
+        matrices[column] = matrix
+    return matrices
+
+
+def find_first_hits(high, open_, target):
+    """
+    고가가 목표가 이상인 첫 60분봉과 체결 가격을 찾는 함수 (모든 행을 한 번에 처리).
+
+    :param high: (행 × 24) 고가 행렬
+    :param open_: (행 × 24) 시가 행렬
+    :param target: 행별 목표가 (NaN이면 거래하지 않음)
+    :return: (첫 돌파 시각 인덱스 (없으면 -1), 체결 가격 (없으면 NaN))
+    """
+    hit = high >= np.asarray(target, dtype=np.float64)[:, None]
+    hit_any = hit.any(axis=1)
+    hour = np.where(hit_any, hit.argmax(axis=1), -1)
+
+    rows = np.flatnonzero(hit_any)
+    entry = np.full(len(target), np.nan)
+    entry[rows] = np.fmax(target[rows], open_[rows, hour[rows]])
+    return hour, entry
+
+
+def prepare_market(market, count, k=0.5, check_ma=False, check_volume=False, ma_window=5, vol_window=5):
+    """
+    시장 하나의 일봉, 목표가, (일 × 24) 60분봉 행렬을 준비하는 함수.
+
+    :return: (일봉 데이터프레임 (range, target 컬럼 포함), {'open', 'high': (일 × 24) 행렬})
+    """
+    df = get_recent_candles(market, count).sort_index().copy()
+    arrays = {column: df[column].to_numpy() for column in ["high", "low", "close", "volume"]}
+    df['range'] = compute_indicator(arrays, "range")
+    df['target'] = df['open'] + df['range'] * k
+
+    allowed = np.ones(len(df), dtype=bool)
+    if check_ma:
+        ma = compute_indicator(arrays, "sma", "close", ma_window)
+        allowed[1:] &= arrays['close'][:-1] > ma[:-1]
+        allowed[0] = False
+    if check_volume:
+        volume_ma = compute_indicator(arrays, "sma", "volume", vol_window)
+        allowed[1:] &= arrays['volume'][:-1] > volume_ma[:-1]
+        allowed[0] = False
+
+    if len(df):
+        hours = get_minute_candles_from_file(market, None, df.index[0], columns=['open', 'high'])
+    else:
+        hours = pd.DataFrame(columns=['open', 'high'], index=pd.DatetimeIndex([], name='date'))
+    matrices = build_hour_matrix(
+        df.index.values.view('int64'), hours.index.values.view('int64'),
+        {'open': hours['open'].to_numpy(), 'high': hours['high'].to_numpy()},
+    )
+
+    # 60분봉이 모두 있는 날만 거래한다 (형성 중인 오늘 포함 제외)
+    complete = ~np.isnan(matrices['high']).any(axis=1)
+    df['target'] = df['target'].where(allowed & complete)
+    return df, matrices
+
+
+def simulate_intraday(df, hour, entry, initial_capital, investment_fraction=1, costs=None):
+    """
+    체결 결과로 일별 거래 수익률과 평가금액을 계산하는 함수 (다음 날 시가 청산, 마지막 날은 종가).
+
+    :param costs: utils.backtest_engine.CostModel (수수료와 고정 슬리피지만 반영)
+    :return: 결과 컬럼이 추가된 데이터프레임
+    """
+    df = df.copy()
+    exit_price = np.append(df['open'].to_numpy()[1:], df['close'].to_numpy()[-1:])
+    rate = costs.rate(0, 0) if costs is not None else 0
+    trade_return = np.where(np.isnan(entry), 0.0, exit_price * (1 - rate) / (entry * (1 + rate)) - 1)
+
+    df['entry_hour'] = hour
+    df['entry_price'] = entry
+    df['exit_price'] = np.where(np.isnan(entry), np.nan, exit_price)
+    df['trade_return'] = np.where(np.isnan(entry), np.nan, trade_return)
+    df['total'] = initial_capital * np.cumprod(1 + investment_fraction * trade_return)
+    df['returns'] = df['total'].pct_change()
+    return df
+
+
+def run_intraday_volatility_backtest(markets, count=200, initial_capital=10000, k=0.5, check_ma=False,
+                                     check_volume=False, investment_fraction=1, ma_window=5, vol_window=5, save=True,
+                                     costs=None):
+    """
+    여러 시장의 장중 변동성 돌파 백테스트를 실행하는 함수.
+
+    첫 돌파 탐색은 모든 시장의 (일 × 24) 행렬을 이어 붙여 한 번에 수행합니다.
+
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
+    :return: 시장별 결과 데이터프레임 (save=True이면 저장 후 다시 읽은 결과)
+    """
+    prepared = [prepare_market(market, count, k, check_ma, check_volume, ma_window, vol_window) for market in markets]
+    if not prepared:
+        return pd.DataFrame()
+
+    high = np.vstack([matrices['high'] for _, matrices in prepared])
+    open_ = np.vstack([matrices['open'] for _, matrices in prepared])
+    target = np.concatenate([df['target'].to_numpy(dtype=np.float64) for df, _ in prepared])
+    hours, entries = find_first_hits(high, open_, target)
+
+    name = "volatility_intraday" + ("_checkMA" if check_ma else "") + ("_checkVolume" if check_volume else "")
+    results = []
+    offset = 0
+    for market, (df, _) in zip(markets, prepared):
+        rows = slice(offset, offset + len(df))
+        offset += len(df)
+        df = simulate_intraday(df, hours[rows], entries[rows], initial_capital, investment_fraction, costs)
+
+        if save and count == 200:
+            save_market_backtest_result(market, df, count, "volatility_intraday", check_ma=check_ma, check_volume=check_volume)
+
+        trades = df['trade_return'].dropna()
+        total = np.concatenate(([initial_capital], df['total'].to_numpy()))
+        results.append({
+            "Market": market,
+            "Count": count,
+            "Investment Fraction": investment_fraction,
+            "Cumulative Return (%)": cumulative_return_array(total, initial_capital),
+            "Win Rate (%)": (trades > 0).mean() * 100 if len(trades) else 0,
+            "Max Drawdown (%)": mdd_array(total),
+            "Trades": len(trades),
+        })
+
+    if save:
+        params = run_params({
+            "k": k, "check_ma": check_ma, "check_volume": check_volume, "investment_fraction": investment_fraction,
+            "ma_window": ma_window, "vol_window": vol_window,
+        }, initial_capital, costs)
+        return save_backtest_results(results, count, name, params)
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from coins import coin_list
+    from utils.backtest_engine import UPBIT_COSTS
+
+    intraday_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for ma, volume in [(False, False), (True, False), (True, True)]:
+        print(run_intraday_volatility_backtest(coin_list, intraday_count, check_ma=ma, check_volume=volume, costs=UPBIT_COSTS))
@@ -0,0 +1,235 @@
+"""
+backtest/walk_forward.py
+
+일봉 전략의 워크 포워드(walk-forward) 최적화.
+
+전체 일봉 이력을 (학습 구간, 검증 구간) 폴드로 굴려 가며 나누고,
+폴드마다 학습 구간에서 누적 수익률이 가장 높은 파라미터를 고른 뒤
+바로 다음 검증 구간에서만 거래한 결과를 이어 붙여 표본 외(out-of-sample) 성과를 계산합니다.
+
+- 폴드 작업 (시장, 전략, 폴드)은 서로 독립적이므로 프로세스 풀에서 병렬로 실행합니다.
+  캔들은 utils.shared_candles로 워커에 복사 없이 공유합니다.
+- 검증 구간의 지표는 학습 구간부터 이어서 계산하므로 이동 평균 등이 검증 시작 전 데이터를 그대로 씁니다.
+- 검증 구간은 현금으로 시작하고, 끝에 남은 보유분은 마지막 종가로 평가해 다음 폴드로 넘깁니다.
+
+실행: python3 -m backtest.walk_forward [학습 일봉 수] [검증 일봉 수] [워커 수]
+"""
+
+import os
+import sys
+import json
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from backtest.strategy import compute_indicators, signal_to_positions
+from backtest.sweep import STRATEGY_CLASSES, DEFAULT_GRIDS, expand_grid
+from utils.backtest_engine import simulate_positions
+from utils.backtest_metrics import cumulative_return_array, mdd_array
+from utils.candle_store import DAYS, PRICE_COLUMNS
+from utils.data_utils import get_candle_count, get_candle_rows
+from utils.indicator_cache import make_cache_key
+from utils.shared_candles import init_worker, publish_candles
+
+TRAIN_SIZE = 200
+TEST_SIZE = 50
+
+OUTPUT_DIR = "results/walk_forward"
+
+RESULT_COLUMNS = ["Strategy", "Market", "Folds", "Start", "End",
+                  "In-Sample Return (%)", "Out-of-Sample Return (%)", "Out-of-Sample MDD (%)", "Last Params"]
+
+
+def make_folds(rows, train_size=TRAIN_SIZE, test_size=TEST_SIZE):
+    """
+    학습/검증 폴드 구간을 만드는 함수 (검증 구간이 겹치지 않도록 test_size씩 이동).
+
+    :param rows: 전체 일봉 행 수
+    :param train_size: 학습 구간 행 수
+    :param test_size: 검증 구간 행 수
+    :return: (학습 시작, 검증 시작, 검증 끝) 행 번호 목록
+    """
+    folds = []
+    start = 0
+    while start + train_size + test_size <= rows:
+        folds.append((start, start + train_size, start + train_size + test_size))
+        start += test_size
+    return folds
+
+
+def get_default_candidates(grids=None):
+    """ {전략 이름: [(전략 이름, 파라미터), ...]} 후보 목록 (기본값은 스윕 그리드) """
+    grids = grids or DEFAULT_GRIDS
+    return {name: [(name, params) for params in expand_grid(name, grid)] for name, grid in grids.items()}
+
+
+def _simulate(strategy, arrays, indicators, initial_capital, costs=None):
+    signal = strategy.signals(arrays, indicators)
+    return simulate_positions(arrays["close"], signal_to_positions(signal), initial_capital, strategy.investment_fraction,
+                              costs=costs, volume=arrays["volume"])[2]
+
+
+def run_fold(market, name, specs, fold, initial_capital=10000, costs=None):
+    """
+    워커에서 실행되는 폴드 작업: 학습 구간에서 파라미터를 고르고 검증 구간에서 거래합니다.
+
+    :param market: 시장 코드
+    :param name: 결과에 표시할 전략 이름
+    :param specs: 후보 [(STRATEGY_CLASSES 키, 파라미터), ...]
+    :param fold: (학습 시작, 검증 시작, 검증 끝) 행 번호
+    :param initial_capital: 폴드 시작 자본
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
+    :return: 폴드 결과 딕셔너리 (검증 구간 date, 평가금액 배열 포함, 마지막 값은 청산 기준)
+    """
+    train_start, test_start, test_end = fold
+    train_rows = test_start - train_start
+    candles = get_candle_rows(market, DAYS, train_start, test_end, PRICE_COLUMNS)
+    arrays = {column: candles[column].to_numpy() for column in PRICE_COLUMNS}
+
+    # 학습 구간: 모든 후보를 평가해 누적 수익률이 가장 높은 파라미터를 고른다
+    train_candles = candles.iloc[:train_rows]
+    train_arrays = {column: values[:train_rows] for column, values in arrays.items()}
+    strategies = [STRATEGY_CLASSES[key](**params) for key, params in specs]
+    indicators = compute_indicators(
+        train_arrays, [spec for strategy in strategies for spec in strategy.indicators],
+        make_cache_key(market, DAYS, train_candles),
+    )
+    train_returns = [cumulative_return_array(_simulate(strategy, train_arrays, indicators, initial_capital, costs), initial_capital)
+                     for strategy in strategies]
+    best = int(np.argmax(train_returns))
+    strategy = strategies[best]
+
+    # 검증 구간: 학습 구간부터 이어서 지표를 계산하고, 학습 마지막 행을 미보유 기준 행으로 둔다
+    indicators = compute_indicators(arrays, strategy.indicators, make_cache_key(market, DAYS, candles))
+    signal = np.array(strategy.signals(arrays, indicators)[train_rows - 1:], dtype=np.float64)
+    signal[0] = 0
+    close = arrays["close"][train_rows - 1:]
+    volume = arrays["volume"][train_rows - 1:]
+    holdings, cash, total = simulate_positions(
+        close, signal_to_positions(signal), initial_capital, strategy.investment_fraction,
+        costs=costs, volume=volume
+    )
+
+    # 다음 폴드는 현금으로 시작하므로 마지막 검증 행에 남은 보유 수량은 매도 비용을 빼고 평가한다
+    if costs is not None and len(total) and holdings[-1] > 0:
+        shares = holdings[-1] / close[-1]
+        total[-1] = cash[-1] + shares * costs.sell_price(close[-1], shares, volume[-1])
+
+    return {
+        "Strategy": name,
+        "Market": market,
+        "Fold": fold,
+        "Params": specs[best][1],
+        "In-Sample Return (%)": train_returns[best],
+        "dates": candles.index[train_rows:].to_numpy(),
+        "equity": total[1:] / initial_capital,
+    }
+
+
+def stitch_folds(fold_results, initial_capital=10000):
+    """
+    검증 구간 결과를 폴드 순서대로 이어 붙여 표본 외 평가금액 시리즈를 만드는 함수.
+
+    :param fold_results: 한 (전략, 시장)의 run_fold 결과 목록
+    :param initial_capital: 초기 자본
+    :return: date 인덱스의 평가금액 Series
+    """
+    capital = initial_capital
+    dates, values = [], []
+    for result in sorted(fold_results, key=lambda r: r["Fold"]):
+        equity = capital * result["equity"]
+        dates.append(result["dates"])
+        values.append(equity)
+        capital = equity[-1]
+    if not values:
+        return pd.Series(dtype=np.float64, index=pd.DatetimeIndex([], name="date"), name="total")
+    return pd.Series(np.concatenate(values), index=pd.DatetimeIndex(np.concatenate(dates), name="date"), name="total")
+
+
+def summarize_folds(name, market, fold_results, initial_capital=10000):
+    """ 한 (전략, 시장)의 폴드 결과를 요약 행과 표본 외 평가금액으로 만듭니다 """
+    equity = stitch_folds(fold_results, initial_capital)
+    last = max(fold_results, key=lambda r: r["Fold"])
+    row = {
+        "Strategy": name,
+        "Market": market,
+        "Folds": len(fold_results),
+        "Start": equity.index[0].strftime("%Y-%m-%d"),
+        "End": equity.index[-1].strftime("%Y-%m-%d"),
+        "In-Sample Return (%)": float(np.mean([r["In-Sample Return (%)"] for r in fold_results])),
+        "Out-of-Sample Return (%)": cumulative_return_array(equity.to_numpy(), initial_capital),
+        "Out-of-Sample MDD (%)": mdd_array(equity.to_numpy()),
+        "Last Params": json.dumps(last["Params"]),
+    }
+    return row, equity
+
+
+def run_walk_forward(markets, candidates=None, train_size=TRAIN_SIZE, test_size=TEST_SIZE,
+                     initial_capital=10000, max_workers=None, save=True, costs=None):
+    """
+    워크 포워드 최적화를 병렬로 실행하는 함수.
+
+    :param markets: 시장 코드 목록
+    :param candidates: {전략 이름: [(STRATEGY_CLASSES 키, 파라미터), ...]} (None이면 get_default_candidates())
+    :param train_size: 학습 구간 일봉 수
+    :param test_size: 검증 구간 일봉 수
+    :param initial_capital: 초기 자본
+    :param max_workers: 워커 프로세스 수 (None이면 CPU 수)
+    :param save: results/walk_forward 아래 요약과 표본 외 평가금액 저장 여부
+    :param costs: utils.backtest_engine.CostModel (None이면 비용 없음)
+    :return: (요약 데이터프레임, {(전략 이름, 시장): 평가금액 Series})
+    """
+    candidates = candidates or get_default_candidates()
+
+    with publish_candles(markets, [DAYS]) as shared:
+        folds = {market: make_folds(get_candle_count(market, DAYS), train_size, test_size) for market in markets}
+        jobs = [(market, name, specs, fold)
+                for market in markets for name, specs in candidates.items() for fold in folds[market]]
+        print(f"Walk-forward: {len(jobs)} fold jobs...")
+
+        with ProcessPoolExecutor(max_workers, initializer=init_worker, initargs=(shared.catalog,)) as executor:
+            futures = [executor.submit(run_fold, *job, initial_capital, costs) for job in jobs]
+            fold_results = [future.result() for future in futures]
+
+    grouped = {}
+    for result in fold_results:
+        grouped.setdefault((result["Strategy"], result["Market"]), []).append(result)
+
+    rows, equities = [], {}
+    for (name, market), results in grouped.items():
+        row, equity = summarize_folds(name, market, results, initial_capital)
+        rows.append(row)
+        equities[(name, market)] = equity
+
+    summary = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    if save:
+        save_walk_forward(summary, equities, train_size, test_size)
+    return summary, equities
+
+
+def save_walk_forward(summary, equities, train_size, test_size):
+    """ 요약 CSV와 (전략, 시장)별 표본 외 평가금액 CSV를 저장합니다 """
+    equity_dir = os.path.join(OUTPUT_DIR, f"equity_{train_size}_{test_size}")
+    os.makedirs(equity_dir, exist_ok=True)
+
+    summary_file = os.path.join(OUTPUT_DIR, f"walk_forward_{train_size}_{test_size}.csv")
+    summary.to_csv(summary_file, index=False)
+    for (name, market), equity in equities.items():
+        equity.to_csv(os.path.join(equity_dir, f"{name}_{market}.csv"))
+    print(f"Walk-forward results saved to '{summary_file}'.")
+    return summary_file
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from coins import coin_list
+    from utils.backtest_engine import UPBIT_COSTS
+
+    train = int(sys.argv[1]) if len(sys.argv) > 1 else TRAIN_SIZE
+    test = int(sys.argv[2]) if len(sys.argv) > 2 else TEST_SIZE
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    start_time = datetime.now()
+    result, _ = run_walk_forward(coin_list, train_size=train, test_size=test, max_workers=workers, costs=UPBIT_COSTS)
+    print(result.sort_values(["Strategy", "Out-of-Sample Return (%)"], ascending=[True, False]))
+    print(f"Elapsed: {datetime.now() - start_time}")
@@ -0,0 +1,242 @@
+"""
+fetchers/backfill.py
+
+업비트 캔들 API의 `to` 커서로 과거 방향으로 페이지를 넘기며
+최대 페이지 크기(200개)로 캔들을 가져오는 엔진.
+
+- fetch_candles_until: 지정한 시각까지 과거로 내려가며 가져와 하나의 데이터프레임으로 반환
+- backfill_market: 시장/타임프레임별 체크포인트를 남기며 수년치 이력을 채움
+  (중단 후 다시 실행하면 체크포인트의 커서부터 이어서 가져옵니다)
+- repair_gaps: 커버리지 인덱스(utils.candle_coverage)의 빠진 구간만 다시 요청
+
+실행: python3 -m fetchers.backfill [일수] [시장1,시장2,...]
+"""
+
+import os
+import sys
+import json
+import datetime
+import asyncio
+import pandas as pd
+import pytz
+
+import numpy as np
+from api.upbit_api import CANDLE_COLUMNS, candles_to_frame, get_daily_candle_arrays, get_minute_candle_arrays
+from api.rate_limiter import call_with_rate_limit
+from utils.candle_store import DAYS, append_candles, has_candles, migrate_csv, read_columns
+from utils.candle_coverage import get_timeframe_step, mark_empty, update_coverage
+
+# 업비트 캔들 API가 한 번에 돌려주는 최대 개수
+PAGE_SIZE = 200
+
+# 이 페이지 수마다 저장소에 기록하고 체크포인트를 남긴다
+FLUSH_PAGES = 25
+
+CHECKPOINT_DIR = "data/backfill"
+
+KST = pytz.timezone('Asia/Seoul')
+
+
+def fetch_candle_page(market, timeframe, to=None, count=PAGE_SIZE):
+    """
+    커서(to) 이전의 캔들 한 페이지를 가져오는 함수.
+
+    :param market: 시장 코드
+    :param timeframe: 'days' 또는 'minutes_{unit}'
+    :param to: 이 시각 이전의 캔들을 가져옴 (tz-aware datetime, None이면 최신)
+    :param count: 가져올 개수 (최대 200)
+    :return: 오래된 순의 numpy 컬럼 딕셔너리 (api.upbit_api.decode_candles 형식)
+    """
+    to_param = None if to is None else to.isoformat()
+    if timeframe == DAYS:
+        return get_daily_candle_arrays(market, count, to_param)
+    unit = int(timeframe.split("_")[1])
+    return get_minute_candle_arrays(market, unit, count, to_param)
+
+
+def pages_to_frame(pages):
+    """
+    여러 페이지의 컬럼을 한 번에 이어 붙여 데이터프레임으로 만드는 함수.
+
+    페이지 경계에서 겹친 캔들은 하나만 남기고 오래된 순으로 정렬합니다.
+    """
+    if not pages:
+        empty = {name: np.empty(0, dtype=np.float64) for name in CANDLE_COLUMNS}
+        return candles_to_frame({"date": np.empty(0, dtype=np.int64), **empty})
+    columns = {name: np.concatenate([page[name] for page in pages]) for name in pages[0]}
+    _, order = np.unique(columns["date"], return_index=True)
+    return candles_to_frame({name: values[order] for name, values in columns.items()})
+
+
+def _to_kst(date):
+    """ 저장소/응답의 tz-naive KST 시각을 tz-aware로 변환합니다 """
+    date = pd.Timestamp(date)
+    return date.tz_localize(KST) if date.tzinfo is None else date.tz_convert(KST)
+
+
+async def fetch_candles_until(market, timeframe, until, to=None, count=PAGE_SIZE):
+    """
+    to부터 until까지 과거 방향으로 페이지를 넘기며 캔들을 가져오는 함수.
+
+    :param market: 시장 코드
+    :param timeframe: 'days' 또는 'minutes_{unit}'
+    :param until: 이 시각 이하의 캔들을 받으면 중단 (tz-aware datetime)
+    :param to: 시작 커서 (None이면 최신 캔들부터)
+    :param count: 페이지 크기 (최대 200)
+    :return: 가져온 캔들 데이터프레임 (오래된 순)
+    """
+    pages = []
+    cursor = to
+    while True:
+        page = await call_with_rate_limit(fetch_candle_page, market, timeframe, cursor, count)
+        if len(page["date"]) == 0:
+            break
+        pages.append(page)
+        cursor = _to_kst(int(page["date"][0]))
+        if cursor <= until or len(page["date"]) < count:
+            break
+
+    # 페이지마다가 아니라 마지막에 한 번만 데이터프레임을 만든다
+    return pages_to_frame(pages)
+
+
+def get_checkpoint_path(market, timeframe):
+    return os.path.join(CHECKPOINT_DIR, f"{timeframe}_{market}.json")
+
+
+def load_checkpoint(market, timeframe):
+    """ 저장된 체크포인트를 읽습니다 (없으면 빈 딕셔너리) """
+    path = get_checkpoint_path(market, timeframe)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(market, timeframe, checkpoint):
+    """ 체크포인트를 임시 파일에 쓴 뒤 교체합니다 """
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    path = get_checkpoint_path(market, timeframe)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def _oldest_stored_date(market, timeframe):
+    if not has_candles(market, timeframe):
+        return None
+    dates = read_columns(market, timeframe, columns=["date"], stop=1)["date"]
+    return _to_kst(int(dates[0])) if len(dates) else None
+
+
+async def backfill_market(market, timeframe, until, flush_pages=FLUSH_PAGES):
+    """
+    체크포인트를 남기며 until까지 과거 캔들을 채우는 함수.
+
+    커서는 체크포인트 → 저장소의 가장 오래된 캔들 → 최신 순으로 정합니다.
+    flush_pages 페이지마다 저장소에 기록한 뒤 커서를 저장하므로
+    중단되어도 마지막 기록 지점부터 다시 시작합니다.
+
+    :param market: 시장 코드
+    :param timeframe: 'days' 또는 'minutes_{unit}'
+    :param until: 채울 가장 과거 시각 (tz-aware datetime)
+    :param flush_pages: 저장/체크포인트 간격 (페이지 수)
+    :return: 요청한 페이지 수
+    """
+    checkpoint = load_checkpoint(market, timeframe)
+    if checkpoint.get("done") and _to_kst(checkpoint["until"]) <= until:
+        print(f"Backfill for {market} ({timeframe}) is already complete.")
+        return 0
+
+    if not has_candles(market, timeframe):
+        migrate_csv(market, timeframe)  # 기존 CSV가 있으면 저장소로 이전
+
+    if checkpoint.get("cursor"):
+        cursor = _to_kst(checkpoint["cursor"])
+    else:
+        cursor = _oldest_stored_date(market, timeframe)
+
+    print(f"Backfilling {market} ({timeframe}) from {cursor or 'latest'} to {until}...")
+
+    pages = []
+    page_requests = 0
+    done = False
+    while not done:
+        page = await call_with_rate_limit(fetch_candle_page, market, timeframe, cursor)
+        page_requests += 1
+        if len(page["date"]) == 0:
+            done = True
+        else:
+            pages.append(page)
+            cursor = _to_kst(int(page["date"][0]))
+            done = cursor <= until or len(page["date"]) < PAGE_SIZE
+
+        if done or len(pages) >= flush_pages:
+            # 저장소에 기록한 뒤에만 커서를 남겨야 재시작 시 빠지는 구간이 없다
+            if pages:
+                append_candles(market, timeframe, pages_to_frame(pages))
+                pages = []
+            save_checkpoint(market, timeframe, {
+                "cursor": None if cursor is None else cursor.isoformat(),
+                "until": until.isoformat(),
+                "done": done,
+            })
+
+    print(f"Backfill for {market} ({timeframe}) finished with {page_requests} requests.")
+    return page_requests
+
+
+async def repair_gaps(market, timeframe):
+    """
+    커버리지 인덱스에 기록된 빠진 구간만 다시 요청해 채우는 함수.
+
+    구간마다 빠진 캔들 수만큼만 요청하고, 다시 요청해도 비어 있으면
+    (체결이 없던 구간) empty로 기록하여 다음부터는 건너뜁니다.
+
+    :param market: 시장 코드
+    :param timeframe: 'days' 또는 'minutes_{unit}'
+    :return: 채운 캔들 수
+    """
+    coverage = update_coverage(market, timeframe)
+    if not coverage or not coverage["gaps"]:
+        return 0
+
+    step = get_timeframe_step(timeframe)
+    filled = 0
+    for gap in list(coverage["gaps"]):
+        start, end = (pd.Timestamp(value) for value in gap)
+        missing = int((gap[1] - gap[0]) // step + 1)
+        print(f"Repairing {market} ({timeframe}) gap {start} ~ {end} ({missing} candles)...")
+
+        # to는 배타적이므로 빠진 마지막 캔들 다음 시각부터 과거로 요청
+        df = await fetch_candles_until(
+            market, timeframe, _to_kst(start), to=_to_kst(end + pd.Timedelta(step)), count=min(PAGE_SIZE, missing)
+        )
+        if not df.empty:
+            df = df[(df.index >= start) & (df.index <= end)]
+
+        if df.empty:
+            mark_empty(market, timeframe, gap)
+        else:
+            append_candles(market, timeframe, df)
+            filled += len(df)
+
+    update_coverage(market, timeframe)
+    return filled
+
+
+async def backfill(markets, timeframes=(DAYS, "minutes_60"), days=365 * 3):
+    """ 여러 시장/타임프레임의 과거 이력을 동시에 채웁니다 """
+    until = datetime.datetime.now(KST) - datetime.timedelta(days=days)
+    tasks = [backfill_market(market, timeframe, until) for market in markets for timeframe in timeframes]
+    return await asyncio.gather(*tasks)
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from coins import coin_list
+
+    backfill_days = int(sys.argv[1]) if len(sys.argv) > 1 else 365 * 3
+    backfill_markets = sys.argv[2].split(",") if len(sys.argv) > 2 else coin_list
+    asyncio.run(backfill(backfill_markets, days=backfill_days))
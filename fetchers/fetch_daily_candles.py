@@ -2,61 +2,53 @@
 fetchers/fetch_daily_candles.py
 """
 
-import os
-import pandas as pd
 import datetime
 import pytz
 import asyncio
-from requests.exceptions import HTTPError
 
-from api.upbit_api import get_daily_candles
+from utils.candle_store import DAYS, get_store_path, has_candles, migrate_csv, read_last_date, append_candles
+from .backfill import fetch_candles_until, repair_gaps
+
+
+async def fetch_and_save_market_daily_candles(market, count):
+    """ 한 시장의 일봉 데이터를 가져와 저장합니다 """
+    save_path = get_store_path(market, DAYS)
+    print(f"\nFetching daily candles for {market}...")
+
+    now = datetime.datetime.now(pytz.timezone('Asia/Seoul'))
+    end = now.replace(hour=9, minute=0, second=0, microsecond=0)
+    start = end - datetime.timedelta(days=count)
+
+    if not has_candles(market, DAYS):
+        migrate_csv(market, DAYS)  # 기존 CSV가 있으면 저장소로 이전
+
+    last_date = read_last_date(market, DAYS)  # 마지막 날짜만 읽는다
+    if last_date is not None:
+        if last_date.tzinfo is None:
+            last_date = last_date.tz_localize('Asia/Seoul')
+        else:
+            last_date = last_date.tz_convert('Asia/Seoul')
+
+        start = last_date  # 마지막 날짜부터 다시 시작
+
+    # 최신 캔들부터 200개씩 과거로 내려가며 start까지 가져온다
+    new_df = await fetch_candles_until(market, DAYS, start)
+    new_df = new_df[new_df.index >= start.replace(tzinfo=None)] if not new_df.empty else new_df
+    print(new_df)
+
+    if not new_df.empty:
+        # 겹치는 꼬리 구간만 병합하고 새 캔들만 덧붙인다
+        append_candles(market, DAYS, new_df)
+        print(f"Data for {market} saved to {save_path}")
+
+    # 커버리지 인덱스의 빠진 구간만 다시 요청한다
+    await repair_gaps(market, DAYS)
+
 
 async def fetch_and_save_daily_candles(markets, count):
-    """ 여러 시장의 과거 일봉 데이터를 가져와 저장합니다 """
-    save_dir = "data/daily_candles"
-    os.makedirs(save_dir, exist_ok=True)
-
-    for market in markets:
-        save_path = os.path.join(save_dir, f"daily_candles_{market}.csv")
-        print(f"\nFetching daily candles for {market}...")
-
-        now = datetime.datetime.now(pytz.timezone('Asia/Seoul'))
-        end = now.replace(hour=9, minute=0, second=0, microsecond=0)
-        start = end - datetime.timedelta(days=count)
-
-        df_list = []
-        if os.path.exists(save_path):
-            existing_data = pd.read_csv(save_path, index_col=0, parse_dates=True)
-            last_date = existing_data.index[-1]
-
-            if last_date.tzinfo is None:
-                last_date = last_date.tz_localize('Asia/Seoul')
-            else:
-                last_date = last_date.tz_convert('Asia/Seoul')
-
-            start = last_date  # 마지막 날짜부터 다시 시작
-            df_list.append(existing_data)
-
-        while start <= end:
-            try:
-                df = get_daily_candles(market, min(count, (end - start).days + 1))
-                df = df.sort_index()  # 인덱스를 기준으로 오래된 시간 순으로 정렬
-                print(df)
-                df_list.append(df)
-                start += datetime.timedelta(days=len(df))
-                await asyncio.sleep(1)  # 요청 간 지연 시간 추가
-            except HTTPError as http_err:
-                if http_err.response.status_code == 429:
-                    print(f"HTTPError: {http_err}. Too many requests, sleeping for 10 seconds.")
-                    await asyncio.sleep(10)
-                else:
-                    raise
-
-        if df_list:
-            full_df = pd.concat(df_list)
-            full_df = full_df[~full_df.index.duplicated(keep='last')]
-            full_df.to_csv(save_path)
-            print(f"Data for {market} saved to {save_path}")
+    """ 여러 시장의 과거 일봉 데이터를 동시에 가져와 저장합니다 """
+    tasks = [fetch_and_save_market_daily_candles(market, count) for market in markets]
+    await asyncio.gather(*tasks)
 
 if __name__ == "__main__":
     asyncio.run(fetch_and_save_daily_candles())
@@ -11,16 +11,20 @@ sys.path.append(os.path.dirname(current_dir))
 from coins import coin_list
 from .fetch_daily_candles import fetch_and_save_daily_candles
 from .fetch_minute_candles import fetch_and_save_minutes_candles
+from utils.resample import resample_all
 
 async def fetchers():
     COUNT = 200
     # coin_list = ["KRW-SOL"]
 
-    # Fetch and save daily candles
-    await fetch_and_save_daily_candles(coin_list, COUNT)
+    # 일봉과 분봉을 동시에 가져온다 (요청 속도는 공유 제한기가 조절)
+    await asyncio.gather(
+        fetch_and_save_daily_candles(coin_list, COUNT),
+        fetch_and_save_minutes_candles(coin_list, 60, COUNT),
+    )
 
-    # Fetch and save minute candles
-    await fetch_and_save_minutes_candles(coin_list, 60, COUNT)
+    # 4시간/12시간/주봉은 API 대신 저장된 60분봉으로 만든다
+    resample_all(coin_list)
 
 if __name__ == "__main__":
     asyncio.run(fetchers())
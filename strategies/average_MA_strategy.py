@@ -24,6 +24,10 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.dirname(current_dir))
 
 from utils.api_helpers import fetch_latest_data_with_retry
+from utils.streaming_indicators import SMA
+
+# 시장별 스트리밍 이동평균 상태 (같은 프로세스에서 다시 확인할 때는 최근 캔들 2개만 가져온다)
+_trackers = {}
 
 
 def calculate_moving_averages(df, windows):
@@ -47,18 +51,66 @@ def generate_signals(df):
     return df
 
 
+def init_tracker(df, windows):
+    """ 과거 캔들로 이동평균 상태를 만들고 마지막 두 행의 신호를 기록합니다 """
+    df = df.sort_index()
+    tracker = {"windows": windows, "smas": {}, "date": df.index[-1], "close": df['close'].iloc[-1]}
+    scores = 0
+    for period in windows:
+        sma = SMA(period, min_periods=1)
+        scores = scores + (df['close'].to_numpy() > sma.init(df)) * 0.2
+        tracker["smas"][period] = sma
+    signals = (scores > 0).astype(int)
+    tracker["previous_signal"] = int(signals[-2]) if len(signals) > 1 else None
+    return tracker
+
+
+def tracker_score(tracker):
+    """ 현재 마지막 캔들의 총 점수 """
+    return sum(0.2 for period, sma in tracker["smas"].items() if tracker["close"] > sma.value)
+
+
+def update_tracker(tracker, df):
+    """
+    최근 캔들로 이동평균 상태를 갱신하는 함수.
+
+    같은 날짜의 캔들은 형성 중이던 값을 교체하고, 새 날짜의 캔들은 덧붙입니다.
+
+    :return: 이어서 갱신할 수 있으면 True (빠진 캔들이 있으면 False)
+    """
+    df = df.sort_index()
+    if tracker["date"] not in df.index:
+        return False
+
+    for date, row in df[df.index >= tracker["date"]].iterrows():
+        replace = date == tracker["date"]
+        if not replace:
+            # 직전 캔들이 확정되었으므로 그 신호가 이전 신호가 된다
+            tracker["previous_signal"] = 1 if tracker_score(tracker) > 0 else 0
+        for sma in tracker["smas"].values():
+            sma.update(row, replace=replace)
+        tracker["date"] = date
+        tracker["close"] = row['close']
+    return True
+
+
 async def check_signals(market, windows, investment_amount):
-    df = await fetch_latest_data_with_retry(market, windows[-1] + 1)
-    df = calculate_moving_averages(df, windows)
-    df = calculate_score(df, windows)
-    print(df)
-    df = generate_signals(df)
-
-    latest_data = df.iloc[-1]
-    latest_positions = latest_data['positions']
-    latest_price = latest_data["close"]
-    latest_signal = latest_data['signal']
-    latest_score = latest_data['total_score']
+    tracker = _trackers.get(market)
+    if tracker is not None and tracker["windows"] == windows:
+        latest = await fetch_latest_data_with_retry(market, 2)
+        if not update_tracker(tracker, latest):
+            tracker = None
+
+    if tracker is None or tracker["windows"] != windows:
+        df = await fetch_latest_data_with_retry(market, windows[-1] + 1)
+        tracker = init_tracker(df, windows)
+        _trackers[market] = tracker
+
+    latest_score = tracker_score(tracker)
+    latest_signal = 1 if latest_score > 0 else 0
+    latest_positions = latest_signal - tracker["previous_signal"] if tracker["previous_signal"] is not None else np.nan
+    latest_price = tracker["close"]
+    print(f"{market} {tracker['date']}: close {latest_price}, score {latest_score}")
 
     investment = latest_score * investment_amount
 
@@ -0,0 +1,33 @@
+from api import http_client
+
+import sys
+import os
+import asyncio
+import pytest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def test_requests_share_session_and_apply_timeout(monkeypatch):
+    http_client.close()
+    calls = []
+
+    def fake_request(self, method, url, **kwargs):
+        calls.append((id(self), method, url, kwargs))
+        return "response"
+
+    monkeypatch.setattr("requests.Session.request", fake_request)
+
+    http_client.get("https://api.upbit.com/v1/market/all", params={"a": 1})
+    asyncio.run(http_client.async_post("https://api.upbit.com/v1/orders", timeout=5))
+
+    assert calls[0][0] == calls[1][0]  # 같은 세션(연결 풀) 사용
+    assert calls[0][3]["timeout"] == http_client.REQUEST_TIMEOUT
+    assert calls[1][1] == "POST" and calls[1][3]["timeout"] == 5
+
+    http_client.close()
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
@@ -0,0 +1,49 @@
+from api.rate_limiter import RateLimiter, call_with_rate_limit
+
+import sys
+import os
+import time
+import asyncio
+import pytest
+import requests
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def test_rate_limiter_waits_for_tokens():
+    limiter = RateLimiter([(5, 1), (600, 60)])
+
+    async def acquire_many(n):
+        for _ in range(n):
+            await limiter.acquire()
+
+    started = time.monotonic()
+    asyncio.run(acquire_many(5))
+    assert time.monotonic() - started < 0.1  # 버킷이 가득 차 있으므로 바로 통과
+
+    started = time.monotonic()
+    asyncio.run(acquire_many(2))
+    assert time.monotonic() - started >= 0.3  # 초당 5개씩 다시 채워질 때까지 대기
+
+
+def test_call_with_rate_limit_retries_on_429():
+    limiter = RateLimiter([(100, 1)])
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            response = requests.Response()
+            response.status_code = 429
+            raise requests.exceptions.HTTPError(response=response)
+        return "ok"
+
+    result = asyncio.run(call_with_rate_limit(flaky, limiter=limiter, backoff=0.01))
+
+    assert result == "ok"
+    assert len(calls) == 3
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
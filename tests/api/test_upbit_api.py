@@ -0,0 +1,61 @@
+from api import upbit_api
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+RESPONSE = [
+    {
+        'market': 'KRW-BTC',
+        'candle_date_time_utc': f'2024-01-0{day}T00:00:00',
+        'candle_date_time_kst': f'2024-01-0{day}T09:00:00',
+        'opening_price': 100.0 + day,
+        'high_price': 110.0 + day,
+        'low_price': 90.0 + day,
+        'trade_price': 105.0 + day,
+        'candle_acc_trade_volume': 1.5 * day,
+    }
+    for day in (3, 2, 1)  # 최신 캔들이 앞에 온다
+]
+
+
+def reference_frame(data):
+    """ 기존 데이터프레임 변환 경로 """
+    df = pd.DataFrame(data)
+    df['candle_date_time_kst'] = pd.to_datetime(df['candle_date_time_kst'])
+    df = df[['candle_date_time_kst', 'opening_price', 'high_price', 'low_price', 'trade_price', 'candle_acc_trade_volume']]
+    df.columns = ['date', 'open', 'high', 'low', 'close', 'volume']
+    return df.set_index('date')
+
+
+def test_decode_candles_matches_dataframe_path():
+    columns = upbit_api.decode_candles(RESPONSE)
+
+    assert columns['date'].dtype == np.int64
+    assert np.all(np.diff(columns['date']) > 0)  # 오래된 순
+    pd.testing.assert_frame_equal(upbit_api.candles_to_frame(columns), reference_frame(RESPONSE).sort_index())
+
+
+def test_get_daily_candles_keeps_response_order(monkeypatch):
+    monkeypatch.setattr(upbit_api, '_request_candles', lambda *args, **kwargs: RESPONSE)
+
+    df = upbit_api.get_daily_candles('KRW-BTC', 3)
+
+    pd.testing.assert_frame_equal(df, reference_frame(RESPONSE))
+
+
+def test_empty_response():
+    columns = upbit_api.decode_candles([])
+
+    assert len(columns['date']) == 0
+    assert upbit_api.candles_to_frame(columns).empty
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
@@ -0,0 +1,60 @@
+from backtest import backtester
+from backtest import daily_average_backtest, golden_dead_cross_backtest, volatility_backtest
+from utils import candle_store
+
+import sys
+import os
+import pytest
+import pandas as pd
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+@pytest.fixture
+def store(write_store):
+    write_store(['KRW-BTC'], rows=300, seed=0)
+
+
+def legacy_results(market, count, initial_capital):
+    """ 전략별 run_backtest를 하나씩 호출한 기존 결과 """
+    return [
+        daily_average_backtest.run_backtest(market, count, initial_capital, 5, 1),
+        daily_average_backtest.run_backtest(market, count, initial_capital, 120, 1),
+        golden_dead_cross_backtest.run_backtest(market, count, initial_capital, 5, 20, 1),
+        volatility_backtest.run_backtest(market, count, initial_capital, 0.5, 1),
+        volatility_backtest.run_backtest(market, count, initial_capital, 0.5, 1, check_ma=True),
+        volatility_backtest.run_backtest(market, count, initial_capital, 0.5, 1, check_ma=True, check_volume=True),
+    ]
+
+
+def test_single_pass_matches_strategy_modules(store):
+    expected = legacy_results('KRW-BTC', 200, 10000)
+    saved = {
+        path: pd.read_csv(os.path.join('results/backtest', path, name))
+        for path in os.listdir('results/backtest') for name in os.listdir(os.path.join('results/backtest', path))
+    }
+
+    results = backtester.run_market('KRW-BTC', 200, 10000, backtester.get_default_strategies())
+
+    assert results == expected
+    for path, df in saved.items():
+        name = os.listdir(os.path.join('results/backtest', path))[0]
+        rewritten = pd.read_csv(os.path.join('results/backtest', path, name))
+        pd.testing.assert_frame_equal(rewritten[df.columns], df)
+
+
+def test_array_metrics_match_dataframe_metrics(store):
+    from utils.backtest_metrics import calculate_mdd, calculate_win_rate
+    from utils.backtest_metrics import mdd_array, win_rate_array
+
+    df = daily_average_backtest.calculate_moving_average(candle_store.read_candles('KRW-BTC', 'days'), 5)
+    df = daily_average_backtest.generate_signals(df)
+    df = daily_average_backtest.backtest_strategy(df, 10000, 0.5)
+
+    assert win_rate_array(df['positions'].to_numpy(), df['total'].to_numpy()) == calculate_win_rate(df)
+    assert mdd_array(df['total'].to_numpy()) == calculate_mdd(df)
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
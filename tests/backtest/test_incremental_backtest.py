@@ -0,0 +1,102 @@
+from backtest import incremental_backtest
+from backtest.backtester import get_default_strategies, run_market
+from utils import candle_store
+from utils.backtest_engine import UPBIT_COSTS
+from utils.candle_cache import clear_candle_cache
+from utils.indicator_cache import clear_indicator_cache
+
+import sys
+import os
+import pytest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+MARKET = 'KRW-BTC'
+
+RESULT_COLUMNS = ['Cumulative Return (%)', 'Win Rate (%)', 'Max Drawdown (%)']
+
+
+@pytest.fixture
+def store(write_store):
+    return write_store([MARKET], rows=260, seed=7, stored_rows=240)[MARKET]
+
+
+def run_all(costs=None):
+    return [incremental_backtest.run_incremental(MARKET, strategy, 200, 10000, costs)
+            for strategy in get_default_strategies()]
+
+
+def full_rerun(count, costs=None):
+    # 시작일부터 지금까지를 한 번에 계산한 기존 러너 결과
+    clear_candle_cache()
+    clear_indicator_cache()
+    return run_market(MARKET, count, 10000, get_default_strategies(), save=False, costs=costs)
+
+
+@pytest.mark.parametrize('costs', [None, UPBIT_COSTS])
+def test_incremental_matches_full_rerun(store, costs):
+    first = run_all(costs)
+    assert {result['Mode'] for result in first} == {'full'}
+    assert first[0]['Count'] == 200
+
+    # 형성 중이던 마지막 캔들이 바뀌고 새 캔들이 붙는 매일의 갱신
+    last = 240
+    for stop in [245, 252, 260]:
+        candle_store.append_candles(MARKET, 'days', store.iloc[last - 1:stop])
+        last = stop
+        results = run_all(costs)
+        assert {result['Mode'] for result in results} == {'incremental'}
+
+        expected = full_rerun(stop - 40, costs)
+        for result, full in zip(results, expected):
+            assert result['Count'] == stop - 40
+            assert result['Start'] == '2023-02-10'
+            for column in RESULT_COLUMNS:
+                assert result[column] == full[column]
+
+        # 다음 갱신 전까지 마지막 캔들은 형성 중인 값으로 바뀌어 있다
+        if stop < 260:
+            forming = store.iloc[stop - 1:stop] * 0.9
+            candle_store.append_candles(MARKET, 'days', forming)
+
+
+def test_edited_history_falls_back_to_full_recompute(store):
+    run_all()
+    candle_store.append_candles(MARKET, 'days', store.iloc[239:250])
+    run_all()
+
+    # 과거 캔들 하나가 바뀐 이력으로 교체
+    edited = store.iloc[:250].copy()
+    edited.iloc[100, edited.columns.get_loc('close')] *= 1.5
+    candle_store.write_candles(MARKET, 'days', edited)
+
+    results = run_all()
+    assert {result['Mode'] for result in results} == {'full'}
+    for result, full in zip(results, full_rerun(210)):
+        for column in RESULT_COLUMNS:
+            assert result[column] == full[column]
+
+    # 다시 계산한 상태에서는 다음 실행부터 이어서 계산
+    candle_store.append_candles(MARKET, 'days', store.iloc[249:255])
+    assert {result['Mode'] for result in run_all()} == {'incremental'}
+
+
+def test_gap_repair_bumps_store_epoch(store):
+    candles = store.iloc[:240].drop(store.index[100])
+    candle_store.write_candles(MARKET, 'days', candles)
+    epoch = candle_store.read_epoch(MARKET, 'days')
+
+    # 마지막 캔들 교체와 덧붙이기는 이력 변경이 아니다
+    candle_store.append_candles(MARKET, 'days', store.iloc[239:245])
+    assert candle_store.read_epoch(MARKET, 'days') == epoch
+
+    # 빠진 캔들 채우기는 이력 변경
+    candle_store.append_candles(MARKET, 'days', store.iloc[100:101])
+    assert candle_store.read_epoch(MARKET, 'days') == epoch + 1
+    assert candle_store.read_meta(MARKET, 'days')['rows'] == 245
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
@@ -0,0 +1,56 @@
+from backtest import orchestrator
+from backtest.backtester import run_backtests
+
+import sys
+import os
+import pytest
+import pandas as pd
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+MARKETS = ['KRW-BTC', 'KRW-ETH', 'KRW-XRP']
+
+
+@pytest.fixture
+def store(write_store):
+    write_store(MARKETS, rows=250, seed=6)
+
+
+def test_merge_results_follows_job_order():
+    jobs = [('daily', 'KRW-BTC'), ('daily', 'KRW-ETH'), ('afternoon', 'KRW-BTC')]
+    # 완료 순서와 다르게 들어와도 작업 목록 순서로 모은다
+    job_results = {
+        ('afternoon', 'KRW-BTC'): [('afternoon', {'Market': 'KRW-BTC'})],
+        ('daily', 'KRW-ETH'): [('a', {'Market': 'KRW-ETH'}), ('b', {'Market': 'KRW-ETH'})],
+        ('daily', 'KRW-BTC'): [('a', {'Market': 'KRW-BTC'}), ('b', {'Market': 'KRW-BTC'})],
+    }
+    merged = orchestrator.merge_results(jobs, job_results)
+    assert list(merged) == ['a', 'b', 'afternoon']
+    assert [r['Market'] for r in merged['a']] == ['KRW-BTC', 'KRW-ETH']
+
+
+def test_run_job_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        orchestrator.run_job('weekly', 'KRW-BTC', 200, 10000, [])
+
+
+def test_run_all_backtests_rejects_unknown_storage(monkeypatch):
+    # 워커 풀을 만들기 전에 실패한다
+    monkeypatch.setattr(orchestrator, 'publish_candles', None)
+    with pytest.raises(ValueError):
+        orchestrator.run_all_backtests(MARKETS, storage='parquet')
+
+
+def test_parallel_results_match_serial_runner(store):
+    expected = run_backtests(MARKETS)
+    result = orchestrator.run_all_backtests(MARKETS, kinds=['daily'], max_workers=2)
+
+    assert list(result) == list(expected)
+    for name in expected:
+        pd.testing.assert_frame_equal(result[name], expected[name])
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
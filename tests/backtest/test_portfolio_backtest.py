@@ -0,0 +1,95 @@
+from backtest import portfolio_backtest
+from backtest.backtester import run_market
+from backtest.daily_average_backtest import DailyAverageStrategy
+from utils.backtest_engine import CostModel, UPBIT_COSTS
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+@pytest.fixture
+def store(write_store):
+    write_store({'KRW-BTC': 220, 'KRW-ETH': 150}, seed=4, end='2024-01-31 09:00')
+
+
+def test_allocation_weights():
+    signals = np.array([[1, 1, 0], [1, 0, 0], [0, 0, 0]])
+    close = np.ones((3, 3))
+    assert portfolio_backtest.allocation_weights(signals, close, "equal")[0].tolist() == pytest.approx([1 / 3, 1 / 3, 0])
+    active = portfolio_backtest.allocation_weights(signals, close, "active_equal")
+    assert active.tolist() == [[0.5, 0.5, 0], [1, 0, 0], [0, 0, 0]]
+
+    # 변동성이 두 배인 시장은 절반의 비중
+    close = np.column_stack([1 + 0.01 * (-1) ** np.arange(30), 1 + 0.02 * (-1) ** np.arange(30)])
+    weights = portfolio_backtest.allocation_weights(np.ones((30, 2)), close, "inverse_volatility")
+    assert weights[0].tolist() == [0.5, 0.5]
+    assert weights[-1] == pytest.approx([2 / 3, 1 / 3], rel=1e-2)
+
+    with pytest.raises(ValueError):
+        portfolio_backtest.allocation_weights(signals, close, "random")
+
+
+def test_simulate_portfolio_rebalances_shared_capital():
+    close = np.array([[10, 20], [10, 20], [20, 20], [20, 10]], dtype=float)
+    weights = np.array([[0, 0], [0.5, 0.5], [0.5, 0.5], [1, 0]])
+    holdings, cash, total, turnover = portfolio_backtest.simulate_portfolio(close, weights, 100)
+
+    assert total.tolist() == [100, 100, 150, 125]
+    assert holdings[2].tolist() == [100, 50]
+    assert holdings[3].tolist() == [125, 0]
+    assert cash.tolist() == [100, 0, 0, 0]
+    # 1번 행: 현금 100으로 매수, 3번 행: 125 중 ETH 25를 팔아 BTC 25를 삼
+    assert turnover.tolist() == [0, 1, 0, pytest.approx(50 / 125)]
+
+
+def test_single_market_matches_engine(store):
+    summary, df = portfolio_backtest.run_portfolio_backtest(['KRW-BTC'], DailyAverageStrategy(5), save=False)
+    expected = run_market('KRW-BTC', 200, 10000, [DailyAverageStrategy(5)], save=False)[0]
+    assert len(df) == 200
+    pd.testing.assert_series_equal(df['total'], df['KRW-BTC'] + df['cash'], check_names=False)
+    assert summary['Cumulative Return (%)'] == pytest.approx(expected['Cumulative Return (%)'], rel=1e-12)
+    assert summary['Max Drawdown (%)'] == pytest.approx(expected['Max Drawdown (%)'], rel=1e-12)
+
+    summary, _ = portfolio_backtest.run_portfolio_backtest(
+        ['KRW-BTC'], DailyAverageStrategy(5), save=False, costs=UPBIT_COSTS
+    )
+    expected = run_market('KRW-BTC', 200, 10000, [DailyAverageStrategy(5)], save=False, costs=UPBIT_COSTS)[0]
+    assert summary['Cumulative Return (%)'] == pytest.approx(expected['Cumulative Return (%)'], rel=1e-12)
+
+
+def test_costs_are_charged_on_rebalancing_trades():
+    close = np.array([[10, 20], [10, 20], [20, 20], [20, 10]], dtype=float)
+    weights = np.array([[0, 0], [0.5, 0.5], [0.5, 0.5], [1, 0]])
+    costs = CostModel(fee_bps=100)
+    holdings, cash, total, turnover = portfolio_backtest.simulate_portfolio(close, weights, 100, costs=costs)
+
+    # 1번 행: 100을 매수가 × 1.01로 나눠 산다
+    assert holdings[1].tolist() == pytest.approx([50 / 1.01, 50 / 1.01])
+    assert cash[1] == pytest.approx(0)
+    # 3번 행: ETH를 × 0.99에 팔고 그 현금으로 BTC를 × 1.01에 산다
+    eth_value = 50 / 1.01 / 2
+    assert holdings[3].tolist() == pytest.approx([100 / 1.01 + eth_value * 0.99 / 1.01, 0])
+    assert (cash >= -1e-9).all()
+    assert (total[1:] < portfolio_backtest.simulate_portfolio(close, weights, 100)[2][1:]).all()
+
+
+def test_portfolio_aligns_markets_with_different_history(store):
+    summary, df = portfolio_backtest.run_portfolio_backtest(
+        ['KRW-BTC', 'KRW-ETH'], DailyAverageStrategy(5), rule="equal", rebalance="daily"
+    )
+    assert len(df) == 200
+    # ETH 상장 전에는 ETH에 배분하지 않는다
+    assert (df['KRW-ETH'].iloc[:50] == 0).all()
+    assert (df['cash'] >= 0.5 * df['total'] - 1e-9).iloc[:50].all()
+    assert summary['Turnover (%)'] > 0
+    assert os.path.exists('results/portfolio/portfolio_equal_daily_200.csv')
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
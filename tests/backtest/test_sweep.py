@@ -0,0 +1,50 @@
+from backtest import sweep
+from backtest.backtester import run_market
+from backtest.golden_dead_cross_backtest import GoldenDeadCrossStrategy
+
+import sys
+import os
+import pytest
+import pandas as pd
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+GRIDS = {
+    "daily_average": {"window": [3, 5, 10]},
+    "golden_dead_cross": {"short_window": [5, 10], "long_window": [10, 20]},
+    "volatility": {"k": [0.5], "check_ma": [False, True], "ma_window": [5, 10]},
+}
+
+
+@pytest.fixture
+def store(write_store):
+    write_store(['KRW-BTC', 'KRW-ETH'], rows=250, seed=1)
+
+
+def test_expand_grid_skips_meaningless_combinations():
+    assert sweep.expand_grid("golden_dead_cross", GRIDS["golden_dead_cross"]) == [
+        {"short_window": 5, "long_window": 10},
+        {"short_window": 5, "long_window": 20},
+        {"short_window": 10, "long_window": 20},
+    ]
+    # check_ma가 False이면 ma_window 변형은 하나만 남긴다
+    assert len(sweep.expand_grid("volatility", GRIDS["volatility"])) == 3
+
+
+def test_run_sweep_streams_all_results(store):
+    output_file = sweep.run_sweep(['KRW-BTC', 'KRW-ETH'], GRIDS, count=200, max_workers=2)
+
+    df = pd.read_csv(output_file)
+    assert len(df) == 2 * (3 + 3 + 3)
+
+    row = df[(df['Strategy'] == 'golden_dead_cross') & (df['Market'] == 'KRW-ETH') & (df['long_window'] == 20)
+             & (df['short_window'] == 10)].iloc[0]
+    expected = run_market('KRW-ETH', 200, 10000, [GoldenDeadCrossStrategy(10, 20)], save=False)[0]
+    assert row['Cumulative Return (%)'] == pytest.approx(expected['Cumulative Return (%)'], rel=1e-12)
+    assert not os.path.exists('results/backtest')  # 스윕은 시장별 결과 파일을 만들지 않는다
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
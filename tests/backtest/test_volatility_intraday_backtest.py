@@ -0,0 +1,96 @@
+from backtest import volatility_intraday_backtest as intraday
+from utils import candle_store
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def make_hourly(days, seed):
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(rng.normal(0, 0.01, days * 24).cumsum())
+    open_ = np.concatenate(([1000], close[:-1]))
+    return pd.DataFrame({
+        'open': open_, 'high': np.maximum(open_, close) * (1 + rng.random(days * 24) * 0.01),
+        'low': np.minimum(open_, close) * 0.99, 'close': close, 'volume': rng.random(days * 24),
+    }, index=pd.date_range('2024-01-01 09:00', periods=days * 24, freq='h', name='date'))
+
+
+def to_daily(hourly):
+    return hourly.resample('D', offset='9h').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    ).rename_axis('date')
+
+
+@pytest.fixture
+def store(candle_workdir):
+    for seed, market in enumerate(['KRW-BTC', 'KRW-ETH']):
+        hourly = make_hourly(40, seed)
+        candle_store.write_candles(market, 'days', to_daily(hourly))
+        # ETH는 하루치 60분봉 하나가 빠져 있다
+        if market == 'KRW-ETH':
+            hourly = hourly.drop(hourly.index[24 * 10 + 5])
+        candle_store.write_candles(market, 'minutes_60', hourly)
+
+
+def test_build_hour_matrix_places_bars():
+    days = pd.date_range('2024-01-01 09:00', periods=2, freq='D').values.view('int64')
+    hours = pd.DatetimeIndex(['2024-01-01 09:00', '2024-01-02 08:00', '2024-01-02 10:00']).values.view('int64')
+    matrix = intraday.build_hour_matrix(days, hours, {'high': [1.0, 2.0, 3.0]})['high']
+    assert matrix.shape == (2, 24)
+    assert matrix[0, 0] == 1 and matrix[0, 23] == 2 and matrix[1, 1] == 3
+    assert np.isnan(matrix).sum() == 48 - 3
+
+
+def test_find_first_hits():
+    high = np.array([[1, 5, 7], [1, 2, 3], [9, 9, 9.0]])
+    open_ = np.array([[1, 1, 6], [1, 1, 1], [8, 8, 8.0]])
+    hour, entry = intraday.find_first_hits(high, open_, np.array([4, 4, np.nan]))
+    assert hour.tolist() == [1, -1, -1]
+    assert entry[0] == 4 and np.isnan(entry[1:]).all()
+
+    # 봉 시가가 이미 목표가보다 높으면 시가에 체결
+    hour, entry = intraday.find_first_hits(high, open_, np.array([6, 4, 4]))
+    assert hour.tolist() == [2, -1, 0]
+    assert entry[0] == 6 and entry[2] == 8
+
+
+def test_intraday_backtest_matches_loop(store):
+    result = intraday.run_intraday_volatility_backtest(['KRW-BTC', 'KRW-ETH'], count=30, save=False)
+    assert result['Market'].tolist() == ['KRW-BTC', 'KRW-ETH']
+
+    for market in ['KRW-BTC', 'KRW-ETH']:
+        df, matrices = intraday.prepare_market(market, 30)
+        hour, entry = intraday.find_first_hits(matrices['high'], matrices['open'], df['target'].to_numpy())
+        hourly = candle_store.read_candles(market, 'minutes_60')
+
+        capital = 10000
+        trades = 0
+        for i, (date, row) in enumerate(df.iterrows()):
+            day = hourly[(hourly.index >= date) & (hourly.index < date + pd.Timedelta(days=1))]
+            if np.isnan(row['target']) or len(day) < 24:
+                assert np.isnan(entry[i]) and hour[i] == -1
+                continue
+            crossed = day[day['high'] >= row['target']]
+            if crossed.empty:
+                assert hour[i] == -1
+                continue
+            assert hour[i] == (crossed.index[0] - date) // pd.Timedelta(hours=1)
+            price = max(row['target'], crossed['open'].iloc[0])
+            exit_price = df['open'].iloc[i + 1] if i + 1 < len(df) else row['close']
+            assert entry[i] == price
+            capital *= exit_price / price
+            trades += 1
+
+        row = result[result['Market'] == market].iloc[0]
+        assert row['Trades'] == trades
+        assert row['Cumulative Return (%)'] == pytest.approx((capital / 10000 - 1) * 100)
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
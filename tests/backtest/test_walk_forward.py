@@ -0,0 +1,96 @@
+from backtest import walk_forward
+from utils import candle_store
+from utils.backtest_engine import CostModel, backtest_strategy
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+CANDIDATES = {
+    "daily_average": [("daily_average", {"window": w}) for w in [3, 5, 10]],
+    "volatility": [("volatility", {"k": k}) for k in [0.3, 0.5]],
+}
+
+
+@pytest.fixture
+def store(write_store):
+    write_store({'KRW-BTC': 300, 'KRW-ETH': 260}, seed=2)
+
+
+def test_make_folds_rolls_test_windows():
+    assert walk_forward.make_folds(300, 200, 50) == [(0, 200, 250), (50, 250, 300)]
+    assert walk_forward.make_folds(249, 200, 50) == []
+
+
+def test_run_fold_picks_best_train_params(store):
+    result = walk_forward.run_fold('KRW-BTC', 'daily_average', CANDIDATES['daily_average'], (50, 250, 300))
+
+    # 학습 구간 (50~250행)에서 수익률이 가장 높은 윈도우를 고른다
+    candles = candle_store.read_candles('KRW-BTC', 'days')
+    train = candles.iloc[50:250].copy()
+    train_returns = {}
+    for w in [3, 5, 10]:
+        train['signal'] = np.where(train['close'] > train['close'].rolling(w, min_periods=1).mean(), 1, 0)
+        train['positions'] = train['signal'].diff()
+        total = backtest_strategy(train, 10000, 1)['total']
+        train_returns[w] = (total.iloc[-1] / 10000 - 1) * 100
+    best = max(train_returns, key=train_returns.get)
+    assert result['Params'] == {"window": best}
+    assert result['In-Sample Return (%)'] == pytest.approx(train_returns[best])
+
+    assert len(result['equity']) == 50
+    assert pd.Timestamp(result['dates'][0]) == candles.index[250]
+
+
+def test_open_position_pays_exit_cost_at_fold_end(store):
+    costs = CostModel(fee_bps=100)
+    candles = candle_store.read_candles('KRW-BTC', 'days').iloc[50:300].copy()
+
+    # 검증 구간 마지막 행에 포지션이 열려 있는 윈도우
+    signals = {w: np.where(candles['close'] > candles['close'].rolling(w, min_periods=1).mean(), 1, 0)
+               for w in range(2, 30)}
+    window = next(w for w, signal in signals.items() if signal[-1] == 1)
+    specs = [('daily_average', {'window': window})]
+    gross = walk_forward.run_fold('KRW-BTC', 'daily_average', specs, (50, 250, 300))
+    net = walk_forward.run_fold('KRW-BTC', 'daily_average', specs, (50, 250, 300), costs=costs)
+
+    test = candles.iloc[199:].copy()
+    test['signal'] = signals[window][199:]
+    test.iloc[0, test.columns.get_loc('signal')] = 0
+    test['positions'] = test['signal'].diff()
+    expected = backtest_strategy(test, 10000, 1, costs=costs)
+    shares = expected['holdings'].iloc[-1] / test['close'].iloc[-1]
+    liquidated = expected['cash'].iloc[-1] + shares * costs.sell_price(test['close'].iloc[-1], shares, 0)
+
+    assert net['equity'][-2] * 10000 == pytest.approx(expected['total'].iloc[-2])
+    assert net['equity'][-1] * 10000 == pytest.approx(liquidated)
+    assert net['equity'][-1] * 10000 < expected['total'].iloc[-1]
+    assert gross['equity'][-1] > net['equity'][-1]
+
+
+def test_run_walk_forward_stitches_out_of_sample_equity(store):
+    summary, equities = walk_forward.run_walk_forward(['KRW-BTC', 'KRW-ETH'], CANDIDATES, max_workers=2)
+
+    assert len(summary) == 4
+    btc = summary[(summary['Strategy'] == 'daily_average') & (summary['Market'] == 'KRW-BTC')].iloc[0]
+    assert btc['Folds'] == 2
+    assert summary[summary['Market'] == 'KRW-ETH']['Folds'].tolist() == [1, 1]
+
+    equity = equities[('daily_average', 'KRW-BTC')]
+    assert len(equity) == 100
+    assert btc['Out-of-Sample Return (%)'] == pytest.approx((equity.iloc[-1] / 10000 - 1) * 100)
+
+    # 두 번째 폴드는 첫 번째 폴드의 마지막 평가금액에서 이어진다
+    second = walk_forward.run_fold('KRW-BTC', 'daily_average', CANDIDATES['daily_average'], (50, 250, 300))
+    assert equity.iloc[-1] == pytest.approx(equity.iloc[49] * second['equity'][-1])
+    assert os.path.exists('results/walk_forward/walk_forward_200_50.csv')
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
@@ -0,0 +1,79 @@
+"""
+tests/conftest.py
+
+백테스트 테스트가 함께 쓰는 캔들 저장소 픽스처.
+
+- candle_workdir: 임시 디렉터리로 이동하고 캔들/지표/결과 캐시를 비움
+- make_candles: 무작위 일봉 데이터프레임을 만드는 함수
+- write_store: 시장별 일봉을 저장소에 기록하는 함수 (candle_workdir 안에서)
+"""
+
+from utils import candle_store, result_cache
+from utils.candle_cache import clear_candle_cache
+from utils.indicator_cache import clear_indicator_cache
+
+import pytest
+import pandas as pd
+import numpy as np
+
+
+def _clear_caches():
+    clear_candle_cache()
+    clear_indicator_cache()
+    result_cache.clear_result_cache()
+
+
+def _make_candles(rows, seed=0, start='2023-01-01 09:00', end=None):
+    """
+    로그 정규 종가의 무작위 일봉.
+
+    :param rows: 캔들 수
+    :param seed: 난수 시드
+    :param start: 첫 캔들 시각 (end를 주면 무시)
+    :param end: 마지막 캔들 시각
+    :return: date 인덱스의 OHLCV 데이터프레임
+    """
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(rng.normal(0, 0.03, rows).cumsum())
+    index = (pd.date_range(end=end, periods=rows, freq='D', name='date') if end is not None
+             else pd.date_range(start, periods=rows, freq='D', name='date'))
+    return pd.DataFrame({
+        'open': close * (1 + rng.normal(0, 0.01, rows)), 'high': close * 1.03, 'low': close * 0.97,
+        'close': close, 'volume': rng.random(rows),
+    }, index=index)
+
+
+@pytest.fixture
+def candle_workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _clear_caches()
+    yield tmp_path
+    _clear_caches()
+
+
+@pytest.fixture
+def make_candles():
+    return _make_candles
+
+
+@pytest.fixture
+def write_store(candle_workdir):
+    """
+    시장별 일봉을 저장소에 기록하는 함수를 반환합니다.
+
+    write_store(markets, rows=250, seed=0, stored_rows=None, end=None)
+    - markets: 시장 코드 목록 또는 {시장: 캔들 수}
+    - stored_rows: 앞에서부터 이만큼만 저장 (나머지는 나중에 append_candles로 추가하는 테스트용)
+    - 반환값: {시장: 만든 전체 데이터프레임}
+    """
+    def write(markets, rows=250, seed=0, stored_rows=None, end=None):
+        if not isinstance(markets, dict):
+            markets = {market: rows for market in markets}
+
+        frames = {}
+        for i, (market, market_rows) in enumerate(markets.items()):
+            frames[market] = _make_candles(market_rows, seed + i, end=end)
+            candle_store.write_candles(market, 'days', frames[market].iloc[:stored_rows])
+        return frames
+
+    return write
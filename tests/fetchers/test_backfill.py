@@ -0,0 +1,93 @@
+from fetchers import backfill
+from utils import candle_store
+
+import sys
+import os
+import asyncio
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+HISTORY = pd.DataFrame(
+    {column: np.arange(1000, dtype=float) for column in ['open', 'high', 'low', 'close', 'volume']},
+    index=pd.date_range('2024-01-01', periods=1000, freq='h', name='date'),
+)
+
+
+@pytest.fixture
+def fake_api(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def fake_page(market, timeframe, to=None, count=backfill.PAGE_SIZE):
+        calls.append(to)
+        df = HISTORY if to is None else HISTORY[HISTORY.index < to.replace(tzinfo=None)]
+        df = df.tail(count)
+        columns = {'date': df.index.values.view('int64')}
+        columns.update({name: df[name].to_numpy() for name in df.columns})
+        return columns
+
+    async def no_limit(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    monkeypatch.setattr(backfill, 'fetch_candle_page', fake_page)
+    monkeypatch.setattr(backfill, 'call_with_rate_limit', no_limit)
+    return calls
+
+
+def test_fetch_candles_until_uses_full_pages(fake_api):
+    until = backfill._to_kst(HISTORY.index[500])
+
+    df = asyncio.run(backfill.fetch_candles_until('KRW-BTC', 'minutes_60', until))
+
+    assert len(fake_api) == 3  # 200개씩 3페이지
+    assert df.index.is_monotonic_increasing
+    assert df.index[0] <= HISTORY.index[500]
+
+
+def test_backfill_resumes_from_checkpoint(fake_api, monkeypatch):
+    until = backfill._to_kst(HISTORY.index[0])
+    original_append = backfill.append_candles
+    flushes = []
+
+    def interrupted_append(*args):
+        flushes.append(1)
+        if len(flushes) == 2:
+            raise RuntimeError('interrupted')
+        original_append(*args)
+
+    monkeypatch.setattr(backfill, 'append_candles', interrupted_append)
+    with pytest.raises(RuntimeError):
+        asyncio.run(backfill.backfill_market('KRW-BTC', 'minutes_60', until, flush_pages=2))
+
+    checkpoint = backfill.load_checkpoint('KRW-BTC', 'minutes_60')
+    assert pd.Timestamp(checkpoint['cursor']).tz_localize(None) == HISTORY.index[600]
+    assert not checkpoint['done']
+
+    monkeypatch.setattr(backfill, 'append_candles', original_append)
+    fake_api.clear()
+    asyncio.run(backfill.backfill_market('KRW-BTC', 'minutes_60', until, flush_pages=2))
+
+    assert len(fake_api) == 3  # 체크포인트 이후 600개만 다시 요청
+    stored = candle_store.read_candles('KRW-BTC', 'minutes_60')
+    pd.testing.assert_frame_equal(stored, HISTORY, check_freq=False)
+    assert backfill.load_checkpoint('KRW-BTC', 'minutes_60')['done']
+
+
+def test_repair_gaps_requests_only_missing_range(fake_api):
+    stored = HISTORY.iloc[:300].drop(HISTORY.index[100:110])
+    candle_store.write_candles('KRW-BTC', 'minutes_60', stored)
+
+    filled = asyncio.run(backfill.repair_gaps('KRW-BTC', 'minutes_60'))
+
+    assert filled == 10
+    assert len(fake_api) == 1  # 빠진 구간만 한 번 요청
+    assert candle_store.read_candles('KRW-BTC', 'minutes_60').index.equals(HISTORY.index[:300])
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
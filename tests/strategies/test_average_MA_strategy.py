@@ -0,0 +1,62 @@
+from strategies import average_MA_strategy
+
+import sys
+import os
+import asyncio
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+WINDOWS = [5, 20, 60, 120, 200]
+
+
+def make_daily(rows=260, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(rng.normal(0, 0.03, rows).cumsum())
+    return pd.DataFrame({'close': close}, index=pd.date_range('2024-01-01 09:00', periods=rows, freq='D'))
+
+
+def full_recompute_message(df, market):
+    """ 매번 201개 캔들을 다시 계산하던 기존 방식의 메시지 """
+    df = average_MA_strategy.calculate_moving_averages(df.iloc[-(WINDOWS[-1] + 1):], WINDOWS)
+    df = average_MA_strategy.calculate_score(df, WINDOWS)
+    df = average_MA_strategy.generate_signals(df)
+    latest = df.iloc[-1]
+    if latest['positions'] == 1:
+        return f"{market}: Buy signal at {latest['close']}"
+    if latest['positions'] == -1:
+        return f"{market}: Sell signal at {latest['close']}"
+    if latest['positions'] == 0 and latest['signal'] == 1:
+        return f"{market}: Hold or Add buy signal at {latest['close']}"
+    return f"{market}: No signal at {latest['close']}"
+
+
+def test_incremental_checks_match_full_recompute(monkeypatch):
+    history = make_daily()
+    state = {'end': 201}
+    requested = []
+
+    async def fake_fetch(market, count):
+        requested.append(count)
+        # 최신 캔들이 위로 오는 API 순서
+        return history.iloc[max(state['end'] - count, 0):state['end']].iloc[::-1]
+
+    monkeypatch.setattr(average_MA_strategy, 'fetch_latest_data_with_retry', fake_fetch)
+    average_MA_strategy._trackers.clear()
+
+    for end in range(201, 260):
+        state['end'] = end
+        message = asyncio.run(average_MA_strategy.check_signals('KRW-BTC', WINDOWS, 10000))
+        expected = full_recompute_message(history.iloc[:end], 'KRW-BTC')
+        assert message.split(', investment')[0] == expected
+
+    assert requested[0] == 201
+    assert set(requested[1:]) == {2}
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
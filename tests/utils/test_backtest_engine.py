@@ -0,0 +1,118 @@
+from utils import backtest_engine
+
+import sys
+import os
+import time
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def reference_backtest(df, initial_capital, investment_fraction, sell_price=None):
+    """ 엔진 도입 전 각 백테스트 모듈에 있던 행 단위 루프 """
+    cash = initial_capital
+    shares = 0
+    df['holdings'] = 0.0
+    df['cash'] = float(initial_capital)
+    df['total'] = float(initial_capital)
+
+    for i in range(1, len(df)):
+        if df['positions'].iloc[i] == 1:  # 매수 신호
+            investment = cash * investment_fraction
+            shares += investment / df['close'].iloc[i]
+            cash -= investment
+        elif df['positions'].iloc[i] == -1:  # 매도 신호
+            price = df['close'].iloc[i] if sell_price is None else sell_price[i]
+            cash += shares * price
+            shares = 0
+        df.loc[df.index[i], 'holdings'] = shares * df['close'].iloc[i]
+        df.loc[df.index[i], 'cash'] = cash
+        df.loc[df.index[i], 'total'] = df.loc[df.index[i], 'holdings'] + df.loc[df.index[i], 'cash']
+
+    df['returns'] = df['total'].pct_change()
+    return df
+
+
+def make_signals(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(rng.normal(0, 0.02, rows).cumsum())
+    signal = (rng.random(rows) > 0.5).astype(int)
+    df = pd.DataFrame({'close': close, 'signal': signal}, index=pd.date_range('2024-01-01', periods=rows, freq='h'))
+    df['positions'] = df['signal'].diff()
+    return df
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_matches_reference_loop(seed):
+    df = make_signals(300, seed)
+
+    expected = reference_backtest(df.copy(), 1_000_000, 0.5)
+    result = backtest_engine.backtest_strategy(df.copy(), 1_000_000, 0.5)
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+def test_matches_reference_loop_with_sell_price():
+    df = make_signals(200)
+    sell_price = df['close'].to_numpy() * 1.01
+
+    expected = reference_backtest(df.copy(), 500_000, 0.2, sell_price)
+    result = backtest_engine.backtest_strategy(df.copy(), 500_000, 0.2, sell_price)
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+def test_empty_and_single_row():
+    for rows in (0, 1):
+        df = make_signals(rows)
+        result = backtest_engine.backtest_strategy(df.copy(), 1000, 0.5)
+        pd.testing.assert_frame_equal(result, reference_backtest(df.copy(), 1000, 0.5))
+
+
+def test_zero_costs_are_identical():
+    df = make_signals(300)
+    df['volume'] = np.random.default_rng(5).random(300)
+
+    expected = backtest_engine.backtest_strategy(df.copy(), 1_000_000, 0.5)
+    result = backtest_engine.backtest_strategy(df.copy(), 1_000_000, 0.5, costs=backtest_engine.CostModel())
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+def test_costs_adjust_fill_prices():
+    close = np.array([100, 100, 110, 110, 120.0])
+    positions = np.array([np.nan, 1, 0, -1, 0])
+    volume = np.array([1, 10, 1, 20, 1.0])
+    costs = backtest_engine.CostModel(fee_bps=5, slippage_bps=10, volume_slippage=0.1)
+
+    holdings, cash, total = backtest_engine.simulate_positions(close, positions, 1000, 1, costs=costs, volume=volume)
+
+    # 매수: 10주 주문 / 거래량 10 → 비율 0.0015 + 0.1
+    shares = 1000 / (100 * (1 + 0.0015 + 0.1))
+    # 매도: 보유 수량 / 거래량 20
+    sell = 110 * (1 - 0.0015 - 0.1 * shares / 20)
+    assert holdings[1] == pytest.approx(shares * 100)
+    assert cash[1] == pytest.approx(0)
+    assert cash[3] == pytest.approx(shares * sell)
+    assert total[3] == pytest.approx(shares * sell)
+    assert total[4] == total[3]
+
+    # Binance 백테스트와 같은 수수료 방식 (0.1%)
+    _, _, total = backtest_engine.simulate_positions(close, positions, 1000, 1, costs=backtest_engine.CostModel(fee_bps=10))
+    assert total[-1] == pytest.approx(1000 / (100 * 1.001) * 110 * 0.999)
+
+
+def test_runs_on_long_series():
+    df = make_signals(100_000)
+
+    started = time.perf_counter()
+    backtest_engine.backtest_strategy(df, 1_000_000, 0.5)
+
+    assert time.perf_counter() - started < 1.0
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
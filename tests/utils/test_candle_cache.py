@@ -0,0 +1,79 @@
+from utils import candle_cache, candle_store
+from utils.data_utils import get_recent_candles
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def make_candles(periods, start='2024-01-01 09:00:00'):
+    index = pd.date_range(start, periods=periods, freq='D', name='date')
+    close = np.arange(periods, dtype=float) + 100
+    return pd.DataFrame({c: close for c in ['open', 'high', 'low', 'close', 'volume']}, index=index)
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    candle_cache.clear_candle_cache()
+    yield tmp_path
+    candle_cache.clear_candle_cache()
+
+
+def test_file_is_loaded_once(store_dir, monkeypatch):
+    candle_store.write_candles('KRW-BTC', candle_store.DAYS, make_candles(10))
+    loads = []
+    original_load = candle_cache._load_frame
+    monkeypatch.setattr(candle_cache, '_load_frame', lambda *args: loads.append(args) or original_load(*args))
+
+    first = get_recent_candles('KRW-BTC', 5)
+    second = get_recent_candles('KRW-BTC', 3)
+
+    assert len(loads) == 1
+    assert first['close'].tolist()[-3:] == second['close'].tolist()
+    assert get_recent_candles('KRW-BTC', 0).empty
+
+
+def test_cached_values_are_read_only(store_dir):
+    candle_store.write_candles('KRW-BTC', candle_store.DAYS, make_candles(10))
+
+    df = get_recent_candles('KRW-BTC', 5)
+
+    with pytest.raises(ValueError):
+        df['open'].to_numpy()[0] = 0.0
+
+    # sort_index()로 만든 복사본은 자유롭게 수정할 수 있다
+    copied = df.sort_index()
+    copied.iloc[0, 0] = 0.0
+    assert get_recent_candles('KRW-BTC', 5).iloc[0, 0] != 0.0
+
+
+def test_changed_file_is_reloaded(store_dir):
+    candle_store.write_candles('KRW-BTC', candle_store.DAYS, make_candles(10))
+    get_recent_candles('KRW-BTC', 5)
+
+    candle_store.append_candles('KRW-BTC', candle_store.DAYS, make_candles(1, start='2024-01-11 09:00:00'))
+
+    assert get_recent_candles('KRW-BTC', 1).index[0] == pd.Timestamp('2024-01-11 09:00:00')
+    assert candle_cache.get_cache_info()['entries'] == 1
+
+
+def test_eviction_respects_memory_cap(store_dir, monkeypatch):
+    for market in ['KRW-BTC', 'KRW-ETH', 'KRW-SOL']:
+        candle_store.write_candles(market, candle_store.DAYS, make_candles(100))
+    monkeypatch.setattr(candle_cache, 'MAX_CACHE_BYTES', 2 * 100 * 6 * 8)
+
+    for market in ['KRW-BTC', 'KRW-ETH', 'KRW-SOL']:
+        get_recent_candles(market, 10)
+
+    assert candle_cache.get_cache_info()['entries'] == 2
+    assert candle_cache.get_cache_info()['bytes'] <= candle_cache.MAX_CACHE_BYTES
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
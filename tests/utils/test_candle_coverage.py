@@ -0,0 +1,76 @@
+from utils import candle_coverage
+from utils import candle_store
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def make_candles(index):
+    return pd.DataFrame(
+        {column: np.arange(len(index), dtype=float) for column in ['open', 'high', 'low', 'close', 'volume']},
+        index=pd.DatetimeIndex(index, name='date'),
+    )
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def test_find_gaps():
+    step = candle_coverage.get_timeframe_step('minutes_60')
+    dates = pd.date_range('2024-01-01', periods=10, freq='h').delete([3, 4, 8]).values.view('int64')
+
+    gaps = candle_coverage.find_gaps(dates, step)
+
+    assert [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in gaps] == [
+        (pd.Timestamp('2024-01-01 03:00'), pd.Timestamp('2024-01-01 04:00')),
+        (pd.Timestamp('2024-01-01 08:00'), pd.Timestamp('2024-01-01 08:00')),
+    ]
+
+
+def test_update_coverage_is_incremental(store):
+    index = pd.date_range('2024-01-01', periods=48, freq='h')
+    candle_store.write_candles('KRW-BTC', 'minutes_60', make_candles(index[:24].delete(5)))
+    coverage = candle_coverage.build_coverage('KRW-BTC', 'minutes_60')
+    assert coverage['rows'] == 23 and coverage['expected'] == 24
+
+    candle_store.append_candles('KRW-BTC', 'minutes_60', make_candles(index[24:].delete(10)))
+    coverage = candle_coverage.update_coverage('KRW-BTC', 'minutes_60')
+
+    assert coverage['rows'] == 46 and coverage['expected'] == 48
+    assert candle_coverage.describe_gaps(coverage) == [(index[5], index[5]), (index[34], index[34])]
+
+    # gap이 채워지면 전체를 다시 검사한다
+    candle_store.append_candles('KRW-BTC', 'minutes_60', make_candles(index[5:6]))
+    coverage = candle_coverage.update_coverage('KRW-BTC', 'minutes_60')
+    assert candle_coverage.describe_gaps(coverage) == [(index[34], index[34])]
+
+
+def test_empty_gaps_survive_rebuild(store):
+    index = pd.date_range('2024-01-01', periods=10, freq='D')
+    candle_store.write_candles('KRW-BTC', 'days', make_candles(index.delete(4)))
+    coverage = candle_coverage.build_coverage('KRW-BTC', 'days')
+
+    candle_coverage.mark_empty('KRW-BTC', 'days', coverage['gaps'][0])
+    coverage = candle_coverage.build_coverage('KRW-BTC', 'days')
+
+    assert coverage['gaps'] == []
+    assert len(coverage['empty']) == 1
+    assert coverage['expected'] == 10
+
+    # 전체를 다시 써도 empty 기록은 남는다
+    candle_store.write_candles('KRW-BTC', 'days', make_candles(index.delete(4)))
+    assert candle_coverage.load_coverage('KRW-BTC', 'days')['empty'] == coverage['empty']
+    coverage = candle_coverage.build_coverage('KRW-BTC', 'days')
+    assert coverage['gaps'] == [] and len(coverage['empty']) == 1
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
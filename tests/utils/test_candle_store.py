@@ -0,0 +1,136 @@
+from utils import candle_store
+from utils.candle_cache import clear_candle_cache
+from utils.data_utils import get_recent_candles, get_minute_candles_from_file
+import sys
+import os
+import datetime
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def make_candles(periods, freq='D', start='2024-01-01 09:00:00'):
+    index = pd.date_range(start, periods=periods, freq=freq, name='date')
+    close = np.arange(periods, dtype=float) + 100
+    return pd.DataFrame({
+        'open': close - 1,
+        'high': close + 2,
+        'low': close - 2,
+        'close': close,
+        'volume': close * 10,
+    }, index=index)
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    clear_candle_cache()
+    return tmp_path
+
+
+def test_write_and_read_candles(store_dir):
+    df = make_candles(10)
+    candle_store.write_candles('KRW-BTC', candle_store.DAYS, df)
+
+    result = candle_store.read_candles('KRW-BTC', candle_store.DAYS)
+    pd.testing.assert_frame_equal(result, df, check_freq=False)
+
+
+def test_read_candles_column_projection(store_dir):
+    candle_store.write_candles('KRW-BTC', candle_store.DAYS, make_candles(10))
+
+    result = candle_store.read_candles('KRW-BTC', candle_store.DAYS, columns=['close'], start=-3)
+
+    assert result.columns.tolist() == ['close']
+    assert result['close'].tolist() == [107.0, 108.0, 109.0]
+
+
+def test_append_candles_only_new_rows(store_dir):
+    df = make_candles(10)
+    candle_store.write_candles('KRW-BTC', candle_store.DAYS, df.iloc[:6])
+
+    rows = candle_store.append_candles('KRW-BTC', candle_store.DAYS, df.iloc[6:])
+
+    assert rows == 10
+    pd.testing.assert_frame_equal(candle_store.read_candles('KRW-BTC', candle_store.DAYS), df, check_freq=False)
+
+
+def test_append_candles_rewrites_forming_tail(store_dir):
+    df = make_candles(10)
+    candle_store.write_candles('KRW-BTC', candle_store.DAYS, df.iloc[:6])
+
+    # 마지막 캔들(형성 중)이 갱신된 값으로 다시 들어오는 경우
+    update = df.iloc[5:].copy()
+    update.loc[update.index[0], 'close'] = 999.0
+    candle_store.append_candles('KRW-BTC', candle_store.DAYS, update)
+
+    result = candle_store.read_candles('KRW-BTC', candle_store.DAYS)
+    assert len(result) == 10
+    assert result['close'].iloc[5] == 999.0
+    assert result['close'].iloc[4] == df['close'].iloc[4]
+    assert candle_store.read_last_date('KRW-BTC', candle_store.DAYS) == df.index[-1]
+
+
+def test_interrupted_tail_rewrite_is_replayed(store_dir):
+    df = make_candles(6)
+    candle_store.write_candles('KRW-BTC', candle_store.DAYS, df)
+    path = candle_store.get_store_path('KRW-BTC', candle_store.DAYS)
+
+    # 저널을 기록하고 close 컬럼만 적용한 뒤 중단된 상황
+    journaled = make_candles(2, start='2024-01-06 09:00:00') * 2
+    tail = candle_store._frame_to_columns(journaled)
+    for name, values in tail.items():
+        values.tofile(os.path.join(path, f'{name}.journal'))
+    with open(os.path.join(path, 'journal.json'), 'w') as f:
+        f.write('{"offset": 5, "rows": 7}')
+    with open(os.path.join(path, 'close.bin'), 'r+b') as f:
+        f.seek(5 * 8)
+        f.write(tail['close'].tobytes())
+
+    # 읽기는 파일을 바꾸지 않고 저널의 꼬리를 메모리에서 덮어 일관된 결과를 돌려준다
+    result = candle_store.read_candles('KRW-BTC', candle_store.DAYS)
+    assert len(result) == 7
+    pd.testing.assert_frame_equal(result.iloc[:5], df.iloc[:5], check_freq=False)
+    pd.testing.assert_frame_equal(result.iloc[5:], journaled, check_freq=False)
+    assert candle_store.read_columns('KRW-BTC', candle_store.DAYS, ['close'], start=-1)['close'].tolist() == \
+        [journaled['close'].iloc[-1]]
+    assert os.path.exists(os.path.join(path, 'journal.json'))
+    assert candle_store.read_meta('KRW-BTC', candle_store.DAYS)['rows'] == 6
+
+    # 다음 쓰기가 저널을 먼저 적용한다
+    rows = candle_store.append_candles('KRW-BTC', candle_store.DAYS, make_candles(1, start='2024-01-08 09:00:00'))
+    assert rows == 8
+    assert not os.path.exists(os.path.join(path, 'journal.json'))
+    result = candle_store.read_candles('KRW-BTC', candle_store.DAYS)
+    assert result['close'].iloc[5] == make_candles(2, start='2024-01-06 09:00:00')['close'].iloc[0] * 2
+
+    # 다른 프로세스가 이미 적용해 저널이 없어도 실패하지 않는다
+    candle_store._replay_journal(path)
+    assert len(candle_store.read_candles('KRW-BTC', candle_store.DAYS)) == 8
+
+
+def test_migrate_csv_and_loaders(store_dir):
+    os.makedirs('data/daily_candles')
+    os.makedirs('data/minutes_candles')
+    daily = make_candles(30)
+    minutes = make_candles(48, freq='h', start='2024-01-01 00:00:00')
+    daily.to_csv('data/daily_candles/daily_candles_KRW-BTC.csv')
+    minutes.to_csv('data/minutes_candles/minutes_candles_KRW-BTC_60.csv')
+
+    # 이전 전후 로더 결과가 같아야 한다
+    csv_recent = get_recent_candles('KRW-BTC', 5)
+    start = datetime.datetime(2024, 1, 2)
+    csv_minutes = get_minute_candles_from_file('KRW-BTC', 10, start)
+
+    candle_store.migrate_all(['KRW-BTC'])
+
+    assert candle_store.has_candles('KRW-BTC', 'minutes_60')
+    pd.testing.assert_frame_equal(get_recent_candles('KRW-BTC', 5), csv_recent)
+    pd.testing.assert_frame_equal(get_minute_candles_from_file('KRW-BTC', 10, start), csv_minutes)
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
@@ -0,0 +1,82 @@
+from utils import indicator_cache
+from utils import candle_store
+from utils.candle_cache import clear_candle_cache, get_candle_frame
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def make_candles(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(rows).cumsum()
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': rng.random(rows),
+    }, index=pd.date_range('2024-01-01 09:00', periods=rows, freq='D', name='date'))
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    clear_candle_cache()
+    indicator_cache.clear_indicator_cache()
+    yield
+    clear_candle_cache()
+    indicator_cache.clear_indicator_cache()
+
+
+def test_indicators_match_pandas():
+    df = make_candles(50)
+    arrays = {column: df[column].to_numpy() for column in df.columns}
+
+    np.testing.assert_array_equal(
+        indicator_cache.compute_indicator(arrays, 'sma', 'close', 5),
+        df['close'].rolling(window=5, min_periods=1).mean().to_numpy())
+    np.testing.assert_array_equal(
+        indicator_cache.compute_indicator(arrays, 'std', 'close', 20),
+        df['close'].rolling(window=20).std().to_numpy())
+    np.testing.assert_array_equal(
+        indicator_cache.compute_indicator(arrays, 'ema', 'close', 12),
+        df['close'].ewm(span=12, adjust=False).mean().to_numpy())
+    np.testing.assert_array_equal(
+        indicator_cache.compute_indicator(arrays, 'range'),
+        (df['high'].shift(1) - df['low'].shift(1)).to_numpy())
+
+
+def test_same_indicator_is_computed_once(store):
+    candle_store.write_candles('KRW-BTC', 'days', make_candles(100))
+    candles = get_candle_frame('KRW-BTC', 'days')
+    arrays = {column: candles[column].to_numpy() for column in candles.columns}
+    key = indicator_cache.make_cache_key('KRW-BTC', 'days', candles)
+
+    first = indicator_cache.get_indicator(arrays, 'sma', 'close', 5, cache_key=key)
+    second = indicator_cache.get_indicator(arrays, 'sma', 'close', 5, cache_key=key)
+
+    assert first is second
+    assert indicator_cache.get_indicator_cache_info()['hits'] == 1
+
+
+def test_entries_are_evicted_when_candles_change(store):
+    candle_store.write_candles('KRW-BTC', 'days', make_candles(100))
+    candles = get_candle_frame('KRW-BTC', 'days')
+    arrays = {column: candles[column].to_numpy() for column in candles.columns}
+    indicator_cache.get_indicator(arrays, 'sma', 'close', 5,
+                                  cache_key=indicator_cache.make_cache_key('KRW-BTC', 'days', candles))
+
+    candle_store.append_candles('KRW-BTC', 'days', make_candles(101, seed=1).iloc[-1:])
+    candles = get_candle_frame('KRW-BTC', 'days')
+    arrays = {column: candles[column].to_numpy() for column in candles.columns}
+    key = indicator_cache.make_cache_key('KRW-BTC', 'days', candles)
+    values = indicator_cache.get_indicator(arrays, 'sma', 'close', 5, cache_key=key)
+
+    assert len(values) == 101
+    assert indicator_cache.get_indicator_cache_info()['entries'] == 1
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
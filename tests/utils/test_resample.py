@@ -0,0 +1,74 @@
+from utils import resample
+from utils import candle_store
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def make_hourly(periods, start='2024-01-01 00:00'):
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(periods).cumsum()
+    return pd.DataFrame({
+        'open': close + rng.standard_normal(periods),
+        'high': close + 2,
+        'low': close - 2,
+        'close': close,
+        'volume': rng.random(periods) * 10,
+    }, index=pd.date_range(start, periods=periods, freq='h', name='date'))
+
+
+def pandas_resample(df, rule, offset):
+    agg = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    return df.resample(rule, offset=offset, closed='left', label='left').agg(agg).dropna()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.mark.parametrize('timeframe, rule, offset', [
+    ('minutes_240', '4h', '1h'),
+    ('minutes_720', '12h', '9h'),
+    ('days', '1D', '9h'),
+])
+def test_resample_candles_matches_pandas(timeframe, rule, offset):
+    df = make_hourly(500)
+
+    result = resample.resample_candles(df, timeframe)
+
+    expected = pandas_resample(df, rule, offset)
+    pd.testing.assert_frame_equal(result, expected, check_freq=False, check_names=False)
+
+
+def test_weekly_buckets_start_monday_9am():
+    df = make_hourly(24 * 21)
+
+    result = resample.resample_candles(df, candle_store.WEEKS)
+
+    assert (result.index.dayofweek == 0).all()
+    assert (result.index.hour == 9).all()
+    assert result['volume'].sum() == pytest.approx(df['volume'].sum())
+
+
+def test_resample_market_is_incremental(store):
+    df = make_hourly(24 * 30)
+    candle_store.write_candles('KRW-BTC', 'minutes_60', df.iloc[:24 * 20 + 5])
+    resample.resample_market('KRW-BTC', 'days')
+
+    candle_store.append_candles('KRW-BTC', 'minutes_60', df.iloc[24 * 20 + 5:])
+    buckets = resample.resample_market('KRW-BTC', 'days')
+
+    assert buckets == 11  # 형성 중이던 마지막 버킷부터 다시 계산
+    expected = resample.resample_candles(df, 'days')
+    pd.testing.assert_frame_equal(candle_store.read_candles('KRW-BTC', 'days'), expected, check_freq=False)
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
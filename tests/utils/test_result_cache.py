@@ -0,0 +1,112 @@
+from utils import result_cache, save_results
+from utils import candle_store
+from utils.backtest_engine import UPBIT_COSTS
+from utils.candle_cache import clear_candle_cache
+from backtest import backtester
+from backtest.daily_average_backtest import DailyAverageStrategy
+
+import sys
+import os
+import pytest
+import pandas as pd
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+MARKET = 'KRW-BTC'
+
+
+@pytest.fixture
+def store(write_store):
+    return write_store([MARKET], rows=230, seed=3, stored_rows=220)[MARKET]
+
+
+def test_key_depends_on_every_input(make_candles, monkeypatch):
+    candles = make_candles(50, seed=3)
+    fingerprint = result_cache.data_fingerprint(candles)
+    key = result_cache.make_result_key(fingerprint, MARKET, DailyAverageStrategy(5), count=50)
+
+    assert key == result_cache.make_result_key(
+        result_cache.data_fingerprint(candles.copy()), MARKET, DailyAverageStrategy(5), count=50)
+
+    edited = candles.copy()
+    edited.iloc[10, edited.columns.get_loc('close')] += 1e-9
+    assert key != result_cache.make_result_key(result_cache.data_fingerprint(edited), MARKET, DailyAverageStrategy(5), count=50)
+    assert key != result_cache.make_result_key(fingerprint, 'KRW-ETH', DailyAverageStrategy(5), count=50)
+    assert key != result_cache.make_result_key(fingerprint, MARKET, DailyAverageStrategy(6), count=50)
+    assert key != result_cache.make_result_key(fingerprint, MARKET, DailyAverageStrategy(5), count=49)
+
+    monkeypatch.setattr(result_cache, 'ENGINE_VERSION', result_cache.ENGINE_VERSION + 1)
+    assert key != result_cache.make_result_key(fingerprint, MARKET, DailyAverageStrategy(5), count=50)
+
+
+def test_run_market_recomputes_only_changed_inputs(store, monkeypatch):
+    strategies = [DailyAverageStrategy(5), DailyAverageStrategy(20)]
+    expected = backtester.run_market(MARKET, 200, 10000, strategies, save=False)
+    assert backtester.run_market(MARKET, 200, 10000, strategies, save=False, use_cache=True) == expected
+
+    simulated = []
+    simulate_market = backtester.simulate_market
+
+    def tracking_simulate_market(market, count, initial_capital, strategies, costs=None):
+        simulated.append([strategy.results_name for strategy in strategies])
+        return simulate_market(market, count, initial_capital, strategies, costs)
+
+    monkeypatch.setattr(backtester, 'simulate_market', tracking_simulate_market)
+
+    # 같은 입력은 메모에서, 메모를 비워도 디스크에서 가져온다
+    assert backtester.run_market(MARKET, 200, 10000, strategies, save=False, use_cache=True) == expected
+    result_cache.clear_result_cache()
+    assert backtester.run_market(MARKET, 200, 10000, strategies, save=False, use_cache=True) == expected
+    assert simulated == []
+    assert result_cache.get_result_cache_info()['disk_hits'] == 2
+
+    # 파라미터가 바뀐 전략만 다시 계산
+    strategies[1] = DailyAverageStrategy(30)
+    backtester.run_market(MARKET, 200, 10000, strategies, save=False, use_cache=True)
+    assert simulated == [['daily_average_30']]
+
+    # 새 캔들이 붙으면 모두 다시 계산
+    candle_store.append_candles(MARKET, 'days', store.iloc[219:221])
+    clear_candle_cache()
+    result = backtester.run_market(MARKET, 200, 10000, strategies, save=False, use_cache=True)
+    assert simulated[-1] == ['daily_average_5', 'daily_average_30']
+    assert result == backtester.run_market(MARKET, 200, 10000, strategies, save=False)
+
+
+def test_overwritten_or_deleted_output_is_rewritten(store):
+    strategies = [DailyAverageStrategy(5)]
+    path = save_results.get_market_result_path(MARKET, 200, 'daily_average_5')
+
+    net = backtester.run_market(MARKET, 200, 10000, strategies, costs=UPBIT_COSTS, use_cache=True)
+    net_total = pd.read_csv(path)['total'].iloc[-1]
+    assert net_total == pytest.approx(10000 * (1 + net[0]['Cumulative Return (%)'] / 100))
+
+    # 비용 없는 실행이 같은 파일을 덮어쓴 뒤에는 적중이 아니다
+    backtester.run_market(MARKET, 200, 10000, strategies)
+    assert pd.read_csv(path)['total'].iloc[-1] != net_total
+    assert backtester.run_market(MARKET, 200, 10000, strategies, costs=UPBIT_COSTS, use_cache=True) == net
+    assert pd.read_csv(path)['total'].iloc[-1] == net_total
+
+    # 지워진 파일은 다시 만든다
+    os.remove(path)
+    assert backtester.run_market(MARKET, 200, 10000, strategies, costs=UPBIT_COSTS, use_cache=True) == net
+    assert pd.read_csv(path)['total'].iloc[-1] == net_total
+
+
+def test_evict_removes_least_recently_used(store):
+    for i in range(5):
+        result_cache.put_result(f'{i:02d}' * 32, {'value': 'x' * 1000})
+        path = result_cache._cache_path(f'{i:02d}' * 32)
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+
+    size = os.path.getsize(result_cache._cache_path('00' * 32))
+    assert result_cache.evict(max_bytes=size * 2) == 3
+
+    result_cache.clear_result_cache()
+    assert [result_cache.get_result(f'{i:02d}' * 32) is not None for i in range(5)] == [False] * 3 + [True] * 2
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
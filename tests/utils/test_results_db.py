@@ -0,0 +1,93 @@
+from utils import results_db
+from utils.backtest_engine import CostModel
+from utils.save_results import save_backtest_results
+
+import sys
+import os
+import json
+import pytest
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def make_results(returns):
+    return [
+        {"Market": market, "Count": 200, "Investment Fraction": 1, "Cumulative Return (%)": value,
+         "Win Rate (%)": 50 + i, "Max Drawdown (%)": -value / 2}
+        for i, (market, value) in enumerate(returns.items())
+    ]
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_save_returns_frame_and_keeps_runs(workdir):
+    first = save_backtest_results(make_results({"KRW-BTC": 10.0, "KRW-ETH": 5.0}), 200, "daily_average_5", {"window": 5})
+    second = save_backtest_results(make_results({"KRW-BTC": 12.0, "KRW-ETH": np.float64(-3.0)}), 200, "daily_average_5")
+
+    # Win Rate 내림차순, 새 인덱스
+    assert first["Market"].tolist() == ["KRW-ETH", "KRW-BTC"]
+    assert first.index.tolist() == [0, 1]
+
+    # 백업 파일 없이 최신 CSV만 남는다
+    assert sorted(os.listdir("results/backtest")) == ["daily_average_5_backtest_200.csv", "results.db"]
+    pd.testing.assert_frame_equal(pd.read_csv("results/backtest/daily_average_5_backtest_200.csv"), second)
+
+    runs = results_db.list_runs("daily_average_5")
+    assert runs["run_id"].tolist() == [1, 2]
+    assert runs["params"].tolist() == ['{"window": 5}', None]
+
+    pd.testing.assert_frame_equal(results_db.load_latest("daily_average_5", 200), second, check_dtype=False)
+    assert results_db.load_latest("daily_average_5", 100) is None
+    assert results_db.load_latest("golden_dead_cross") is None
+
+
+def test_query_results_filters_history(workdir):
+    save_backtest_results(make_results({"KRW-BTC": 10.0, "KRW-ETH": 5.0}), 200, "volatility")
+    save_backtest_results(make_results({"KRW-BTC": 12.0}), 200, "volatility")
+    save_backtest_results(make_results({"KRW-BTC": 1.0}), 200, "afternoon")
+
+    history = results_db.query_results(strategy="volatility", market="KRW-BTC")
+    assert history["run_id"].tolist() == [1, 2]
+    assert history["Cumulative Return (%)"].tolist() == [10.0, 12.0]
+
+    assert results_db.query_results(market="KRW-BTC")["Strategy"].tolist() == ["volatility", "volatility", "afternoon"]
+    assert results_db.query_results(since="2999-01-01").empty
+
+    latest = results_db.load_latest_many({"vol": "volatility", "noon": "afternoon", "gold": "golden_dead_cross"}, 200)
+    assert latest["vol"]["Cumulative Return (%)"].tolist() == [12.0]
+    assert latest["noon"]["Cumulative Return (%)"].tolist() == [1.0]
+    assert latest["gold"] is None
+
+
+def test_extra_columns_round_trip(workdir):
+    results = make_results({"KRW-BTC": 10.0})
+    results[0]["Trades"] = np.int64(7)
+    save_backtest_results(results, 200, "volatility_intraday")
+
+    loaded = results_db.load_latest("volatility_intraday")
+    assert loaded["Trades"].tolist() == [7]
+
+
+def test_run_settings_distinguish_net_and_gross_runs(workdir):
+    gross = results_db.run_params({"window": 5}, 10000)
+    net = results_db.run_params({"window": 5}, 10000, CostModel(fee_bps=5))
+    assert gross == {"window": 5, "initial_capital": 10000, "costs": None}
+    assert results_db.run_params({"window": 5}, 10000, CostModel()) == gross
+    assert net["costs"] == {"fee_bps": 5, "slippage_bps": 0, "volume_slippage": 0}
+
+    save_backtest_results(make_results({"KRW-BTC": 10.0}), 200, "daily_average_5", net)
+    save_backtest_results(make_results({"KRW-BTC": 12.0}), 200, "daily_average_5", gross)
+
+    runs = results_db.list_runs("daily_average_5")
+    assert [json.loads(params)["costs"] for params in runs["params"]] == [net["costs"], None]
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
@@ -0,0 +1,68 @@
+from utils import robustness
+from utils.backtest_metrics import mdd_array, win_rate_array
+
+import sys
+import os
+import pytest
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def test_bootstrap_paths_shape_and_blocks():
+    returns = np.arange(10) / 100
+    paths = robustness.bootstrap_paths(returns, 50, length=7, block_size=3, rng=np.random.default_rng(0))
+    assert paths.shape == (50, 7)
+    assert np.isin(paths, returns).all()
+
+    # 블록 안에서는 원본 순서(원형)를 그대로 따른다
+    steps = np.round((paths[:, 1:3] - paths[:, 0:2]) * 100) % 10
+    assert (steps == 1).all()
+
+
+def test_path_metrics_match_array_metrics():
+    total = np.array([100, 110, 99, 120, 90, 95.0])
+    paths = robustness.bar_returns(total)[None, :]
+    metrics = robustness.path_metrics(paths)
+    assert metrics['Cumulative Return (%)'][0] == pytest.approx(-5)
+    assert metrics['Max Drawdown (%)'][0] == pytest.approx(mdd_array(total))
+
+
+def test_trade_returns_match_win_rate():
+    positions = np.array([np.nan, 1, 0, -1, 0, 1, -1, 1, 0, -1])
+    total = np.array([100, 100, 105, 110, 110, 110, 100, 100, 101, 102.0])
+    returns = robustness.trade_returns(positions, total)
+    assert returns == pytest.approx([0.1, 100 / 110 - 1, 0.02])
+    assert (returns > 0).mean() * 100 == pytest.approx(win_rate_array(positions, total))
+
+
+def test_bootstrap_backtest_intervals():
+    rng = np.random.default_rng(3)
+    total = 10000 * np.cumprod(1 + rng.normal(0.001, 0.02, 200))
+    positions = np.zeros(200)
+
+    result = robustness.bootstrap_backtest(positions, total, n_paths=5000, seed=7)
+    stats = result['Cumulative Return (%)']
+    assert stats['p5'] < stats['p50'] < stats['p95']
+    assert result['Max Drawdown (%)']['p95'] <= 0
+    # 같은 시드는 같은 분포를 만든다
+    assert robustness.bootstrap_backtest(positions, total, n_paths=5000, seed=7) == result
+
+    with pytest.raises(ValueError):
+        robustness.bootstrap_backtest(positions, total, mode="daily")
+    with pytest.raises(ValueError):
+        robustness.bootstrap_backtest(positions, total, n_paths=0)
+    for block_size in [0, -2]:
+        with pytest.raises(ValueError):
+            robustness.bootstrap_backtest(positions, total, n_paths=10, block_size=block_size)
+
+
+def test_bootstrap_without_trades():
+    result = robustness.bootstrap_backtest(np.zeros(5), np.full(5, 100.0), mode="trade", n_paths=10, seed=1)
+    assert result['Cumulative Return (%)']['mean'] == 0
+    assert result['Win Rate (%)']['p50'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
@@ -0,0 +1,87 @@
+from utils import save_results
+from backtest.backtester import run_backtests, run_market
+from backtest.volatility_backtest import VolatilityStrategy
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+MARKET = 'KRW-BTC'
+
+
+@pytest.fixture
+def store(write_store):
+    write_store([MARKET], rows=220, seed=5)
+
+
+def test_storage_modes_load_the_same_columns(store):
+    strategy = VolatilityStrategy(k=0.5, check_ma=True)
+    run_market(MARKET, 200, 10000, [strategy])
+    options = strategy.save_options
+    full = save_results.load_market_backtest_result(MARKET, 200, 'volatility', **options)
+    assert os.path.exists(save_results.get_market_result_path(MARKET, 200, 'volatility', **options))
+    assert {'signal', 'positions', 'total'} <= set(full.columns)
+
+    run_market(MARKET, 200, 10000, [strategy], storage='npz')
+    loaded = save_results.load_market_backtest_result(MARKET, 200, 'volatility', columns=['total'], **options)
+    assert list(loaded.columns) == ['total']
+    pd.testing.assert_series_equal(loaded['total'], full['total'], check_freq=False)
+    pd.testing.assert_frame_equal(
+        save_results.load_market_backtest_result(MARKET, 200, 'volatility', **options), full,
+        check_freq=False, check_dtype=False
+    )
+
+    run_market(MARKET, 200, 10000, [strategy], storage='equity')
+    trades = save_results.load_market_trades(MARKET, 200, 'volatility', **options)
+    positions = full['positions']
+    assert len(trades) == int((positions.notna() & (positions != 0)).sum())
+    np.testing.assert_array_equal(trades['total'], full.loc[trades.index, 'total'])
+
+
+def test_missing_columns_raise_the_same_error(store):
+    strategy = VolatilityStrategy(k=0.5)
+
+    run_market(MARKET, 200, 10000, [strategy], storage='npz')
+    with pytest.raises(ValueError, match=r"\['missing'\]"):
+        save_results.load_market_backtest_result(MARKET, 200, 'volatility', columns=['total', 'signal', 'missing'])
+
+    # equity 방식이 가장 최근이면 평가금액 곡선만 읽을 수 있다
+    run_market(MARKET, 200, 10000, [strategy], storage='equity')
+    equity = save_results.load_market_backtest_result(MARKET, 200, 'volatility')
+    assert list(equity.columns) == ['total']
+    pd.testing.assert_frame_equal(
+        save_results.load_market_backtest_result(MARKET, 200, 'volatility', columns=['total']), equity
+    )
+    with pytest.raises(ValueError, match=r"\['signal'\]"):
+        save_results.load_market_backtest_result(MARKET, 200, 'volatility', columns=['total', 'signal'])
+
+
+def test_none_storage_writes_nothing(store):
+    run_market(MARKET, 200, 10000, [VolatilityStrategy(k=0.5)], storage='none')
+    assert not os.path.exists('results/backtest')
+    assert save_results.load_market_backtest_result(MARKET, 200, 'volatility') is None
+
+    with pytest.raises(ValueError):
+        save_results.save_market_backtest_result(MARKET, pd.DataFrame(), 200, 'volatility', storage='parquet')
+
+
+def test_unknown_storage_is_rejected_before_running(store):
+    strategies = [VolatilityStrategy(k=0.5)]
+    run_market(MARKET, 200, 10000, strategies, save=False, use_cache=True)
+
+    # 캐시 적중이나 저장하지 않는 실행이어도 저장 방식부터 확인한다
+    with pytest.raises(ValueError):
+        run_market(MARKET, 200, 10000, strategies, save=False, use_cache=True, storage='parquet')
+    with pytest.raises(ValueError):
+        run_backtests([MARKET], strategies=strategies, storage='parquet')
+    assert not os.path.exists('results/backtest')
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
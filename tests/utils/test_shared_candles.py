@@ -0,0 +1,61 @@
+from utils import candle_store, shared_candles
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def make_candles(periods):
+    index = pd.date_range('2024-01-01 09:00:00', periods=periods, freq='D', name='date')
+    close = np.arange(periods, dtype=float) + 100
+    return pd.DataFrame({c: close for c in ['open', 'high', 'low', 'close', 'volume']}, index=index)
+
+
+def sum_close(market):
+    from utils.data_utils import get_recent_candles
+    arrays = shared_candles.get_shared_columns(market, candle_store.DAYS, ['close'])
+    frame = get_recent_candles(market, 5)
+    return float(arrays['close'].sum()), frame['close'].tolist(), len(get_recent_candles(market, 0))
+
+
+def test_workers_attach_published_candles(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # 저장소에 있는 시장(memmap)과 CSV로만 있는 시장(공유 메모리)
+    candle_store.write_candles('KRW-BTC', candle_store.DAYS, make_candles(20))
+    os.makedirs('data/daily_candles')
+    make_candles(20).to_csv('data/daily_candles/daily_candles_KRW-ETH.csv')
+
+    with shared_candles.publish_candles(['KRW-BTC', 'KRW-ETH'], [candle_store.DAYS]) as shared:
+        assert shared.catalog[('KRW-BTC', 'days')]['kind'] == 'memmap'
+        assert shared.catalog[('KRW-ETH', 'days')]['kind'] == 'shm'
+
+        with ProcessPoolExecutor(2, initializer=shared_candles.init_worker, initargs=(shared.catalog,)) as executor:
+            results = list(executor.map(sum_close, ['KRW-BTC', 'KRW-ETH']))
+
+    expected = float(make_candles(20)['close'].sum())
+    for total, recent, empty in results:
+        assert total == expected
+        assert recent == [115.0, 116.0, 117.0, 118.0, 119.0]
+        assert empty == 0
+
+
+def test_attached_arrays_are_read_only(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data/daily_candles')
+    make_candles(5).to_csv('data/daily_candles/daily_candles_KRW-ETH.csv')
+
+    with shared_candles.publish_candles(['KRW-ETH'], [candle_store.DAYS]) as shared:
+        arrays = shared_candles.attach_candles(shared.catalog[('KRW-ETH', 'days')], ['close'])
+        with pytest.raises(ValueError):
+            arrays['close'][0] = 0.0
+        del arrays
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
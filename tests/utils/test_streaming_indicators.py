@@ -0,0 +1,91 @@
+from utils import streaming_indicators as si
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def make_candles(rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(rng.normal(0, 0.02, rows).cumsum())
+    return pd.DataFrame({
+        'open': close * (1 + rng.normal(0, 0.005, rows)),
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.random(rows) * 100,
+    }, index=pd.date_range('2024-01-01', periods=rows, freq='h'))
+
+
+@pytest.mark.parametrize('indicator, expected', [
+    (lambda: si.SMA(20, min_periods=1), lambda df: df['close'].rolling(20, min_periods=1).mean()),
+    (lambda: si.SMA(20), lambda df: df['close'].rolling(20).mean()),
+    (lambda: si.VolumeMean(5), lambda df: df['volume'].rolling(5).mean()),
+    (lambda: si.EMA(12), lambda df: df['close'].ewm(span=12, adjust=False).mean()),
+    (lambda: si.RollingStd(20), lambda df: df['close'].rolling(20).std()),
+])
+def test_single_value_indicators_match_pandas(indicator, expected):
+    df = make_candles()
+    ind = indicator()
+    head = ind.init(df.iloc[:50])
+    values = [ind.update(row) for _, row in df.iloc[50:].iterrows()]
+
+    reference = expected(df).to_numpy()
+    np.testing.assert_allclose(head, reference[:50], rtol=1e-12)
+    np.testing.assert_allclose(values, reference[50:], rtol=1e-9)
+
+
+def test_bollinger_and_macd_match_pandas():
+    df = make_candles()
+    bollinger = si.Bollinger(20, 2)
+    macd = si.MACD(12, 26, 9)
+    bollinger.init(df.iloc[:100])
+    macd.init(df.iloc[:100])
+    bands = np.array([bollinger.update(row) for _, row in df.iloc[100:].iterrows()])
+    lines = np.array([macd.update(row) for _, row in df.iloc[100:].iterrows()])
+
+    middle = df['close'].rolling(20).mean()
+    std = df['close'].rolling(20).std()
+    np.testing.assert_allclose(bands[:, 1], (middle + 2 * std).iloc[100:], rtol=1e-9)
+    np.testing.assert_allclose(bands[:, 2], (middle - 2 * std).iloc[100:], rtol=1e-9)
+
+    macd_line = df['close'].ewm(span=12, adjust=False).mean() - df['close'].ewm(span=26, adjust=False).mean()
+    signal_line = macd_line.ewm(span=9, adjust=False).mean()
+    np.testing.assert_allclose(lines[:, 0], macd_line.iloc[100:], rtol=1e-9)
+    np.testing.assert_allclose(lines[:, 1], signal_line.iloc[100:], rtol=1e-9)
+
+
+def test_true_range_matches_pandas():
+    df = make_candles()
+    tr = si.TrueRange()
+    head = tr.init(df.iloc[:10])
+    values = [tr.update(row) for _, row in df.iloc[10:].iterrows()]
+
+    previous_close = df['close'].shift(1)
+    expected = pd.concat([df['high'] - df['low'], (df['high'] - previous_close).abs(),
+                          (df['low'] - previous_close).abs()], axis=1).max(axis=1)
+    np.testing.assert_allclose(np.concatenate([head, values]), expected, rtol=1e-12)
+
+
+def test_replace_updates_forming_candle():
+    df = make_candles(60)
+    sma = si.SMA(5)
+    std = si.RollingStd(5)
+    ema = si.EMA(5)
+    for ind in (sma, std, ema):
+        ind.init(df.iloc[:-1])
+        ind.update(df['close'].iloc[-1] * 1.5)  # 형성 중이던 값
+        ind.update(df['close'].iloc[-1], replace=True)  # 확정 값으로 교체
+
+    assert sma.value == pytest.approx(df['close'].rolling(5).mean().iloc[-1], rel=1e-12)
+    assert std.value == pytest.approx(df['close'].rolling(5).std().iloc[-1], rel=1e-9)
+    assert ema.value == pytest.approx(df['close'].ewm(span=5, adjust=False).mean().iloc[-1], rel=1e-12)
+
+
+if __name__ == "__main__":
+    pytest.main(['-s'])
@@ -4,32 +4,37 @@
 이 모듈은 다양한 유틸리티 함수와 헬퍼를 제공합니다:
 - 재시도 메커니즘이 있는 데이터 가져오기용 API 헬퍼.
 - 백테스트 지표 계산.
+- 신호 기반 공통 백테스트 엔진.
 - 백테스트 결과 저장 함수.
 - 텔레그램 메시지 기능.
 """
 
 from .api_helpers import fetch_latest_data_with_retry
+from .backtest_engine import backtest_strategy, CostModel
 from .backtest_metrics import (
     calculate_cumulative_return,
     calculate_mdd,
     calculate_win_rate
 )
 from .data_utils import get_recent_candles, get_minute_candles_from_file
-from .save_results import save_market_backtest_result, save_backtest_results
+from .save_results import save_market_backtest_result, load_market_backtest_result, save_backtest_results
 from .telegram import send_telegram_message
 
 __all__ = [
     # api_helpers
     "fetch_latest_data_with_retry",
 
+    # backtest_engine
+    "backtest_strategy", "CostModel",
+
     # backtest_metrics
     "calculate_cumulative_return", "calculate_mdd", "calculate_win_rate",
 
     # data_utils
-    "get_recent_candles", "get_minute_candles_from_file"
+    "get_recent_candles", "get_minute_candles_from_file",
 
     # save_results
-    "save_market_backtest_result", "save_backtest_results",
+    "save_market_backtest_result", "load_market_backtest_result", "save_backtest_results",
 
     # telegram
     "send_telegram_message",
@@ -1,6 +1,6 @@
-import asyncio
 import requests
 from api.upbit_api import get_daily_candles
+from api.rate_limiter import call_with_rate_limit
 
 
 class DataFetchError(Exception):
@@ -10,16 +10,10 @@ class DataFetchError(Exception):
 
 
 async def fetch_latest_data_with_retry(market, count=5, delay=2):
-    for _ in range(3):  # 최대 3번 재시도
-        try:
-            df = get_daily_candles(market, count)
-            return df
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:  # Too Many Requests
-                print(
-                    f"Rate limit exceeded for {market}. Retrying in {delay} seconds..."
-                )
-                await asyncio.sleep(delay)
-            else:
-                raise e
-    raise DataFetchError(f"Failed to retrieve data for {market} after 3 retries.")
+    try:
+        # 공유 제한기로 요청 속도를 맞추고, 429 응답이면 delay초부터 늘려가며 최대 3번 재시도
+        return await call_with_rate_limit(get_daily_candles, market, count, retries=3, backoff=delay)
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code == 429:  # Too Many Requests
+            raise DataFetchError(f"Failed to retrieve data for {market} after 3 retries.") from e
+        raise
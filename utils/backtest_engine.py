@@ -0,0 +1,175 @@
+"""
+utils/backtest_engine.py
+
+positions 신호로 보유 수량, 현금, 평가금액을 계산하는 공통 백테스트 엔진.
+
+매수(positions == 1)는 현금의 investment_fraction만큼 종가에 매수하고,
+매도(positions == -1)는 보유 수량 전부를 매도 가격(기본값 종가)에 팝니다.
+
+상태(현금, 수량)는 신호가 있는 행에서만 바뀌므로 신호 행만 순서대로 계산하고,
+나머지 행은 직전 신호의 상태를 배열 연산으로 이어 붙입니다.
+행마다 계산하던 기존 루프와 같은 순서로 연산하므로 결과가 비트 단위로 같습니다.
+
+거래 비용(CostModel)을 주면 신호 행의 체결 가격에만 수수료와 슬리피지를 반영하므로
+행마다 추가되는 파이썬 연산은 없습니다. 비용이 없으면(기본값) 기존 결과와 같습니다.
+"""
+
+import numpy as np
+
+
+class CostModel:
+    """
+    거래 비용 모델.
+
+    체결 가격 = 기준 가격 × (1 ± 비용 비율), 비용 비율 = 수수료 + 고정 슬리피지 + 거래량 비례 슬리피지.
+    거래량 비례 슬리피지는 volume_slippage × (주문 수량 / 그 캔들의 거래량)이며,
+    거래량이 없거나 0인 캔들에서는 적용하지 않습니다.
+
+    :param fee_bps: 수수료 (bp, 0.01%)
+    :param slippage_bps: 고정 슬리피지 (bp)
+    :param volume_slippage: 거래량 대비 주문 비율에 곱하는 슬리피지 계수
+    """
+
+    def __init__(self, fee_bps=0, slippage_bps=0, volume_slippage=0):
+        self.fee_bps = fee_bps
+        self.slippage_bps = slippage_bps
+        self.volume_slippage = volume_slippage
+
+    @property
+    def is_zero(self):
+        return self.fee_bps == 0 and self.slippage_bps == 0 and self.volume_slippage == 0
+
+    def rate(self, quantity, volume):
+        """ 주문 하나의 비용 비율 """
+        rate = (self.fee_bps + self.slippage_bps) / 10000
+        if self.volume_slippage and volume > 0:
+            rate += self.volume_slippage * quantity / volume
+        return rate
+
+    def buy_price(self, price, quantity, volume):
+        return price * (1 + self.rate(quantity, volume))
+
+    def sell_price(self, price, quantity, volume):
+        return price * (1 - self.rate(quantity, volume))
+
+    def __repr__(self):
+        return f"CostModel(fee_bps={self.fee_bps}, slippage_bps={self.slippage_bps}, volume_slippage={self.volume_slippage})"
+
+
+# 업비트 원화 마켓 수수료 0.05%
+UPBIT_COSTS = CostModel(fee_bps=5)
+
+# 자금 계산이나 지표 산출 방식이 바뀌면 올린다 (utils.result_cache의 이전 결과 무효화)
+ENGINE_VERSION = 1
+
+
+def simulate_events(close, positions, initial_capital, investment_fraction=0.2, sell_price=None, costs=None,
+                    volume=None, initial_shares=0):
+    """
+    신호 행에서만 현금과 보유 수량을 갱신하는 함수 (simulate_positions의 상태 계산 부분).
+
+    첫 행의 신호는 무시합니다. initial_capital/initial_shares에 이전 실행의 마지막 상태를 넘기면
+    그 뒤 구간만 이어서 계산할 수 있습니다 (backtest.incremental_backtest).
+
+    :param initial_shares: 시작 시점의 보유 수량
+    :return: (state, event_shares, event_cash) - 행별 상태 번호와 상태별 보유 수량, 현금
+             (행 i의 수량은 event_shares[state[i]])
+    """
+    if costs is not None and costs.is_zero:
+        costs = None
+    close = np.asarray(close, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64)
+    sell_price = close if sell_price is None else np.asarray(sell_price, dtype=np.float64)
+    rows = len(close)
+
+    events = np.flatnonzero((positions[1:] == 1) | (positions[1:] == -1)) + 1
+
+    # 신호 행에서만 상태를 갱신 (0번 상태는 초기값)
+    event_shares = np.empty(len(events) + 1)
+    event_cash = np.empty(len(events) + 1)
+    event_shares[0] = initial_shares
+    event_cash[0] = initial_capital
+
+    cash = initial_capital
+    shares = initial_shares
+    close_values = close[events].tolist()
+    sell_values = sell_price[events].tolist()
+    volume_values = np.asarray(volume, dtype=np.float64)[events].tolist() if volume is not None else [0] * len(events)
+    for k, buy in enumerate((positions[events] == 1).tolist(), start=1):
+        if buy:  # 매수 신호
+            investment = cash * investment_fraction
+            price = close_values[k - 1]
+            if costs is not None:
+                price = costs.buy_price(price, investment / price, volume_values[k - 1])
+            shares += investment / price
+            cash -= investment
+        else:  # 매도 신호
+            price = sell_values[k - 1]
+            if costs is not None:
+                price = costs.sell_price(price, shares, volume_values[k - 1])
+            cash += shares * price
+            shares = 0
+        event_shares[k] = shares
+        event_cash[k] = cash
+
+    # 각 행에 직전 신호의 상태를 채운다
+    marker = np.zeros(rows, dtype=np.int64)
+    marker[events] = np.arange(1, len(events) + 1)
+    state = np.maximum.accumulate(marker) if rows else marker
+    return state, event_shares, event_cash
+
+
+def simulate_positions(close, positions, initial_capital, investment_fraction=0.2, sell_price=None,
+                       costs=None, volume=None):
+    """
+    positions 신호에 따른 행별 보유 평가금액, 현금, 총액을 계산하는 함수.
+
+    첫 행의 신호는 무시합니다 (기존 루프가 1번 행부터 시작).
+
+    :param close: 종가 배열 (매수 가격, 평가 가격)
+    :param positions: 신호 배열 (1: 매수, -1: 매도, 그 외: 유지)
+    :param initial_capital: 초기 자본
+    :param investment_fraction: 매수 시 현금 대비 투자 비율
+    :param sell_price: 행별 매도 가격 배열 (None이면 종가)
+    :param costs: CostModel (None이면 비용 없음)
+    :param volume: 행별 거래량 배열 (거래량 비례 슬리피지용)
+    :return: (holdings, cash, total) float64 배열
+    """
+    close = np.asarray(close, dtype=np.float64)
+    state, event_shares, event_cash = simulate_events(
+        close, positions, initial_capital, investment_fraction, sell_price, costs, volume
+    )
+
+    holdings = event_shares[state] * close
+    cash_values = event_cash[state]
+    total = holdings + cash_values
+
+    if len(close):
+        holdings[0] = 0.0
+        total[0] = float(initial_capital)
+    return holdings, cash_values, total
+
+
+def backtest_strategy(df, initial_capital, investment_fraction=0.2, sell_price=None, costs=None):
+    """
+    생성된 신호를 기반으로 간단한 백테스트를 수행하는 함수
+
+    :param df: 신호(positions)와 종가(close)가 있는 데이터프레임 (volume 컬럼이 있으면 거래량 비례 슬리피지에 사용)
+    :param initial_capital: 초기 자본
+    :param investment_fraction: 매수 시 투자 비율
+    :param sell_price: 행별 매도 가격 배열 (None이면 종가)
+    :param costs: CostModel (None이면 비용 없음)
+    :return: holdings, cash, total, returns 컬럼이 추가된 데이터프레임
+    """
+    volume = df['volume'].to_numpy() if 'volume' in df.columns else None
+    holdings, cash, total = simulate_positions(
+        df['close'].to_numpy(), df['positions'].to_numpy(), initial_capital, investment_fraction, sell_price,
+        costs, volume
+    )
+    df['holdings'] = holdings
+    df['cash'] = cash
+    df['total'] = total
+
+    df['returns'] = df['total'].pct_change()
+
+    return df
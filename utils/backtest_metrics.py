@@ -1,3 +1,5 @@
+import numpy as np
+
 
 def calculate_cumulative_return(df, initial_capital):
     """
@@ -46,3 +48,38 @@ def calculate_win_rate(df):
     else:
         win_rate = wins / total_trades * 100
     return win_rate
+
+
+def cumulative_return_array(total, initial_capital):
+    """ calculate_cumulative_return의 배열 버전 (total: 평가금액 배열) """
+    return (total[-1] / initial_capital - 1) * 100
+
+
+def mdd_array(total):
+    """ calculate_mdd의 배열 버전 (NaN은 건너뜀) """
+    total = np.asarray(total, dtype=np.float64)
+    peak = np.fmax.accumulate(total)
+    drawdown = total / peak - 1
+    if np.isnan(drawdown).all():
+        return np.nan
+    return np.nanmin(drawdown) * 100
+
+
+def win_rate_array(positions, total):
+    """
+    calculate_win_rate의 배열 버전.
+
+    positions가 0이 아닌 행(NaN 포함) 사이의 평가금액 변화 중 매도 행에서 이익인 비율입니다.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    total = np.asarray(total, dtype=np.float64)
+    trades = positions != 0
+    trade_positions = positions[trades]
+    trade_returns = np.diff(total[trades], prepend=np.nan)
+
+    sells = trade_positions == -1
+    total_trades = int(sells.sum())
+    if total_trades == 0:
+        return 0
+    wins = int((sells & (trade_returns > 0)).sum())
+    return wins / total_trades * 100
@@ -0,0 +1,120 @@
+"""
+utils/candle_cache.py
+
+프로세스 전역 캔들 데이터프레임 캐시.
+
+backtest.py처럼 같은 시장의 캔들을 여러 번 읽는 경우 파일을 한 번만 파싱하도록
+(시장, 타임프레임, 파일 수정 시각)을 키로 데이터프레임을 보관합니다.
+메모리 한도를 넘으면 가장 오래 사용하지 않은 항목부터 제거하고,
+파일이 바뀌면 수정 시각이 달라지므로 새로 읽습니다.
+
+캐시된 데이터프레임의 값은 읽기 전용이므로 호출자는 컬럼을 추가하거나
+sort_index() 등으로 만든 복사본만 수정해야 합니다.
+"""
+
+import os
+import json
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from utils.candle_store import get_csv_path, get_store_path, has_candles, read_candles
+
+# 캐시 메모리 한도 (바이트)
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+_cache = OrderedDict()
+_cache_bytes = 0
+_lock = threading.Lock()
+
+
+def _source_path(market, timeframe):
+    """ 저장소가 있으면 meta.json, 없으면 CSV 파일 경로 """
+    if has_candles(market, timeframe):
+        return os.path.join(get_store_path(market, timeframe), "meta.json")
+    return get_csv_path(market, timeframe)
+
+
+def get_data_version(market, timeframe):
+    """
+    캔들 데이터의 버전 (파일이 바뀌면 달라지는 값).
+
+    저장소는 meta.json의 수정 시각과 행 수, CSV는 파일 수정 시각과 크기를 사용합니다.
+    """
+    path = _source_path(market, timeframe)
+    stat = os.stat(path)
+    if has_candles(market, timeframe):
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)["rows"]
+        return (stat.st_mtime_ns, rows)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _load_frame(market, timeframe):
+    """ 파일 전체를 읽어 읽기 전용 데이터프레임으로 만듭니다 """
+    if has_candles(market, timeframe):
+        df = read_candles(market, timeframe)
+    else:
+        df = pd.read_csv(get_csv_path(market, timeframe), index_col=0, parse_dates=True)
+        df = df.sort_index()
+
+    # 하나의 float 블록으로 만들고 쓰기를 막는다
+    values = np.ascontiguousarray(df.to_numpy(dtype=np.float64).T)
+    values.flags.writeable = False
+    frame = pd.DataFrame(values.T, index=df.index, columns=df.columns, copy=False)
+    return frame
+
+
+def _frame_bytes(frame):
+    return int(frame.memory_usage(index=True).sum())
+
+
+def get_candle_frame(market, timeframe):
+    """
+    캐시된 캔들 데이터프레임을 반환하는 함수 (없으면 파일을 읽어 캐시).
+
+    :param market: 시장 코드 (예: 'KRW-BTC')
+    :param timeframe: 타임프레임 (예: 'days', 'minutes_60')
+    :return: 날짜 순으로 정렬된 읽기 전용 데이터프레임
+    """
+    global _cache_bytes
+
+    mtime = os.stat(_source_path(market, timeframe)).st_mtime_ns
+    key = (market, timeframe, mtime)
+
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    frame = _load_frame(market, timeframe)
+    size = _frame_bytes(frame)
+
+    with _lock:
+        # 같은 시장/타임프레임의 이전 버전은 더 이상 쓰이지 않는다
+        for stale in [k for k in _cache if k[:2] == (market, timeframe)]:
+            _cache_bytes -= _frame_bytes(_cache.pop(stale))
+
+        _cache[key] = frame
+        _cache_bytes += size
+
+        while _cache_bytes > MAX_CACHE_BYTES and len(_cache) > 1:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= _frame_bytes(evicted)
+
+    return frame
+
+
+def clear_candle_cache():
+    """ 캐시를 비웁니다 """
+    global _cache_bytes
+    with _lock:
+        _cache.clear()
+        _cache_bytes = 0
+
+
+def get_cache_info():
+    """ 캐시 항목 수와 사용 중인 바이트 수 """
+    with _lock:
+        return {"entries": len(_cache), "bytes": _cache_bytes}
@@ -0,0 +1,151 @@
+"""
+utils/candle_coverage.py
+
+시장/타임프레임별 캔들 커버리지 인덱스.
+
+저장소의 date 컬럼을 기대 간격(일봉 1일, 60분봉 1시간)과 비교해
+빠진 구간(gap)을 벡터 연산으로 찾고 coverage.json에 기록합니다.
+새 캔들이 추가되면 마지막으로 확인한 시각 이후만 다시 검사합니다.
+
+업비트는 체결이 없던 구간의 캔들을 만들지 않으므로, 다시 요청해도 비어 있던 구간은
+empty로 기록하여 이후에는 요청하지 않습니다.
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from utils.candle_store import DAYS, WEEKS, get_store_path, has_candles, read_columns, read_meta
+
+NS_PER_MINUTE = 60 * 1_000_000_000
+
+
+def get_timeframe_step(timeframe):
+    """ 타임프레임의 캔들 간격 (나노초) """
+    if timeframe == DAYS:
+        return 1440 * NS_PER_MINUTE
+    if timeframe == WEEKS:
+        return 7 * 1440 * NS_PER_MINUTE
+    return int(timeframe.split("_")[1]) * NS_PER_MINUTE
+
+
+def find_gaps(dates, step):
+    """
+    정렬된 date 배열에서 빠진 구간을 찾는 함수.
+
+    :param dates: int64 나노초 배열 (오름차순)
+    :param step: 기대 간격 (나노초)
+    :return: [[빠진 첫 시각, 빠진 마지막 시각], ...] (나노초)
+    """
+    dates = np.asarray(dates, dtype=np.int64)
+    if len(dates) < 2:
+        return []
+    diffs = np.diff(dates)
+    idx = np.nonzero(diffs > step)[0]
+    starts = dates[idx] + step
+    ends = dates[idx + 1] - step
+    return [[int(s), int(e)] for s, e in zip(starts, ends)]
+
+
+def _coverage_path(market, timeframe):
+    return os.path.join(get_store_path(market, timeframe), "coverage.json")
+
+
+def load_coverage(market, timeframe):
+    """ 저장된 커버리지 인덱스 (없으면 None) """
+    path = _coverage_path(market, timeframe)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_coverage(market, timeframe, coverage):
+    path = _coverage_path(market, timeframe)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(coverage, f)
+    os.replace(tmp_path, path)
+
+
+def _summarize(coverage, step):
+    """ 기대 캔들 수와 실제 캔들 수를 함께 기록합니다 """
+    missing = sum((end - start) // step + 1 for start, end in coverage["gaps"] + coverage["empty"])
+    coverage["expected"] = coverage["rows"] + int(missing)
+    return coverage
+
+
+def build_coverage(market, timeframe):
+    """
+    date 컬럼 전체를 검사해 커버리지 인덱스를 새로 만드는 함수.
+
+    :return: {"first", "last", "rows", "expected", "gaps", "empty"} (시각은 나노초)
+    """
+    step = get_timeframe_step(timeframe)
+    dates = read_columns(market, timeframe, columns=["date"])["date"]
+    previous = load_coverage(market, timeframe) or {}
+
+    gaps = find_gaps(dates, step)
+    # 이미 비어 있는 것으로 확인된 구간은 gap에서 제외
+    empty = [gap for gap in previous.get("empty", []) if gap in gaps]
+    coverage = {
+        "first": int(dates[0]) if len(dates) else None,
+        "last": int(dates[-1]) if len(dates) else None,
+        "rows": int(len(dates)),
+        "gaps": [gap for gap in gaps if gap not in empty],
+        "empty": empty,
+    }
+    coverage = _summarize(coverage, step)
+    _save_coverage(market, timeframe, coverage)
+    return coverage
+
+
+def update_coverage(market, timeframe):
+    """
+    커버리지 인덱스를 증분 갱신하는 함수.
+
+    마지막으로 확인한 시각 이후의 date만 읽어 새 gap을 덧붙입니다.
+    첫 캔들이 바뀌었거나 그 이전 구간의 행 수가 달라진 경우(백필, gap 복구 등)에는
+    전체를 다시 검사합니다.
+    """
+    if not has_candles(market, timeframe):
+        return None
+
+    coverage = load_coverage(market, timeframe)
+    rows = read_meta(market, timeframe)["rows"]
+    if coverage is None or coverage["last"] is None or rows < coverage["rows"]:
+        return build_coverage(market, timeframe)
+
+    step = get_timeframe_step(timeframe)
+    dates = read_columns(market, timeframe, columns=["date"])["date"]
+    if len(dates) == 0 or int(dates[0]) != coverage["first"]:
+        return build_coverage(market, timeframe)
+
+    start = int(np.searchsorted(dates, coverage["last"], side="left"))
+    if start >= len(dates) or int(dates[start]) != coverage["last"]:
+        return build_coverage(market, timeframe)
+    if start + 1 != coverage["rows"]:
+        return build_coverage(market, timeframe)
+
+    coverage["gaps"] += find_gaps(dates[start:], step)
+    coverage["last"] = int(dates[-1])
+    coverage["rows"] = int(len(dates))
+    coverage = _summarize(coverage, step)
+    _save_coverage(market, timeframe, coverage)
+    return coverage
+
+
+def mark_empty(market, timeframe, gap):
+    """ 다시 요청해도 캔들이 없던 구간을 empty로 옮깁니다 """
+    coverage = load_coverage(market, timeframe)
+    if coverage is None or gap not in coverage["gaps"]:
+        return
+    coverage["gaps"].remove(gap)
+    coverage["empty"].append(gap)
+    _save_coverage(market, timeframe, coverage)
+
+
+def describe_gaps(coverage):
+    """ gap 목록을 사람이 읽을 수 있는 Timestamp 쌍으로 변환합니다 """
+    return [(pd.Timestamp(start), pd.Timestamp(end)) for start, end in coverage["gaps"]]
@@ -0,0 +1,390 @@
+"""
+utils/candle_store.py
+
+캔들 데이터를 컬럼 단위 바이너리 파일로 저장하는 저장소.
+
+CSV 대신 시장/타임프레임별 디렉터리에 컬럼마다 하나의 raw 파일
+(date: int64, 나머지: float64)을 두고, meta.json에 행 수와 컬럼 타입을 기록합니다.
+필요한 컬럼만 memmap으로 열기 때문에 'close'만 쓰는 전략은 다른 컬럼을 읽지 않습니다.
+
+    data/store/{timeframe}/{market}/date.bin
+    data/store/{timeframe}/{market}/open.bin ...
+    data/store/{timeframe}/{market}/meta.json
+
+새 데이터는 append_candles로 겹치는 꼬리 구간만 병합해 추가하므로
+갱신 비용은 전체 이력이 아니라 새 캔들 수에 비례합니다.
+
+meta.json의 epoch는 기존 이력이 바뀔 때(전체 교체, 마지막 캔들보다 앞쪽을 덮어쓰는 병합) 증가합니다.
+마지막 캔들 교체와 덧붙이기로는 바뀌지 않으므로, 이전 실행의 상태를 이어 쓰는 쪽
+(backtest.incremental_backtest)은 epoch가 같으면 처리한 구간이 그대로라고 볼 수 있습니다.
+
+기존 CSV 이전: python3 -m utils.candle_store
+"""
+
+import os
+import sys
+import json
+import shutil
+import numpy as np
+import pandas as pd
+
+STORE_DIR = "data/store"
+
+DAYS = "days"
+
+WEEKS = "weeks"
+
+# 저장되는 컬럼과 타입 (date는 KST 기준 tz-naive datetime64[ns]의 int64 값)
+COLUMNS = {
+    "date": "int64",
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "volume": "float64",
+}
+
+PRICE_COLUMNS = [column for column in COLUMNS if column != "date"]
+
+# 이전 대상 타임프레임
+MIGRATE_TIMEFRAMES = [DAYS, "minutes_60"]
+
+# 저장소 디렉터리에 함께 두는 부가 파일 (write_candles로 전체를 교체해도 유지)
+# - coverage.json: utils.candle_coverage (empty로 확인된 구간)
+# - resample.json: utils.resample (마지막으로 묶은 원본 구간)
+SIDECAR_FILES = ["coverage.json", "resample.json"]
+
+
+def minutes_timeframe(unit):
+    """ 분봉 단위에 해당하는 타임프레임 이름 (예: 60 -> 'minutes_60') """
+    return f"minutes_{unit}"
+
+
+def get_csv_path(market, timeframe):
+    """ 저장소 도입 이전에 사용하던 CSV 파일 경로 """
+    if timeframe == DAYS:
+        return f"data/daily_candles/daily_candles_{market}.csv"
+    unit = timeframe.split("_")[1]
+    return f"data/minutes_candles/minutes_candles_{market}_{unit}.csv"
+
+
+def get_store_path(market, timeframe):
+    """ 시장/타임프레임의 저장 디렉터리 경로 """
+    return os.path.join(STORE_DIR, timeframe, market)
+
+
+def has_candles(market, timeframe):
+    """ 저장소에 해당 시장의 데이터가 있는지 확인합니다 """
+    return os.path.exists(os.path.join(get_store_path(market, timeframe), "meta.json"))
+
+
+def read_meta(market, timeframe):
+    """ meta.json을 읽어 딕셔너리로 반환합니다 """
+    with open(os.path.join(get_store_path(market, timeframe), "meta.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_epoch(market, timeframe):
+    """ 이력 변경 번호 (epoch가 없던 이전 저장소는 0) """
+    return read_meta(market, timeframe).get("epoch", 0)
+
+
+def _write_meta(path, meta):
+    """ meta.json을 임시 파일에 쓴 뒤 교체하여 원자적으로 갱신합니다 (임시 파일은 프로세스별) """
+    tmp_path = os.path.join(path, f"meta.json.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(path, "meta.json"))
+
+
+def _column_path(path, column):
+    return os.path.join(path, f"{column}.bin")
+
+
+def _journal_path(path, column=None):
+    if column is None:
+        return os.path.join(path, "journal.json")
+    return os.path.join(path, f"{column}.journal")
+
+
+def _replay_journal(path):
+    """
+    꼬리 구간 덮어쓰기 도중 중단된 경우 저널을 다시 적용합니다.
+
+    저널(journal.json)이 기록된 시점에 꼬리 데이터는 이미 {column}.journal에 있으므로
+    몇 번을 다시 적용해도 결과가 같습니다. 쓰기 경로(append_candles)에서만 호출하며
+    (읽기는 _read_journal로 메모리에서만 덮어씀), 다른 프로세스가 먼저 적용해
+    저널이 이미 지워졌으면 그대로 돌아갑니다.
+    """
+    try:
+        with open(_journal_path(path), encoding="utf-8") as f:
+            journal = json.load(f)
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+
+        offset = journal["offset"]
+        tails = {}
+        for name in meta["columns"]:
+            with open(_journal_path(path, name), "rb") as src:
+                tails[name] = src.read()
+    except FileNotFoundError:
+        return
+
+    for name, dtype in meta["columns"].items():
+        itemsize = np.dtype(dtype).itemsize
+        with open(_column_path(path, name), "r+b") as dst:
+            dst.seek(offset * itemsize)
+            dst.write(tails[name])
+            dst.truncate()
+
+    meta["rows"] = journal["rows"]
+    _write_meta(path, meta)
+
+    for journal_file in [_journal_path(path)] + [_journal_path(path, name) for name in meta["columns"]]:
+        try:
+            os.remove(journal_file)
+        except FileNotFoundError:
+            pass
+
+
+def _read_journal(path, columns):
+    """
+    아직 적용되지 않은 저널을 읽는 함수 (파일은 바꾸지 않음).
+
+    :param path: 저장소 디렉터리
+    :param columns: {컬럼: dtype}
+    :return: (offset, rows, {컬럼: 꼬리 배열}) (저널이 없거나 그 사이 적용이 끝났으면 None)
+    """
+    try:
+        with open(_journal_path(path), encoding="utf-8") as f:
+            journal = json.load(f)
+        tails = {name: np.fromfile(_journal_path(path, name), dtype=dtype) for name, dtype in columns.items()}
+    except FileNotFoundError:
+        return None
+    return journal["offset"], journal["rows"], tails
+
+
+def _frame_to_columns(df):
+    """ OHLCV 데이터프레임을 저장용 컬럼 배열 딕셔너리로 변환합니다 """
+    df = df.sort_index()
+    df = df[~df.index.duplicated(keep="last")]
+
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_convert("Asia/Seoul").tz_localize(None)
+
+    columns = {"date": index.values.astype("datetime64[ns]").view("int64")}
+    for column in PRICE_COLUMNS:
+        columns[column] = df[column].to_numpy(dtype=COLUMNS[column])
+    return columns
+
+
+def _columns_to_frame(columns):
+    """ 컬럼 배열 딕셔너리를 date 인덱스의 데이터프레임으로 변환합니다 """
+    dates = columns.pop("date")
+    index = pd.DatetimeIndex(np.asarray(dates).view("datetime64[ns]"), name="date")
+    return pd.DataFrame({name: np.asarray(values) for name, values in columns.items()}, index=index)
+
+
+def read_columns(market, timeframe, columns=None, start=None, stop=None):
+    """
+    필요한 컬럼만 memmap으로 읽어 배열 딕셔너리로 반환하는 함수.
+
+    :param market: 시장 코드 (예: 'KRW-BTC')
+    :param timeframe: 타임프레임 (예: 'days', 'minutes_60')
+    :param columns: 읽을 컬럼 목록 (None이면 전체, 'date'는 항상 포함)
+    :param start: 시작 행 (슬라이스 규칙, 음수 가능)
+    :param stop: 끝 행 (슬라이스 규칙)
+    :return: {컬럼: 읽기 전용 배열}
+    """
+    path = get_store_path(market, timeframe)
+    meta = read_meta(market, timeframe)
+    rows = meta["rows"]
+
+    names = ["date"] + [c for c in (columns or PRICE_COLUMNS) if c != "date"]
+    result = {}
+
+    # 꼬리 덮어쓰기가 적용 중이거나 중단된 경우: 컬럼 파일에는 새/옛 꼬리가 섞여 있을 수 있으므로
+    # offset 앞부분만 파일에서 읽고 그 뒤는 저널의 꼬리로 덮어 일관된 결과를 돌려준다
+    journal = _read_journal(path, {name: meta["columns"][name] for name in names})
+    if journal is not None:
+        offset, rows, tails = journal
+        for name in names:
+            dtype = meta["columns"][name]
+            head = np.memmap(_column_path(path, name), dtype=dtype, mode="r", shape=(offset,)) if offset else []
+            values = np.concatenate([np.asarray(head, dtype=dtype), tails[name]])[:rows]
+            values.flags.writeable = False
+            result[name] = values[start:stop]
+        return result
+
+    for name in names:
+        dtype = meta["columns"][name]
+        if rows == 0:
+            result[name] = np.empty(0, dtype=dtype)
+            continue
+        values = np.memmap(_column_path(path, name), dtype=dtype, mode="r", shape=(rows,))
+        result[name] = values[start:stop]
+    return result
+
+
+def read_candles(market, timeframe, columns=None, start=None, stop=None):
+    """
+    저장소에서 캔들 데이터를 데이터프레임으로 읽는 함수.
+
+    :param market: 시장 코드 (예: 'KRW-BTC')
+    :param timeframe: 타임프레임 (예: 'days', 'minutes_60')
+    :param columns: 읽을 컬럼 목록 (None이면 전체)
+    :param start: 시작 행 (슬라이스 규칙, 음수 가능)
+    :param stop: 끝 행 (슬라이스 규칙)
+    :return: date 인덱스의 Pandas DataFrame
+    """
+    return _columns_to_frame(read_columns(market, timeframe, columns, start, stop))
+
+
+def read_last_date(market, timeframe):
+    """ 저장된 마지막 캔들의 날짜 (데이터가 없으면 None) """
+    if not has_candles(market, timeframe):
+        return None
+    dates = read_columns(market, timeframe, columns=["date"], start=-1)["date"]
+    if len(dates) == 0:
+        return None
+    return pd.Timestamp(int(dates[0]))
+
+
+def search_row(market, timeframe, date):
+    """ date 이상인 첫 번째 행 번호를 이진 탐색으로 찾습니다 """
+    dates = read_columns(market, timeframe, columns=["date"])["date"]
+    value = pd.Timestamp(date)
+    if value.tzinfo is not None:
+        value = value.tz_convert("Asia/Seoul").tz_localize(None)
+    return int(np.searchsorted(dates, value.value, side="left"))
+
+
+def write_candles(market, timeframe, df):
+    """
+    데이터프레임 전체를 저장소에 기록하는 함수 (기존 데이터 교체).
+
+    새 디렉터리에 모두 쓴 뒤 교체하므로 중간에 실패해도 기존 데이터는 유지됩니다.
+    부가 파일(SIDECAR_FILES)은 새 디렉터리로 복사해 교체 후에도 남깁니다.
+
+    :param market: 시장 코드
+    :param timeframe: 타임프레임
+    :param df: date 인덱스의 OHLCV 데이터프레임
+    """
+    path = get_store_path(market, timeframe)
+    tmp_path = path + ".tmp"
+    old_path = path + ".old"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    columns = _frame_to_columns(df)
+    for name, values in columns.items():
+        values.tofile(_column_path(tmp_path, name))
+    epoch = read_epoch(market, timeframe) + 1 if has_candles(market, timeframe) else 0
+    _write_meta(tmp_path, {"rows": len(columns["date"]), "columns": COLUMNS, "epoch": epoch})
+    for name in SIDECAR_FILES:
+        if os.path.exists(os.path.join(path, name)):
+            shutil.copy2(os.path.join(path, name), os.path.join(tmp_path, name))
+
+    if os.path.exists(path):
+        shutil.rmtree(old_path, ignore_errors=True)
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def append_candles(market, timeframe, df):
+    """
+    새 캔들을 저장소에 증분 추가하는 함수.
+
+    새 데이터의 첫 날짜 이후에 있는 기존 행(보통 아직 형성 중이던 마지막 캔들)만 읽어
+    새 데이터와 병합하고, 그 위치부터 파일 끝까지만 다시 씁니다.
+    기존 행과 겹치지 않으면 파일 끝에 덧붙이기만 합니다.
+
+    :param market: 시장 코드
+    :param timeframe: 타임프레임
+    :param df: date 인덱스의 OHLCV 데이터프레임
+    :return: 저장 후 전체 행 수
+    """
+    if df.empty:
+        return read_meta(market, timeframe)["rows"] if has_candles(market, timeframe) else 0
+
+    if not has_candles(market, timeframe):
+        write_candles(market, timeframe, df)
+        return len(df.index.unique())
+
+    path = get_store_path(market, timeframe)
+    _replay_journal(path)
+    meta = read_meta(market, timeframe)
+    rows = meta["rows"]
+
+    df = _columns_to_frame(_frame_to_columns(df))  # 정렬, 중복 제거, tz-naive 변환
+    new_columns = _frame_to_columns(df)
+    stored_dates = read_columns(market, timeframe, columns=["date"])["date"]
+    offset = int(np.searchsorted(stored_dates, new_columns["date"][0], side="left"))
+
+    if offset < rows:
+        # 겹치는 꼬리 구간만 읽어 새 데이터로 덮어쓰며 병합
+        tail = read_candles(market, timeframe, start=offset)
+        merged = pd.concat([tail, df[PRICE_COLUMNS]])
+        new_columns = _frame_to_columns(merged)
+
+    new_rows = offset + len(new_columns["date"])
+
+    if offset == rows:
+        # 겹치는 구간이 없으면 덧붙인 뒤 meta.json 갱신으로 확정
+        for name, values in new_columns.items():
+            with open(_column_path(path, name), "r+b") as f:
+                f.seek(rows * values.itemsize)
+                f.write(values.tobytes())
+                f.truncate()
+        meta["rows"] = new_rows
+        _write_meta(path, meta)
+        return new_rows
+
+    if offset < rows - 1:
+        # 마지막 캔들보다 앞쪽(빠진 구간 채우기 등)이 바뀌므로 이력 변경으로 기록
+        meta["epoch"] = meta.get("epoch", 0) + 1
+        _write_meta(path, meta)
+
+    # 꼬리 구간 덮어쓰기는 저널에 먼저 기록한 뒤 적용하여 원자적으로 처리
+    for name, values in new_columns.items():
+        values.tofile(_journal_path(path, name))
+    tmp_path = _journal_path(path) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"offset": offset, "rows": new_rows}, f)
+    os.replace(tmp_path, _journal_path(path))
+    _replay_journal(path)
+    return new_rows
+
+
+def migrate_csv(market, timeframe):
+    """
+    기존 CSV 파일을 저장소로 이전하는 함수.
+
+    :param market: 시장 코드
+    :param timeframe: 타임프레임 (예: 'days', 'minutes_60')
+    :return: 이전 여부
+    """
+    csv_path = get_csv_path(market, timeframe)
+    if not os.path.exists(csv_path):
+        return False
+
+    df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+    write_candles(market, timeframe, df)
+    print(f"Migrated {csv_path} -> {get_store_path(market, timeframe)} ({len(df)} rows)")
+    return True
+
+
+def migrate_all(markets):
+    """ 여러 시장의 일봉/60분봉 CSV를 한 번에 이전합니다 """
+    for market in markets:
+        for timeframe in MIGRATE_TIMEFRAMES:
+            migrate_csv(market, timeframe)
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from coins import coin_list
+
+    migrate_all(sys.argv[1].split(",") if len(sys.argv) > 1 else coin_list)
@@ -1,45 +1,96 @@
 import pandas as pd
 from datetime import datetime
 
-def get_recent_candles(market, count):
+from utils.candle_store import DAYS
+from utils.candle_cache import get_candle_frame
+from utils import shared_candles
+
+
+def get_recent_candles(market, count, columns=None):
     """
     지정된 시장의 최근 일봉 데이터를 가져오는 함수.
 
+    파일은 프로세스당 한 번만 읽고(utils.candle_cache), 캐시된 데이터의 읽기 전용 뷰를 반환합니다.
+    공유 카탈로그가 설정된 워커 프로세스에서는 공유 배열에서 필요한 구간만 가져옵니다.
+
     :param market: 시장 코드 (예: 'KRW-BTC')
     :param count: 가져올 데이터의 개수
+    :param columns: 가져올 컬럼 목록 (None이면 전체). 캐시는 여러 전략이 함께 쓰도록 전체 컬럼을 한 번 읽어 두므로
+                    여기서는 반환하는 뷰만 좁힙니다 (파일 읽기는 줄지 않음, 공유 배열에서는 이 컬럼만 복사).
+                    읽기 자체를 줄이려면 utils.candle_store.read_columns를 직접 사용합니다.
     :return: 최근 일봉 데이터가 포함된 Pandas DataFrame
     """
-    file_path = f'data/daily_candles/daily_candles_{market}.csv'
+    if shared_candles.has_shared(market, DAYS):
+        # count가 0이면 -0 슬라이스가 전체가 되므로 빈 구간으로 맞춘다
+        start, stop = (-count, None) if count > 0 else (0, 0)
+        return shared_candles.get_shared_frame(market, DAYS, columns, start=start, stop=stop)
 
-    df = pd.read_csv(file_path, index_col=0, parse_dates=True)
+    df = get_candle_frame(market, DAYS)
 
     recent_data = df.tail(count)
+    if columns is not None:
+        recent_data = recent_data[columns]
 
     return recent_data
 
-def get_minute_candles_from_file(ticker, count, start_date):
+def get_minute_candles_from_file(ticker, count, start_date, columns=None):
     """
     파일에서 분봉 데이터를 가져오는 함수.
 
     :param ticker: 티커 (예: 'KRW-BTC')
     :param count: 가져올 데이터의 개수
     :param start_date: 시작 날짜
+    :param columns: 가져올 컬럼 목록 (None이면 전체)
     :return: 분봉 데이터가 포함된 Pandas DataFrame
     """
-    file_path = f'data/minutes_candles/minutes_candles_{ticker}_60.csv'
-
-    df = pd.read_csv(file_path, index_col=0, parse_dates=True)
-    df = df.sort_index()  # 날짜 순으로 정렬
-
     # start_date를 tz-naive로 변환
     if start_date.tzinfo is not None:
         start_date = start_date.replace(tzinfo=None)
 
+    if shared_candles.has_shared(ticker, 'minutes_60'):
+        dates = shared_candles.get_shared_columns(ticker, 'minutes_60', ['date'])['date']
+        start = int(dates.searchsorted(pd.Timestamp(start_date).value, side='left'))
+        stop = start + count if count else None
+        return shared_candles.get_shared_frame(ticker, 'minutes_60', columns, start=start, stop=stop)
+
+    df = get_candle_frame(ticker, 'minutes_60')  # 날짜 순으로 정렬되어 있음
+
     # 시작 날짜 이후의 데이터 필터링
-    df_filtered = df[df.index >= start_date]
+    start = df.index.searchsorted(pd.Timestamp(start_date), side='left')
+    df_filtered = df.iloc[start:]
 
     # 가져올 데이터의 개수 제한
     if count:
         df_filtered = df_filtered.head(count)
 
+    if columns is not None:
+        df_filtered = df_filtered[columns]
+
     return df_filtered
+
+
+def get_candle_rows(market, timeframe, start=None, stop=None, columns=None):
+    """
+    행 번호 구간으로 캔들 데이터를 가져오는 함수 (워크 포워드 등 구간 단위 작업용).
+
+    :param market: 시장 코드
+    :param timeframe: 타임프레임
+    :param start: 시작 행 (슬라이스 규칙)
+    :param stop: 끝 행 (슬라이스 규칙)
+    :param columns: 가져올 컬럼 목록 (None이면 전체)
+    :return: date 인덱스의 Pandas DataFrame
+    """
+    if shared_candles.has_shared(market, timeframe):
+        return shared_candles.get_shared_frame(market, timeframe, columns, start=start, stop=stop)
+
+    df = get_candle_frame(market, timeframe).iloc[start:stop]
+    if columns is not None:
+        df = df[columns]
+    return df
+
+
+def get_candle_count(market, timeframe):
+    """ 사용할 수 있는 캔들 행 수 """
+    if shared_candles.has_shared(market, timeframe):
+        return len(shared_candles.get_shared_columns(market, timeframe, ['date'])['date'])
+    return len(get_candle_frame(market, timeframe))
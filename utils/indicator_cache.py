@@ -0,0 +1,141 @@
+"""
+utils/indicator_cache.py
+
+전략 간에 공유하는 프로세스 전역 지표 캐시.
+
+같은 시장/구간에서 여러 전략이 같은 지표(예: 종가 5일 이동평균)를 쓰면
+(시장, 타임프레임, 데이터 버전, 구간, 지표, 파라미터)를 키로 한 번만 계산합니다.
+캔들 파일이 바뀌면 데이터 버전이 달라지므로 이전 버전의 항목은 제거됩니다.
+
+지원 지표 (모두 기존 전략 코드의 pandas 계산과 같은 값):
+- sma: rolling(window, min_periods).mean()
+- std: rolling(window, min_periods).std()
+- ema: ewm(span=window, adjust=False).mean()
+- range: 전일 고가 - 전일 저가 (high.shift(1) - low.shift(1))
+"""
+
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from utils import shared_candles
+from utils.candle_cache import get_data_version
+
+# 캐시 메모리 한도 (바이트)
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+_cache = OrderedDict()
+_cache_bytes = 0
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _sma(arrays, column, window, min_periods=1):
+    return pd.Series(arrays[column]).rolling(window=window, min_periods=min_periods).mean().to_numpy()
+
+
+def _std(arrays, column, window, min_periods=None):
+    return pd.Series(arrays[column]).rolling(window=window, min_periods=min_periods).std().to_numpy()
+
+
+def _ema(arrays, column, window):
+    return pd.Series(arrays[column]).ewm(span=window, adjust=False).mean().to_numpy()
+
+
+def _range(arrays):
+    value_range = np.full(len(arrays["high"]), np.nan)
+    value_range[1:] = np.asarray(arrays["high"][:-1]) - np.asarray(arrays["low"][:-1])
+    return value_range
+
+
+INDICATORS = {
+    "sma": _sma,
+    "std": _std,
+    "ema": _ema,
+    "range": _range,
+}
+
+
+def make_cache_key(market, timeframe, candles):
+    """
+    지표 캐시의 데이터 키를 만드는 함수.
+
+    min_periods 등으로 값이 구간 시작에 따라 달라지므로 구간(첫 시각, 행 수)도 포함합니다.
+
+    :param market: 시장 코드
+    :param timeframe: 타임프레임
+    :param candles: 지표를 계산할 date 인덱스의 캔들 데이터프레임
+    :return: (시장, 타임프레임, 데이터 버전, 구간)
+    """
+    if shared_candles.has_shared(market, timeframe):
+        # 워커의 공유 데이터는 공개 시점의 행 수로 고정되어 있다
+        version = ("shared", shared_candles.get_shared_columns(market, timeframe, ["date"])["date"].shape[0])
+    else:
+        version = get_data_version(market, timeframe)
+    span = (int(candles.index[0].value), len(candles)) if len(candles) else (None, 0)
+    return (market, timeframe, version, span)
+
+
+def compute_indicator(arrays, name, *params):
+    """ 캐시 없이 지표를 계산합니다 """
+    return INDICATORS[name](arrays, *params)
+
+
+def get_indicator(arrays, name, *params, cache_key=None):
+    """
+    캐시된 지표를 반환하는 함수 (없으면 계산해 캐시).
+
+    :param arrays: {컬럼: 배열} 캔들 데이터
+    :param name: 지표 이름 (INDICATORS의 키)
+    :param params: 지표 파라미터 (예: 'close', 5)
+    :param cache_key: make_cache_key 결과 (None이면 캐시하지 않음)
+    :return: 읽기 전용 지표 배열
+    """
+    global _cache_bytes
+
+    if cache_key is None:
+        return compute_indicator(arrays, name, *params)
+
+    key = cache_key + (name, params)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return _cache[key]
+        _stats["misses"] += 1
+
+    values = compute_indicator(arrays, name, *params)
+    values.flags.writeable = False
+
+    with _lock:
+        market, timeframe, version = cache_key[:3]
+        # 같은 시장/타임프레임의 이전 데이터 버전은 더 이상 쓰이지 않는다
+        for stale in [k for k in _cache if k[:2] == (market, timeframe) and k[2] != version]:
+            _cache_bytes -= _cache.pop(stale).nbytes
+
+        if key not in _cache:
+            _cache[key] = values
+            _cache_bytes += values.nbytes
+
+        while _cache_bytes > MAX_CACHE_BYTES and len(_cache) > 1:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= evicted.nbytes
+
+    return values
+
+
+def clear_indicator_cache():
+    """ 캐시와 통계를 비웁니다 """
+    global _cache_bytes
+    with _lock:
+        _cache.clear()
+        _cache_bytes = 0
+        _stats["hits"] = 0
+        _stats["misses"] = 0
+
+
+def get_indicator_cache_info():
+    """ 캐시 항목 수, 바이트 수, 적중/미적중 횟수 """
+    with _lock:
+        return {"entries": len(_cache), "bytes": _cache_bytes, **_stats}
@@ -0,0 +1,182 @@
+"""
+utils/resample.py
+
+저장된 60분봉으로 더 긴 타임프레임의 캔들을 만드는 리샘플링 단계.
+
+업비트 캔들 경계(KST 09:00 = UTC 00:00)에 맞춰 묶습니다.
+- minutes_240: 01/05/09/13/17/21시 시작 4시간봉
+- minutes_720: 09/21시 시작 12시간봉
+- days: KST 09:00 시작 일봉
+- weeks: 월요일 KST 09:00 시작 주봉
+
+파생 타임프레임은 API를 호출하지 않고 저장소(utils.candle_store)에 기록되며,
+다시 실행하면 마지막 버킷부터 새 캔들이 들어온 버킷만 다시 계산합니다.
+
+실행: python3 -m utils.resample [타임프레임1,타임프레임2,...]
+"""
+
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+
+from utils.candle_store import (
+    WEEKS, PRICE_COLUMNS, append_candles, get_store_path, has_candles, read_columns, write_candles
+)
+from utils.candle_coverage import get_timeframe_step
+
+# 리샘플링의 원본 타임프레임 (저장소의 가장 짧은 타임프레임)
+SOURCE_TIMEFRAME = "minutes_60"
+
+# 기본으로 만드는 파생 타임프레임
+# 일봉은 진행 중인 당일 캔들이 필요한 전략이 있어 기본적으로 API에서 가져온다
+DERIVED_TIMEFRAMES = ["minutes_240", "minutes_720", WEEKS]
+
+# 버킷 기준 시각: 1970-01-05(월) KST 09:00
+ORIGIN = pd.Timestamp("1970-01-05 09:00").value
+
+
+def get_bucket_starts(dates, timeframe):
+    """
+    각 캔들 시각이 속하는 버킷의 시작 시각을 계산하는 함수.
+
+    :param dates: int64 나노초 배열 (KST tz-naive)
+    :param timeframe: 파생 타임프레임
+    :return: 버킷 시작 시각 배열 (int64 나노초)
+    """
+    step = get_timeframe_step(timeframe)
+    dates = np.asarray(dates, dtype=np.int64)
+    return ORIGIN + (dates - ORIGIN) // step * step
+
+
+def resample_columns(columns, timeframe):
+    """
+    OHLCV 컬럼 배열을 파생 타임프레임으로 묶는 함수.
+
+    :param columns: {컬럼: 배열} (date 오름차순)
+    :param timeframe: 파생 타임프레임
+    :return: 버킷별로 묶인 {컬럼: 배열}
+    """
+    dates = np.asarray(columns["date"])
+    if len(dates) == 0:
+        return {name: np.asarray(values)[:0] for name, values in columns.items()}
+
+    buckets = get_bucket_starts(dates, timeframe)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.append(starts[1:], len(dates)) - 1
+
+    return {
+        "date": buckets[starts],
+        "open": np.asarray(columns["open"])[starts],
+        "high": np.maximum.reduceat(np.asarray(columns["high"]), starts),
+        "low": np.minimum.reduceat(np.asarray(columns["low"]), starts),
+        "close": np.asarray(columns["close"])[ends],
+        "volume": np.add.reduceat(np.asarray(columns["volume"]), starts),
+    }
+
+
+def resample_candles(df, timeframe):
+    """
+    date 인덱스의 OHLCV 데이터프레임을 파생 타임프레임으로 묶는 함수.
+
+    :param df: 오래된 순으로 정렬된 OHLCV 데이터프레임 (KST tz-naive)
+    :param timeframe: 파생 타임프레임 (예: 'minutes_240', 'days', 'weeks')
+    :return: 버킷 시작 시각 인덱스의 데이터프레임
+    """
+    columns = {"date": pd.DatetimeIndex(df.index).values.astype("datetime64[ns]").view("int64")}
+    for name in PRICE_COLUMNS:
+        columns[name] = df[name].to_numpy(dtype=np.float64)
+
+    result = resample_columns(columns, timeframe)
+    index = pd.DatetimeIndex(result.pop("date").view("datetime64[ns]"), name="date")
+    return pd.DataFrame(result, index=index)
+
+
+def _state_path(market, timeframe):
+    return os.path.join(get_store_path(market, timeframe), "resample.json")
+
+
+def _load_state(market, timeframe):
+    path = _state_path(market, timeframe)
+    if not has_candles(market, timeframe) or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_state(market, timeframe, state):
+    path = _state_path(market, timeframe)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def resample_market(market, timeframe, source=SOURCE_TIMEFRAME):
+    """
+    한 시장의 파생 타임프레임을 증분 갱신하는 함수.
+
+    이전 실행에서 본 원본의 마지막 캔들까지 행 수가 그대로이면
+    파생 캔들의 마지막 버킷 시작 이후의 원본만 읽어 다시 묶고 덧붙입니다.
+    과거 구간이 바뀌었으면(백필, gap 복구 등) 전체를 다시 만듭니다.
+
+    :param market: 시장 코드
+    :param timeframe: 파생 타임프레임
+    :param source: 원본 타임프레임
+    :return: 다시 계산한 버킷 수
+    """
+    if not has_candles(market, source):
+        return 0
+
+    dates = read_columns(market, source, columns=["date"])["date"]
+    if len(dates) == 0:
+        return 0
+
+    state = _load_state(market, timeframe)
+    start = 0
+    if state is not None and state["source"] == source:
+        last_row = int(np.searchsorted(dates, state["source_last"], side="left"))
+        unchanged = (
+            last_row < len(dates)
+            and int(dates[last_row]) == state["source_last"]
+            and last_row + 1 == state["source_rows"]
+            and int(dates[0]) == state["source_first"]
+        )
+        if unchanged:
+            # 마지막 버킷은 아직 형성 중이었을 수 있으므로 그 시작부터 다시 묶는다
+            bucket = int(get_bucket_starts(dates[last_row:last_row + 1], timeframe)[0])
+            start = int(np.searchsorted(dates, bucket, side="left"))
+
+    result = resample_columns(read_columns(market, source, start=start), timeframe)
+    index = pd.DatetimeIndex(result.pop("date").view("datetime64[ns]"), name="date")
+    df = pd.DataFrame(result, index=index)
+
+    if start == 0:
+        write_candles(market, timeframe, df)
+    else:
+        append_candles(market, timeframe, df)
+
+    _save_state(market, timeframe, {
+        "source": source,
+        "source_first": int(dates[0]),
+        "source_last": int(dates[-1]),
+        "source_rows": int(len(dates)),
+    })
+    return len(df)
+
+
+def resample_all(markets, timeframes=DERIVED_TIMEFRAMES, source=SOURCE_TIMEFRAME):
+    """ 여러 시장의 파생 타임프레임을 갱신합니다 """
+    for market in markets:
+        for timeframe in timeframes:
+            buckets = resample_market(market, timeframe, source)
+            print(f"Resampled {market} {source} -> {timeframe}: {buckets} buckets")
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from coins import coin_list
+
+    targets = sys.argv[1].split(",") if len(sys.argv) > 1 else DERIVED_TIMEFRAMES
+    resample_all(coin_list, targets)
@@ -0,0 +1,182 @@
+"""
+utils/result_cache.py
+
+입력 내용의 해시를 키로 하는 백테스트 결과 캐시.
+
+키는 sha256(캔들 데이터 바이트의 지문, 시장, 전략 식별자와 파라미터, 실행 설정, 엔진 버전)입니다.
+입력이 같으면 같은 키가 되므로 데이터나 전략이 바뀐 (시장, 전략)만 다시 계산하고,
+엔진 계산 방식이 바뀌면 utils.backtest_engine.ENGINE_VERSION을 올려 이전 결과를 모두 무효화합니다.
+
+- 프로세스 메모: 같은 프로세스에서 다시 찾으면 파일을 읽지 않음
+- 출력 파일: 결과와 함께 그때 쓴 파일의 경로와 내용 지문(file_fingerprint)을 저장하고,
+  다른 실행이 덮어쓰거나 지운 경우(files_unchanged가 False) 적중으로 보지 않음
+- 디스크: results/cache/{키 앞 2자}/{키}.pkl, 실행이 끝날 때 evict()로 전체 크기가 MAX_DISK_BYTES를 넘으면
+  오래 안 쓴 파일부터 삭제
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from utils.backtest_engine import ENGINE_VERSION
+
+CACHE_DIR = "results/cache"
+
+# 디스크 캐시 크기 한도 (바이트)
+MAX_DISK_BYTES = 64 * 1024 * 1024
+
+# 프로세스 메모 항목 수 한도
+MAX_MEMO_ENTRIES = 4096
+
+_memo = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+
+def data_fingerprint(candles):
+    """
+    캔들 데이터 바이트의 sha256 지문.
+
+    :param candles: date 인덱스의 캔들 데이터프레임
+    :return: 16진수 문자열
+    """
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(candles.index.values.astype("datetime64[ns]")).tobytes())
+    for column in candles.columns:
+        digest.update(column.encode())
+        digest.update(np.ascontiguousarray(candles[column].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def make_result_key(fingerprint, market, strategy, **settings):
+    """
+    결과 캐시 키를 만드는 함수.
+
+    :param fingerprint: data_fingerprint 결과
+    :param market: 시장 코드 (결과 딕셔너리에 들어가므로 키에 포함)
+    :param strategy: Strategy (클래스 경로, 결과 이름, 파라미터가 키에 들어감)
+    :param settings: 그 밖에 결과에 영향을 주는 설정 (예: count, initial_capital, costs)
+    :return: 16진수 문자열
+    """
+    strategy_id = f"{type(strategy).__module__}.{type(strategy).__qualname__}:{strategy.results_name}"
+    payload = json.dumps(
+        [ENGINE_VERSION, fingerprint, market, strategy_id, strategy.params, settings],
+        sort_keys=True, default=repr,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def file_fingerprint(path):
+    """ 파일 내용의 sha256 (파일이 없으면 None) """
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def files_unchanged(files):
+    """
+    캐시할 때 기록한 출력 파일이 모두 그때 내용 그대로 있는지 확인하는 함수.
+
+    :param files: {경로: file_fingerprint 결과}
+    :return: 모두 같으면 True (파일이 없으면 True)
+    """
+    return all(file_fingerprint(path) == digest for path, digest in files.items())
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.pkl")
+
+
+def get_result(key):
+    """ 캐시된 결과 (없으면 None) """
+    with _lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            _stats["hits"] += 1
+            return _memo[key]
+
+    path = _cache_path(key)
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+        os.utime(path)  # 최근 사용 시각 (삭제 순서 기준)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        with _lock:
+            _stats["misses"] += 1
+        return None
+
+    with _lock:
+        _stats["disk_hits"] += 1
+        _remember(key, value)
+    return value
+
+
+def put_result(key, value):
+    """ 결과를 메모와 디스크에 저장합니다 """
+    with _lock:
+        _remember(key, value)
+
+    path = _cache_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def _remember(key, value):
+    _memo[key] = value
+    _memo.move_to_end(key)
+    while len(_memo) > MAX_MEMO_ENTRIES:
+        _memo.popitem(last=False)
+
+
+def evict(max_bytes=None):
+    """
+    디스크 캐시가 한도를 넘으면 오래 안 쓴 파일부터 삭제하는 함수.
+
+    :param max_bytes: 크기 한도 (None이면 MAX_DISK_BYTES)
+    :return: 삭제한 파일 수
+    """
+    max_bytes = MAX_DISK_BYTES if max_bytes is None else max_bytes
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+
+    entries = []
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            if name.endswith(".pkl"):
+                stat = os.stat(os.path.join(root, name))
+                entries.append((stat.st_mtime_ns, stat.st_size, os.path.join(root, name)))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+        removed += 1
+    return removed
+
+
+def clear_result_cache(disk=False):
+    """ 메모와 통계를 비웁니다 (disk=True이면 디스크 캐시도 삭제) """
+    with _lock:
+        _memo.clear()
+        for name in _stats:
+            _stats[name] = 0
+    if disk:
+        evict(0)
+
+
+def get_result_cache_info():
+    """ 메모 항목 수, 메모/디스크 적중, 미적중 횟수 """
+    with _lock:
+        return {"entries": len(_memo), **_stats}
@@ -0,0 +1,216 @@
+"""
+utils/results_db.py
+
+백테스트 결과를 실행(run) 단위로 쌓는 SQLite 저장소.
+
+save_backtest_results가 실행할 때마다 runs에 한 행, results에 시장별 한 행씩 추가합니다.
+CSV 백업 파일을 쌓는 대신 과거 실행도 여기서 (전략, 시장, 실행) 인덱스로 조회합니다.
+
+- runs: run_id, name (전략 결과 이름), count, params (JSON, 전략 파라미터와 실행 설정), created_at
+  실행 설정(run_params)은 initial_capital과 costs(거래 비용, 없으면 null)이므로 수수료를 뺀 실행과
+  비용 없는 실행을 구분할 수 있습니다.
+- results: run_id, strategy, market, count, investment_fraction, cumulative_return, win_rate, max_drawdown,
+  extra (그 밖의 결과 컬럼, JSON)
+"""
+
+import os
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+import pandas as pd
+
+DB_PATH = os.path.join("results", "backtest", "results.db")
+
+# 결과 딕셔너리 컬럼 → results 테이블 컬럼
+METRIC_COLUMNS = {
+    "Market": "market",
+    "Count": "count",
+    "Investment Fraction": "investment_fraction",
+    "Cumulative Return (%)": "cumulative_return",
+    "Win Rate (%)": "win_rate",
+    "Max Drawdown (%)": "max_drawdown",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    count INTEGER,
+    params TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    strategy TEXT NOT NULL,
+    market TEXT,
+    count INTEGER,
+    investment_fraction REAL,
+    cumulative_return REAL,
+    win_rate REAL,
+    max_drawdown REAL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_name ON runs(name, count, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS idx_results_strategy_market ON results(strategy, market, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_market ON results(market, run_id);
+"""
+
+
+def _to_python(value):
+    """ numpy 스칼라를 SQLite/JSON에 넣을 수 있는 값으로 바꿉니다 """
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def run_params(params=None, initial_capital=None, costs=None):
+    """
+    전략 파라미터에 결과에 영향을 주는 실행 설정을 더한 딕셔너리 (save_backtest_results의 params).
+
+    :param params: 전략 파라미터
+    :param initial_capital: 초기 자본
+    :param costs: utils.backtest_engine.CostModel (None이거나 비용이 0이면 null로 기록)
+    :return: 파라미터 딕셔너리
+    """
+    if costs is not None and costs.is_zero:
+        costs = None
+    return {**(params or {}), "initial_capital": initial_capital, "costs": dict(vars(costs)) if costs else None}
+
+
+def connect(db_path=None):
+    """ 스키마가 준비된 SQLite 연결을 반환합니다 """
+    db_path = db_path or DB_PATH
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def save_run(results_df, name, count, params=None, db_path=None):
+    """
+    한 번의 백테스트 실행 결과를 저장하는 함수.
+
+    :param results_df: 시장별 결과 데이터프레임 (save_backtest_results의 결과 컬럼)
+    :param name: 전략 결과 이름 (예: 'daily_average_5')
+    :param count: 데이터 개수
+    :param params: 전략 파라미터 딕셔너리 (선택)
+    :param db_path: DB 경로 (None이면 DB_PATH)
+    :return: run_id
+    """
+    extra_columns = [column for column in results_df.columns if column not in METRIC_COLUMNS]
+    rows = []
+    for record in results_df.to_dict("records"):
+        extra = {column: _to_python(record[column]) for column in extra_columns}
+        rows.append((name, *(_to_python(record.get(column)) for column in METRIC_COLUMNS),
+                     json.dumps(extra, default=_to_python) if extra else None))
+
+    with closing(connect(db_path)) as conn, conn:
+        cursor = conn.execute(
+            "INSERT INTO runs (name, count, params, created_at) VALUES (?, ?, ?, ?)",
+            (name, count, json.dumps(params, default=_to_python) if params else None,
+             datetime.now().isoformat(timespec="seconds")),
+        )
+        run_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO results (run_id, strategy, market, count, investment_fraction, cumulative_return,"
+            " win_rate, max_drawdown, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(run_id, *row) for row in rows],
+        )
+    return run_id
+
+
+def _results_frame(rows, columns):
+    """ 조회 결과를 save_backtest_results와 같은 컬럼 이름의 데이터프레임으로 만듭니다 """
+    df = pd.DataFrame(rows, columns=columns)
+    if "extra" in df.columns:
+        extra = pd.DataFrame([json.loads(value) if value else {} for value in df.pop("extra")], index=df.index)
+        df = pd.concat([df, extra], axis=1)
+    return df.rename(columns={value: key for key, value in METRIC_COLUMNS.items()})
+
+
+def _load_latest(conn, name, count=None):
+    """ 연결 하나로 전략 결과 이름의 가장 최근 실행 결과를 읽습니다 (없으면 None) """
+    query = "SELECT run_id FROM runs WHERE name = ?"
+    args = [name]
+    if count is not None:
+        query += " AND count = ?"
+        args.append(count)
+    run = conn.execute(query + " ORDER BY run_id DESC LIMIT 1", args).fetchone()
+    if run is None:
+        return None
+
+    columns = list(METRIC_COLUMNS.values()) + ["extra"]
+    rows = conn.execute(
+        f"SELECT {', '.join(columns)} FROM results WHERE run_id = ? ORDER BY rowid", run
+    ).fetchall()
+    return _results_frame(rows, columns)
+
+
+def load_latest(name, count=None, db_path=None):
+    """
+    전략 결과 이름의 가장 최근 실행 결과를 저장할 때의 행 순서대로 반환하는 함수.
+
+    :return: 결과 데이터프레임 (실행이 없으면 None)
+    """
+    return load_latest_many({name: name}, count, db_path)[name]
+
+
+def load_latest_many(names, count=None, db_path=None):
+    """
+    여러 전략 결과 이름의 가장 최근 실행 결과를 한 번의 연결로 읽는 함수.
+
+    :param names: {키: 전략 결과 이름} (예: {'golden_cross': 'golden_dead_cross'})
+    :param count: 데이터 개수 (None이면 전체)
+    :return: {키: 결과 데이터프레임 또는 None}
+    """
+    if not os.path.exists(db_path or DB_PATH):
+        return {key: None for key in names}
+
+    with closing(connect(db_path)) as conn:
+        return {key: _load_latest(conn, name, count) for key, name in names.items()}
+
+
+def query_results(strategy=None, market=None, count=None, since=None, db_path=None):
+    """
+    과거 실행 결과를 인덱스 조건으로 조회하는 함수.
+
+    :param strategy: 전략 결과 이름
+    :param market: 시장 코드
+    :param count: 데이터 개수
+    :param since: 이 시각(ISO 문자열 또는 datetime) 이후 실행만
+    :return: run_id, created_at, Strategy, params와 결과 컬럼의 데이터프레임 (오래된 실행부터)
+    """
+    conditions, args = [], []
+    for column, value in [("r.strategy", strategy), ("r.market", market), ("r.count", count)]:
+        if value is not None:
+            conditions.append(f"{column} = ?")
+            args.append(value)
+    if since is not None:
+        conditions.append("u.created_at >= ?")
+        args.append(since.isoformat(timespec="seconds") if isinstance(since, datetime) else since)
+
+    columns = ["run_id", "created_at", "strategy", "params"] + list(METRIC_COLUMNS.values()) + ["extra"]
+    select = ", ".join(f"u.{c}" if c in ("created_at", "params") else f"r.{c}" for c in columns)
+    query = f"SELECT {select} FROM results r JOIN runs u ON r.run_id = u.run_id"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+
+    with closing(connect(db_path)) as conn:
+        rows = conn.execute(query + " ORDER BY r.run_id, r.rowid", args).fetchall()
+    return _results_frame(rows, columns).rename(columns={"strategy": "Strategy"})
+
+
+def list_runs(name=None, db_path=None):
+    """ 실행 목록 (run_id, name, count, params, created_at) """
+    query = "SELECT run_id, name, count, params, created_at FROM runs"
+    args = []
+    if name is not None:
+        query += " WHERE name = ?"
+        args.append(name)
+    with closing(connect(db_path)) as conn:
+        rows = conn.execute(query + " ORDER BY run_id", args).fetchall()
+    return pd.DataFrame(rows, columns=["run_id", "name", "count", "params", "created_at"])
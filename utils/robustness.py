@@ -0,0 +1,150 @@
+"""
+utils/robustness.py
+
+백테스트 결과의 부트스트랩(몬테카를로) 강건성 분석.
+
+한 번의 백테스트가 만든 수익률을 복원 추출로 수천 개의 경로로 다시 만들고,
+경로별 누적 수익률, MDD, 승률의 분포와 신뢰구간을 계산합니다.
+경로는 (경로 수 × 길이) 2차원 배열 하나로 만들어 행 방향 누적 연산으로 한 번에 평가합니다.
+
+- bar 모드: 행별 평가금액 수익률을 재추출 (block_size > 1이면 연속 구간 단위로 재추출해 자기상관 유지)
+- trade 모드: 거래(매수 → 매도)별 수익률을 재추출
+"""
+
+import numpy as np
+
+# 신뢰구간 백분위 (하한, 중앙값, 상한)
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+# 한 번에 만드는 경로 수 (메모리 상한용)
+CHUNK_PATHS = 2000
+
+
+def bar_returns(total):
+    """ 평가금액 배열의 행별 수익률 (NaN 제외) """
+    total = np.asarray(total, dtype=np.float64)
+    returns = total[1:] / total[:-1] - 1
+    return returns[~np.isnan(returns)]
+
+
+def trade_returns(positions, total):
+    """
+    거래별 수익률 (매도 행의 평가금액 / 직전 신호 행의 평가금액 - 1).
+
+    win_rate_array와 같은 방식으로 거래를 구분하므로 수익률 > 0 비율이 승률과 같습니다.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    total = np.asarray(total, dtype=np.float64)
+    trades = positions != 0
+    trade_totals = total[trades]
+    ratios = np.full(len(trade_totals), np.nan)
+    ratios[1:] = trade_totals[1:] / trade_totals[:-1] - 1
+    ratios = ratios[positions[trades] == -1]
+    return ratios[~np.isnan(ratios)]
+
+
+def bootstrap_paths(returns, n_paths, length=None, block_size=1, rng=None):
+    """
+    수익률을 복원 추출해 (n_paths × length) 경로 배열을 만드는 함수.
+
+    :param returns: 원본 수익률 배열
+    :param n_paths: 경로 수
+    :param length: 경로 길이 (None이면 원본 길이)
+    :param block_size: 연속으로 추출할 구간 길이 (원형으로 이어 붙임)
+    :param rng: numpy Generator (None이면 새로 생성)
+    :return: 2차원 수익률 배열
+    """
+    if block_size < 1:
+        raise ValueError(f"block_size must be at least 1: {block_size}")
+    returns = np.asarray(returns, dtype=np.float64)
+    rng = rng or np.random.default_rng()
+    length = len(returns) if length is None else length
+    if len(returns) == 0 or length == 0:
+        return np.zeros((n_paths, length))
+
+    blocks = -(-length // block_size)
+    starts = rng.integers(0, len(returns), size=(n_paths, blocks))
+    index = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, -1)[:, :length]
+    return returns[index % len(returns)]
+
+
+def path_metrics(paths):
+    """
+    경로 배열의 누적 수익률, MDD, 승률을 계산하는 함수.
+
+    승률은 0이 아닌 수익률 중 이익인 비율입니다 (trade 모드에서는 거래 승률).
+
+    :param paths: (경로 수 × 길이) 수익률 배열
+    :return: {'Cumulative Return (%)', 'Max Drawdown (%)', 'Win Rate (%)': 경로별 배열}
+    """
+    equity = np.cumprod(1 + paths, axis=1)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1)
+    drawdown = np.minimum((equity / peak - 1).min(axis=1, initial=0), 0)
+
+    active = paths != 0
+    counts = active.sum(axis=1)
+    wins = (paths > 0).sum(axis=1)
+    win_rate = np.divide(wins, counts, out=np.zeros(len(paths)), where=counts > 0) * 100
+
+    final = equity[:, -1] if paths.shape[1] else np.ones(len(paths))
+    return {
+        "Cumulative Return (%)": (final - 1) * 100,
+        "Max Drawdown (%)": drawdown * 100,
+        "Win Rate (%)": win_rate,
+    }
+
+
+def confidence_intervals(values, percentiles=DEFAULT_PERCENTILES):
+    """ 분포의 평균과 백분위 값 {'mean', 'p5', 'p50', 'p95'} """
+    values = np.asarray(values, dtype=np.float64)
+    result = {"mean": float(values.mean())}
+    for percentile, value in zip(percentiles, np.percentile(values, percentiles)):
+        result[f"p{percentile:g}"] = float(value)
+    return result
+
+
+def bootstrap_metrics(returns, n_paths=2000, length=None, block_size=1, seed=None, percentiles=DEFAULT_PERCENTILES):
+    """
+    수익률 부트스트랩으로 지표 분포의 신뢰구간을 계산하는 함수.
+
+    경로는 CHUNK_PATHS개씩 만들어 메모리 사용량을 제한합니다.
+
+    :param returns: bar_returns 또는 trade_returns 결과
+    :param n_paths: 경로 수
+    :param length: 경로 길이 (None이면 원본 길이)
+    :param block_size: 연속 추출 구간 길이
+    :param seed: 난수 시드
+    :param percentiles: 신뢰구간 백분위
+    :return: {지표: {'mean', 'p5', 'p50', 'p95'}}
+    """
+    if n_paths < 1:
+        raise ValueError(f"n_paths must be at least 1: {n_paths}")
+    rng = np.random.default_rng(seed)
+    chunks = []
+    for start in range(0, n_paths, CHUNK_PATHS):
+        paths = bootstrap_paths(returns, min(CHUNK_PATHS, n_paths - start), length, block_size, rng)
+        chunks.append(path_metrics(paths))
+
+    return {
+        name: confidence_intervals(np.concatenate([chunk[name] for chunk in chunks]), percentiles)
+        for name in chunks[0]
+    }
+
+
+def bootstrap_backtest(positions, total, mode="bar", n_paths=2000, block_size=1, seed=None,
+                       percentiles=DEFAULT_PERCENTILES):
+    """
+    백테스트 결과(positions, total)의 강건성 분석.
+
+    :param positions: 신호 배열
+    :param total: 평가금액 배열
+    :param mode: 'bar' (행별 수익률) 또는 'trade' (거래별 수익률)
+    :return: {지표: {'mean', 'p5', 'p50', 'p95'}}
+    """
+    if mode == "bar":
+        returns = bar_returns(total)
+    elif mode == "trade":
+        returns = trade_returns(positions, total)
+    else:
+        raise ValueError(f"Unknown bootstrap mode: {mode}")
+    return bootstrap_metrics(returns, n_paths, block_size=block_size, seed=seed, percentiles=percentiles)
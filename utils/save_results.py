@@ -1,11 +1,35 @@
 import os
-import shutil
+import numpy as np
 import pandas as pd
-from datetime import datetime
 
-def save_market_backtest_result(market, df, count, name, check_ma=False, check_volume=False):
+from utils.results_db import run_params, save_run
+
+# 시장별 결과 저장 방식
+# - csv: 모든 컬럼의 CSV (기존 형식)
+# - npz: 컬럼별 압축 배열 (load_market_backtest_result로 필요한 컬럼만 읽음)
+# - equity: 평가금액 곡선과 거래 목록 CSV만
+# - none: 저장하지 않음
+STORAGE_MODES = ("csv", "npz", "equity", "none")
+
+# equity 저장 방식의 거래 목록 컬럼 (있는 것만)
+TRADE_COLUMNS = ["close", "positions", "holdings", "cash", "total"]
+
+
+def check_storage_mode(storage):
+    """ 알 수 없는 저장 방식이면 ValueError (작업을 예약하기 전에 한 번 확인) """
+    if storage not in STORAGE_MODES:
+        raise ValueError(f"Unknown storage mode: {storage} (expected one of {', '.join(STORAGE_MODES)})")
+
+
+def get_market_result_path(market, count, name, check_ma=False, check_volume=False, suffix=".csv"):
+    """ 시장 백테스트 결과 파일 경로 """
+    output_dir = f'results/backtest/{name}_{"checkMA_" if check_ma else ""}{"checkVolume_" if check_volume else ""}backtest'
+    return os.path.join(output_dir, f'{name}_{market}_{count}{suffix}')
+
+
+def save_market_backtest_result(market, df, count, name, check_ma=False, check_volume=False, storage="csv"):
     """
-    시장 백테스트 결과를 CSV 파일로 저장하는 함수.
+    시장 백테스트 결과를 파일로 저장하는 함수.
 
     :param market: 가상화폐 시장 코드
     :param df: 데이터프레임 (백테스트 결과)
@@ -13,21 +37,100 @@ def save_market_backtest_result(market, df, count, name, check_ma=False, check_v
     :param name: 백테스트 이름
     :param check_ma: 이동 평균 확인 여부
     :param check_volume: 거래량 평균 확인 여부
+    :param storage: 저장 방식 (STORAGE_MODES: 'csv', 'npz', 'equity', 'none')
+    :return: 저장한 파일 경로 목록
     """
+    check_storage_mode(storage)
+    if storage == "none":
+        return []
 
-    output_dir = f'results/backtest/{name}_{"checkMA_" if check_ma else ""}{"checkVolume_" if check_volume else ""}backtest'
+    output_file = get_market_result_path(market, count, name, check_ma, check_volume)
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, f'{name}_{market}_{count}.csv')
-    df.to_csv(output_file, index=True)
+    if storage == "csv":
+        df.to_csv(output_file, index=True)
+        return [output_file]
+
+    if storage == "npz":
+        output_file = get_market_result_path(market, count, name, check_ma, check_volume, ".npz")
+        index = pd.DatetimeIndex(df.index)
+        np.savez_compressed(
+            output_file, date=index.values.astype("datetime64[ns]").view("int64"),
+            **{column: df[column].to_numpy() for column in df.columns}
+        )
+        return [output_file]
+
+    # equity: 평가금액 곡선과 거래(positions가 0이 아닌 행) 목록만
+    equity_file = get_market_result_path(market, count, name, check_ma, check_volume, "_equity.csv")
+    trades_file = get_market_result_path(market, count, name, check_ma, check_volume, "_trades.csv")
+    df[["total"]].to_csv(equity_file, index=True)
+    trades = df[df["positions"].notna() & (df["positions"] != 0)]
+    trades[[column for column in TRADE_COLUMNS if column in df.columns]].to_csv(trades_file, index=True)
+    return [equity_file, trades_file]
+
+
+def load_market_backtest_result(market, count, name, check_ma=False, check_volume=False, columns=None):
+    """
+    저장된 시장 백테스트 결과를 필요한 컬럼만 읽는 함수.
+
+    저장 방식별 파일 중 가장 최근에 저장된 것을 읽습니다.
+    npz 파일은 요청한 컬럼만 압축을 풀고, CSV는 해당 컬럼만 파싱합니다.
+    equity 방식으로 저장된 경우에는 평가금액 곡선(total)만 있습니다.
 
-def save_backtest_results(results, count, name):
+    :param columns: 읽을 컬럼 목록 (None이면 전체)
+    :return: date 인덱스의 데이터프레임 (저장된 결과가 없으면 None)
+    :raises ValueError: 읽은 파일에 요청한 컬럼이 없을 때 (저장 방식과 관계없이 같음)
+    """
+    paths = [
+        get_market_result_path(market, count, name, check_ma, check_volume, suffix)
+        for suffix in [".npz", ".csv", "_equity.csv"]
+    ]
+    paths = [path for path in paths if os.path.exists(path)]
+    if not paths:
+        return None
+    path = max(paths, key=os.path.getmtime)
+
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            available = [column for column in data.files if column != "date"]
+            _check_columns(path, available, columns)
+            names = available if columns is None else columns
+            index = pd.DatetimeIndex(data["date"].view("datetime64[ns]"), name="date")
+            return pd.DataFrame({column: data[column] for column in names}, index=index)
+
+    usecols = None
+    if columns is not None:
+        header = list(pd.read_csv(path, nrows=0).columns)
+        _check_columns(path, header[1:], columns)
+        usecols = header[:1] + list(columns)
+    return pd.read_csv(path, index_col=0, parse_dates=True, usecols=usecols)
+
+
+def _check_columns(path, available, columns):
+    """ 요청한 컬럼이 저장된 파일에 모두 있는지 확인 """
+    missing = [column for column in columns or [] if column not in available]
+    if missing:
+        raise ValueError(f"Columns {missing} are not stored in '{path}' (available: {available})")
+
+
+def load_market_trades(market, count, name, check_ma=False, check_volume=False):
+    """ equity 방식으로 저장된 거래 목록 (없으면 None) """
+    trades_file = get_market_result_path(market, count, name, check_ma, check_volume, "_trades.csv")
+    if not os.path.exists(trades_file):
+        return None
+    return pd.read_csv(trades_file, index_col=0, parse_dates=True)
+
+
+def save_backtest_results(results, count, name, params=None):
     """
     백테스트 결과를 저장하는 함수
 
+    결과는 결과 DB(utils.results_db)에 실행 단위로 쌓고, 최신 결과 CSV는 덮어씁니다.
+
     :param results: 백테스트 결과 리스트
     :param count: 데이터 개수
     :param name: 결과 파일 이름에 사용할 문자열
+    :param params: 전략 파라미터 딕셔너리 (선택, DB에 함께 저장)
     :return: 저장된 결과의 데이터프레임
     """
     # 결과 리스트를 데이터프레임으로 변환
@@ -36,28 +139,18 @@ def save_backtest_results(results, count, name):
     # Win Rate (%) 기준으로 정렬
     if 'Win Rate (%)' in results_df.columns:
         results_df = results_df.sort_values(by="Win Rate (%)", ascending=False)
+    results_df = results_df.reset_index(drop=True)
 
     # 결과를 저장할 디렉터리 생성
     output_dir = os.path.join('results', 'backtest')
     os.makedirs(output_dir, exist_ok=True)
 
-    # 날짜 문자열 추가
-    date_str = datetime.now().strftime('%Y%m%d_%H%M%S')
+    # 실행 기록은 DB에 쌓는다 (과거 결과는 results_db.query_results로 조회)
+    run_id = save_run(results_df, name, count, params)
 
-    # 결과 파일 경로 설정
+    # 최신 결과 CSV (덮어쓰기)
     output_file = os.path.join(output_dir, f'{name}_backtest_{count}.csv')
-
-    # 기존 파일이 있는 경우 백업
-    if os.path.exists(output_file):
-        backup_file = os.path.join(output_dir, f'{name}_backtest_{count}_backup_{date_str}.csv')
-        shutil.move(output_file, backup_file)
-        print(f"Existing file backed up to '{backup_file}'.")
-
-    # 데이터프레임을 CSV 파일로 저장
     results_df.to_csv(output_file, index=False)
-    print(f"Backtest results saved to '{output_file}'.")
-
-    # 저장된 CSV 파일을 다시 읽어 데이터프레임으로 반환
-    saved_results_df = pd.read_csv(output_file)
-    return saved_results_df
+    print(f"Backtest results saved to '{output_file}' (run {run_id}).")
 
+    return results_df
@@ -0,0 +1,158 @@
+"""
+utils/shared_candles.py
+
+멀티프로세스 백테스트 워커가 캔들 배열을 복사 없이 공유하기 위한 카탈로그.
+
+부모 프로세스가 publish_candles로 (시장, 타임프레임)별 OHLCV 컬럼을 공개하면
+워커는 attach_candles로 같은 메모리를 읽기 전용 numpy 배열로 붙입니다.
+
+- 컬럼 저장소(utils.candle_store)에 있는 데이터: 컬럼 파일을 memmap으로 공유 (OS 페이지 캐시 공유)
+- CSV로만 있는 데이터: 한 번 읽어 multiprocessing.shared_memory 블록에 올려 공유
+
+카탈로그는 작은 딕셔너리라 ProcessPoolExecutor의 initializer 인자로 그대로 넘길 수 있습니다.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+
+from utils.candle_store import COLUMNS, PRICE_COLUMNS, get_csv_path, get_store_path, has_candles, read_meta
+
+# 워커에서 붙인 공유 메모리 (배열이 살아 있는 동안 유지)
+_attached = {}
+
+# init_worker로 설정되는 워커 전역 카탈로그
+_catalog = None
+
+
+class SharedCandles:
+    """ publish_candles가 반환하는 카탈로그와 공유 메모리 소유권 """
+
+    def __init__(self):
+        self.catalog = {}
+        self._blocks = []
+
+    def close(self):
+        """ 부모 프로세스에서 만든 공유 메모리 블록을 해제합니다 """
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _publish_shared_memory(shared, market, timeframe):
+    """ CSV 데이터를 공유 메모리에 올리고 카탈로그 항목을 반환합니다 """
+    df = pd.read_csv(get_csv_path(market, timeframe), index_col=0, parse_dates=True).sort_index()
+    df = df[~df.index.duplicated(keep="last")]
+    rows = len(df)
+
+    offsets = {}
+    offset = 0
+    for name in COLUMNS:
+        offsets[name] = offset
+        offset += rows * np.dtype(COLUMNS[name]).itemsize
+
+    block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    shared._blocks.append(block)
+
+    dates = df.index.values.astype("datetime64[ns]").view("int64")
+    np.ndarray(rows, dtype="int64", buffer=block.buf, offset=offsets["date"])[:] = dates
+    for name in PRICE_COLUMNS:
+        target = np.ndarray(rows, dtype=COLUMNS[name], buffer=block.buf, offset=offsets[name])
+        target[:] = df[name].to_numpy(dtype=COLUMNS[name])
+
+    return {"kind": "shm", "name": block.name, "rows": rows, "offsets": offsets, "columns": COLUMNS}
+
+
+def publish_candles(markets, timeframes):
+    """
+    (시장, 타임프레임)별 캔들 컬럼을 워커가 붙을 수 있도록 공개하는 함수.
+
+    :param markets: 시장 코드 목록
+    :param timeframes: 타임프레임 목록 (예: ['days', 'minutes_60'])
+    :return: SharedCandles (catalog 속성을 워커에 전달, 끝나면 close())
+    """
+    shared = SharedCandles()
+    for market in markets:
+        for timeframe in timeframes:
+            if has_candles(market, timeframe):
+                # 공개 시점의 행 수로 고정하여 실행 중 추가되는 캔들과 섞이지 않게 한다
+                meta = read_meta(market, timeframe)
+                entry = {
+                    "kind": "memmap",
+                    "path": get_store_path(market, timeframe),
+                    "rows": meta["rows"],
+                    "columns": meta["columns"],
+                }
+            elif os.path.exists(get_csv_path(market, timeframe)):
+                entry = _publish_shared_memory(shared, market, timeframe)
+            else:
+                continue
+            shared.catalog[(market, timeframe)] = entry
+    return shared
+
+
+def _attach_block(name):
+    if name not in _attached:
+        # 풀 워커는 부모와 같은 resource_tracker를 쓰므로 해제(unlink)는 부모의 close()에 맡긴다
+        _attached[name] = shared_memory.SharedMemory(name=name)
+    return _attached[name]
+
+
+def attach_candles(entry, columns=None):
+    """
+    카탈로그 항목의 컬럼을 복사 없이 읽기 전용 배열로 붙이는 함수.
+
+    :param entry: 카탈로그 항목 (catalog[(market, timeframe)])
+    :param columns: 붙일 컬럼 목록 (None이면 전체, 'date'는 항상 포함)
+    :return: {컬럼: 읽기 전용 numpy 배열}
+    """
+    names = ["date"] + [c for c in (columns or PRICE_COLUMNS) if c != "date"]
+    rows = entry["rows"]
+    result = {}
+    for name in names:
+        dtype = entry["columns"][name]
+        if rows == 0:
+            values = np.empty(0, dtype=dtype)
+        elif entry["kind"] == "memmap":
+            values = np.memmap(os.path.join(entry["path"], f"{name}.bin"), dtype=dtype, mode="r", shape=(rows,))
+        else:
+            block = _attach_block(entry["name"])
+            values = np.ndarray(rows, dtype=dtype, buffer=block.buf, offset=entry["offsets"][name])
+            values.flags.writeable = False
+        result[name] = values
+    return result
+
+
+def init_worker(catalog):
+    """ ProcessPoolExecutor initializer: 워커 전역 카탈로그를 설정합니다 """
+    global _catalog
+    _catalog = catalog
+
+
+def has_shared(market, timeframe):
+    """ 현재 프로세스에 (시장, 타임프레임)의 공유 카탈로그 항목이 있는지 확인합니다 """
+    return _catalog is not None and (market, timeframe) in _catalog
+
+
+def get_shared_columns(market, timeframe, columns=None):
+    """ 워커에서 카탈로그의 (시장, 타임프레임) 컬럼을 붙입니다 """
+    return attach_candles(_catalog[(market, timeframe)], columns)
+
+
+def get_shared_frame(market, timeframe, columns=None, start=None, stop=None):
+    """
+    워커에서 공유 컬럼을 date 인덱스의 데이터프레임으로 만드는 함수.
+
+    데이터프레임을 기대하는 기존 백테스트 함수용이며 슬라이스 구간만 복사합니다.
+    """
+    arrays = get_shared_columns(market, timeframe, columns)
+    index = pd.DatetimeIndex(np.asarray(arrays.pop("date")[start:stop]).view("datetime64[ns]"), name="date")
+    return pd.DataFrame({name: np.asarray(values[start:stop]) for name, values in arrays.items()}, index=index)
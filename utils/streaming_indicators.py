@@ -0,0 +1,289 @@
+"""
+utils/streaming_indicators.py
+
+새 캔들마다 O(1)로 갱신되는 스트리밍 지표.
+
+각 지표는
+- init(values): 과거 데이터 전체로 상태를 만들고 pandas와 같은 값의 배열을 반환
+- update(value): 새 캔들 하나를 반영하고 최신 지표 값을 반환
+- update(value, replace=True): 아직 형성 중인 마지막 캔들의 값을 교체
+를 지원합니다. 캔들(bar)은 숫자 또는 'close' 등의 키를 가진 딕셔너리/Series입니다.
+
+계산은 pandas와 같은 정의를 따릅니다.
+- SMA / VolumeMean: rolling(window, min_periods).mean()
+- EMA: ewm(span, adjust=False).mean()
+- RollingStd: rolling(window, min_periods).std(ddof)
+- Bollinger: 중심선 ± num_std × 표준편차
+- MACD: EMA(short) - EMA(long), 시그널 EMA, 히스토그램
+- TrueRange: max(고가 - 저가, |고가 - 전일 종가|, |저가 - 전일 종가|)
+"""
+
+import math
+import numpy as np
+import pandas as pd
+
+
+def _value(bar, column):
+    """ 캔들에서 값 하나를 꺼냅니다 (숫자면 그대로) """
+    if isinstance(bar, (int, float, np.integer, np.floating)):
+        return float(bar)
+    return float(bar[column])
+
+
+def _column(data, column):
+    """ init용 입력(배열 또는 데이터프레임)에서 컬럼 배열을 꺼냅니다 """
+    if isinstance(data, pd.DataFrame):
+        return data[column].to_numpy(dtype=np.float64)
+    return np.asarray(data, dtype=np.float64)
+
+
+class RingBuffer:
+    """ 고정 크기 원형 버퍼 (가장 오래된 값을 덮어씀) """
+
+    def __init__(self, size):
+        self.size = size
+        self._values = np.zeros(size)
+        self._start = 0
+        self.count = 0
+
+    def append(self, value):
+        """ 값을 추가하고, 가득 차 있었다면 밀려난 값을 반환합니다 (아니면 None) """
+        end = (self._start + self.count) % self.size
+        evicted = None
+        if self.count == self.size:
+            evicted = self._values[self._start]
+            self._start = (self._start + 1) % self.size
+        else:
+            self.count += 1
+        self._values[end] = value
+        return evicted
+
+    def replace_last(self, value):
+        """ 마지막 값을 교체하고 이전 값을 반환합니다 """
+        last = (self._start + self.count - 1) % self.size
+        previous = self._values[last]
+        self._values[last] = value
+        return previous
+
+    def values(self):
+        """ 오래된 순의 값 배열 """
+        index = (self._start + np.arange(self.count)) % self.size
+        return self._values[index]
+
+
+class SMA:
+    """ 단순 이동 평균 """
+
+    def __init__(self, window, min_periods=None, column="close"):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.column = column
+        self._buffer = RingBuffer(window)
+        self._sum = 0.0
+        self._updates = 0
+
+    def init(self, data):
+        values = _column(data, self.column)
+        self._buffer = RingBuffer(self.window)
+        for value in values[-self.window:]:
+            self._buffer.append(value)
+        self._sum = float(self._buffer.values().sum())
+        return pd.Series(values).rolling(window=self.window, min_periods=self.min_periods).mean().to_numpy()
+
+    def update(self, bar, replace=False):
+        value = _value(bar, self.column)
+        if replace and self._buffer.count:
+            self._sum += value - self._buffer.replace_last(value)
+        else:
+            evicted = self._buffer.append(value)
+            self._sum += value - (evicted if evicted is not None else 0.0)
+
+        # 더하고 빼며 쌓이는 반올림 오차를 창 크기마다 한 번 정리 (분할 상환 O(1))
+        self._updates += 1
+        if self._updates % self.window == 0:
+            self._sum = float(self._buffer.values().sum())
+        return self.value
+
+    @property
+    def value(self):
+        if self._buffer.count < max(self.min_periods, 1):
+            return math.nan
+        return self._sum / self._buffer.count
+
+
+class VolumeMean(SMA):
+    """ 거래량 이동 평균 """
+
+    def __init__(self, window, min_periods=None):
+        super().__init__(window, min_periods, column="volume")
+
+
+class EMA:
+    """ 지수 이동 평균 (adjust=False) """
+
+    def __init__(self, span, column="close"):
+        self.span = span
+        self.alpha = 2 / (span + 1)
+        self.column = column
+        self.value = math.nan
+        self._previous = math.nan
+
+    def init(self, data):
+        values = _column(data, self.column)
+        result = pd.Series(values).ewm(span=self.span, adjust=False).mean().to_numpy()
+        self.value = float(result[-1]) if len(result) else math.nan
+        self._previous = float(result[-2]) if len(result) > 1 else math.nan
+        return result
+
+    def update(self, bar, replace=False):
+        value = _value(bar, self.column)
+        if not replace:
+            self._previous = self.value
+        if math.isnan(self._previous):
+            self.value = value
+        else:
+            self.value = (1 - self.alpha) * self._previous + self.alpha * value
+        return self.value
+
+
+class RollingStd:
+    """ 이동 표준편차 (창에서 값을 더하고 빼는 Welford 방식) """
+
+    def __init__(self, window, min_periods=None, ddof=1, column="close"):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.ddof = ddof
+        self.column = column
+        self._buffer = RingBuffer(window)
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._updates = 0
+
+    def _refresh(self):
+        tail = self._buffer.values()
+        self._count = len(tail)
+        self._mean = float(tail.mean()) if len(tail) else 0.0
+        self._m2 = float(((tail - self._mean) ** 2).sum())
+
+    def _add(self, value):
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+    def _remove(self, value):
+        self._count -= 1
+        if self._count == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / self._count
+        self._m2 -= delta * (value - self._mean)
+
+    def init(self, data):
+        values = _column(data, self.column)
+        self._buffer = RingBuffer(self.window)
+        for value in values[-self.window:]:
+            self._buffer.append(value)
+        self._refresh()
+        return pd.Series(values).rolling(window=self.window, min_periods=self.min_periods).std(ddof=self.ddof).to_numpy()
+
+    def update(self, bar, replace=False):
+        value = _value(bar, self.column)
+        if replace and self._count:
+            self._remove(self._buffer.replace_last(value))
+        else:
+            evicted = self._buffer.append(value)
+            if evicted is not None:
+                self._remove(evicted)
+        self._add(value)
+
+        self._updates += 1
+        if self._updates % self.window == 0:
+            self._refresh()
+        return self.value
+
+    @property
+    def value(self):
+        if self._count < max(self.min_periods, 1) or self._count - self.ddof <= 0:
+            return math.nan
+        return math.sqrt(max(self._m2, 0.0) / (self._count - self.ddof))
+
+
+class Bollinger:
+    """ 볼린저 밴드 (중심선, 상단, 하단) """
+
+    def __init__(self, window=20, num_std=2, column="close"):
+        self.num_std = num_std
+        self.mean = SMA(window, column=column)
+        self.std = RollingStd(window, column=column)
+
+    def init(self, data):
+        middle = self.mean.init(data)
+        std = self.std.init(data)
+        return middle, middle + std * self.num_std, middle - std * self.num_std
+
+    def update(self, bar, replace=False):
+        self.mean.update(bar, replace)
+        self.std.update(bar, replace)
+        return self.value
+
+    @property
+    def value(self):
+        middle = self.mean.value
+        std = self.std.value
+        return middle, middle + std * self.num_std, middle - std * self.num_std
+
+
+class MACD:
+    """ MACD (MACD선, 시그널선, 히스토그램) """
+
+    def __init__(self, short_window=12, long_window=26, signal_window=9, column="close"):
+        self.short = EMA(short_window, column)
+        self.long = EMA(long_window, column)
+        self.signal = EMA(signal_window)
+
+    def init(self, data):
+        macd = self.short.init(data) - self.long.init(data)
+        signal = self.signal.init(macd)
+        return macd, signal, macd - signal
+
+    def update(self, bar, replace=False):
+        macd = self.short.update(bar, replace) - self.long.update(bar, replace)
+        signal = self.signal.update(macd, replace)
+        return macd, signal, macd - signal
+
+
+class TrueRange:
+    """ True Range (첫 캔들은 고가 - 저가) """
+
+    def __init__(self):
+        self.value = math.nan
+        self._previous_close = math.nan
+        self._last_close = math.nan
+
+    def init(self, data):
+        high = data["high"].to_numpy(dtype=np.float64)
+        low = data["low"].to_numpy(dtype=np.float64)
+        close = data["close"].to_numpy(dtype=np.float64)
+        previous_close = np.concatenate(([np.nan], close[:-1]))
+        ranges = np.vstack([high - low, np.abs(high - previous_close), np.abs(low - previous_close)])
+        result = np.fmax.reduce(ranges, axis=0) if len(close) else np.empty(0)
+        if len(close):
+            self.value = float(result[-1])
+            self._previous_close = float(previous_close[-1])
+            self._last_close = float(close[-1])
+        return result
+
+    def update(self, bar, replace=False):
+        if not replace:
+            self._previous_close = self._last_close
+        high, low, close = float(bar["high"]), float(bar["low"]), float(bar["close"])
+        self._last_close = close
+        if math.isnan(self._previous_close):
+            self.value = high - low
+        else:
+            self.value = max(high - low, abs(high - self._previous_close), abs(low - self._previous_close))
+        return self.value
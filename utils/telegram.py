@@ -3,6 +3,8 @@ import time
 import os
 import requests
 
+from api import http_client
+
 from dotenv import load_dotenv
 
 
@@ -25,7 +27,7 @@ def send_telegram_message(message, chat_id = CHAT_ID):
         "text": message
     }
     try:
-        response = requests.post(url, data=data, timeout=REQUEST_TIMEOUT)
+        response = http_client.post(url, data=data, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
     except requests.exceptions.RequestException as e:
@@ -45,7 +47,7 @@ def send_telegram_image(image_path, chat_id = CHAT_ID):
         with open(image_path, 'rb') as image_file:
             files = {'photo': image_file}
             data = {'chat_id': chat_id}
-            response = requests.post(url, data=data, files=files)
+            response = http_client.post(url, data=data, files=files)
             # response = requests.post(url, data=data, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
     except requests.exceptions.RequestException as e:
@@ -57,7 +59,7 @@ def send_telegram_image(image_path, chat_id = CHAT_ID):
 
 def get_chat_ids():
     URL = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/getUpdates"
-    response = requests.get(URL)
+    response = http_client.get(URL)
     if response.status_code == 200:
         data = response.json()
         chat_ids = set()